@@ -0,0 +1,47 @@
+"""Catalog databases for the benchmarks, built from a local Chinook script."""
+
+import argparse
+import os
+from pathlib import Path
+from typing import Any, List
+
+from src.config.settings import Settings
+from src.databases.database import Database
+
+
+def add_script_argument(parser: argparse.ArgumentParser):
+    """Add the ``--script`` option selecting the Chinook SQL script."""
+    parser.add_argument(
+        "--script",
+        default=os.getenv("DATABASE_SCRIPT_PATH"),
+        help="Chinook SQL script (default: $DATABASE_SCRIPT_PATH; downloaded if unset)",
+    )
+
+
+def open_catalog(directory: Path, script: str, **overrides: Any) -> Database:
+    """
+    Build a snapshot in ``directory`` and open it without result caching.
+
+    Args:
+        directory: Directory receiving the snapshot file
+        script: Path of the Chinook SQL script, or None to download it
+        **overrides: Settings values, e.g. ``database_pool_size``
+
+    Returns:
+        Database: The opened catalog; every call reaches SQLite
+    """
+    settings = Settings(
+        database_snapshot_path=str(directory / "chinook.sqlite"),
+        database_script_path=script,
+        database_slow_query_seconds=0,
+        result_cache_max_entries=0,
+        **overrides,
+    )
+    return Database(settings)
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """The ``fraction`` quantile of ``samples`` (nearest rank)."""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
@@ -0,0 +1,94 @@
+"""
+Tool-call throughput of the catalog connection pool as worker threads grow.
+
+Each worker runs the statements behind the music and invoice tools against
+the Chinook snapshot, with the result cache disabled so every call reaches
+SQLite. A pool of one connection reproduces the former single shared
+connection. Run from the repository root:
+
+    python -m benchmarks.pool_throughput --script Chinook_Sqlite.sql
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Tuple
+
+from src.databases.database import Database
+from .catalog import add_script_argument, open_catalog
+
+ARTISTS = ["AC/DC", "Queen", "Rolling", "Beatles", "Iron", "Metallica"]
+
+
+def _workload(calls: int, customers: int, seed: int) -> List[Tuple[str, dict]]:
+    """Statements and parameters of ``calls`` tool calls in a fixed random order."""
+    rng = random.Random(seed)
+    workload = []
+    for _ in range(calls):
+        customer_id = rng.randint(1, customers)
+        workload.append(
+            rng.choice(
+                [
+                    ("tracks_by_artist", {"artist": rng.choice(ARTISTS)}),
+                    ("invoices_by_customer", {"customer_id": customer_id}),
+                    ("invoice_lines_by_unit_price", {"customer_id": customer_id}),
+                ]
+            )
+        )
+    return workload
+
+
+def _run(db: Database, workload: List[Tuple[str, dict]], threads: int) -> float:
+    """Run the workload on ``threads`` workers; returns the elapsed seconds."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for _ in executor.map(lambda call: db.execute(*call), workload):
+            pass
+    return time.perf_counter() - start
+
+
+def main():
+    """Print calls per second for each pool size and thread count."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_script_argument(parser)
+    parser.add_argument("--threads", default="1,2,4,8", help="Worker thread counts")
+    parser.add_argument("--pool-sizes", default="1,8", help="Connection pool sizes")
+    parser.add_argument("--calls", type=int, default=2000, help="Tool calls per run")
+    parser.add_argument("--storage", default="snapshot", choices=["snapshot", "memory"])
+    args = parser.parse_args()
+    thread_counts = [int(value) for value in args.threads.split(",")]
+    pool_sizes = [int(value) for value in args.pool_sizes.split(",")]
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{'pool':>5} {'threads':>8} {'calls/s':>10} {'speedup':>8} {'peak':>5}")
+        for pool_size in pool_sizes:
+            db = open_catalog(
+                Path(directory),
+                args.script,
+                database_pool_size=pool_size,
+                database_storage=args.storage,
+            )
+            customers = db.query("SELECT MAX(CustomerId) AS Id FROM Customer")
+            workload = _workload(args.calls, customers.rows[0][0], seed=0)
+            # Warm the connections and SQLite's page cache
+            _run(db, workload[:100], max(thread_counts))
+
+            baseline = None
+            for threads in thread_counts:
+                db.pool_metrics.peak_in_use = 0
+                rate = len(workload) / _run(db, workload, threads)
+                baseline = baseline or rate
+                peak = db.pool_metrics.snapshot()["peak_in_use"]
+                print(
+                    f"{pool_size:>5} {threads:>8} {rate:>10.0f} "
+                    f"{rate / baseline:>7.2f}x {peak:>5}"
+                )
+            db.engine.dispose()
+            db.executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
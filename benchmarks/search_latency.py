@@ -0,0 +1,135 @@
+"""
+Latency of the full-text catalog search against the LIKE scans as the catalog grows.
+
+The Chinook artists, albums and tracks are copied ``scale`` times under new
+IDs before the snapshot is built, so both paths search the same, larger
+catalog. Each search term runs through the ``<name>_fts`` statement and its
+LIKE counterpart with the result cache disabled. Run from the repository root:
+
+    python -m benchmarks.search_latency --script Chinook_Sqlite.sql
+"""
+
+import argparse
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import requests
+
+from src.databases.database import CHINOOK_SCRIPT_URL, Database
+from src.databases.search import fts_match_expression
+from .catalog import add_script_argument, open_catalog, percentile
+
+# (search statement, parameter, terms as a customer would type them)
+SEARCHES = [
+    ("albums_by_artist", "artist", ["AC/DC", "Rolling Stones", "queen"]),
+    ("tracks_by_artist", "artist", ["Led Zeppelin", "beatles", "Metallica"]),
+    ("songs_by_title", "song_title", ["love", "black", "Highway to Hell"]),
+    ("songs_by_genre", "genre", ["rock", "jazz", "metal"]),
+]
+
+
+def _load_script(script: str) -> str:
+    """Read the Chinook script, downloading it when no path is given."""
+    if script:
+        return Path(script).read_text(encoding="utf-8")
+    response = requests.get(CHINOOK_SCRIPT_URL, timeout=60)
+    response.raise_for_status()
+    return response.text
+
+
+def scaled_script(script: str, scale: int) -> str:
+    """
+    The Chinook script followed by ``scale - 1`` copies of its music catalog.
+
+    Copies keep the names of the originals, so matches grow with the catalog.
+    """
+    source = sqlite3.connect(":memory:")
+    try:
+        source.executescript(script)
+        artists, albums, tracks = source.execute(
+            "SELECT (SELECT MAX(ArtistId) FROM Artist), "
+            "(SELECT MAX(AlbumId) FROM Album), (SELECT MAX(TrackId) FROM Track)"
+        ).fetchone()
+    finally:
+        source.close()
+
+    copies = []
+    for copy in range(1, scale):
+        copies.append(
+            f"""
+            INSERT INTO Artist (ArtistId, Name)
+            SELECT ArtistId + {copy * artists}, Name FROM Artist
+            WHERE ArtistId <= {artists};
+            INSERT INTO Album (AlbumId, Title, ArtistId)
+            SELECT AlbumId + {copy * albums}, Title, ArtistId + {copy * artists}
+            FROM Album WHERE AlbumId <= {albums};
+            INSERT INTO Track (TrackId, Name, AlbumId, MediaTypeId, GenreId,
+                               Composer, Milliseconds, Bytes, UnitPrice)
+            SELECT TrackId + {copy * tracks}, Name, AlbumId + {copy * albums},
+                   MediaTypeId, GenreId, Composer, Milliseconds, Bytes, UnitPrice
+            FROM Track WHERE TrackId <= {tracks};
+            """
+        )
+    return script + "\n".join(copies)
+
+
+def _latencies(
+    db: Database, name: str, parameters: List[Dict[str, str]], repeats: int
+) -> List[float]:
+    """Milliseconds of each execution of ``name`` with each parameter set."""
+    samples = []
+    for _ in range(repeats):
+        for values in parameters:
+            start = time.perf_counter()
+            db.execute(name, values)
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    """Print p50/p99 of both search paths for each catalog scale."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_script_argument(parser)
+    parser.add_argument("--scales", default="1,4,16", help="Catalog copies")
+    parser.add_argument("--repeats", type=int, default=50, help="Runs per term")
+    args = parser.parse_args()
+    script = _load_script(args.script)
+
+    print(
+        f"{'scale':>5} {'tracks':>7} {'statement':<18} "
+        f"{'like p50':>9} {'like p99':>9} {'fts p50':>8} {'fts p99':>8}"
+    )
+    for scale in [int(value) for value in args.scales.split(",")]:
+        with tempfile.TemporaryDirectory() as directory:
+            directory = Path(directory)
+            scaled = directory / "chinook.sql"
+            scaled.write_text(scaled_script(script, scale), encoding="utf-8")
+            db = open_catalog(directory, str(scaled))
+            if not db.has_search_index:
+                raise SystemExit("SQLite lacks FTS5; nothing to compare")
+            tracks = db.query("SELECT COUNT(*) AS Tracks FROM Track").rows[0][0]
+
+            for name, parameter, terms in SEARCHES:
+                like = _latencies(
+                    db, name, [{parameter: term} for term in terms], args.repeats
+                )
+                fts = _latencies(
+                    db,
+                    f"{name}_fts",
+                    [{parameter: fts_match_expression(term)} for term in terms],
+                    args.repeats,
+                )
+                print(
+                    f"{scale:>5} {tracks:>7} {name:<18} "
+                    f"{percentile(like, 0.5):>9.2f} {percentile(like, 0.99):>9.2f} "
+                    f"{percentile(fts, 0.5):>8.2f} {percentile(fts, 0.99):>8.2f}"
+                )
+            db.engine.dispose()
+            db.executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
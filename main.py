@@ -1,5 +1,6 @@
 """Basic setup example demonstrating how to use the multi-agent LangGraph template."""
 
+import asyncio
 import os
 import uuid
 from dotenv import load_dotenv
@@ -10,11 +11,42 @@ from langgraph.types import Command
 from src.workflows import MultiAgentWorkflow
 from src.config.settings import Settings
 from src.databases.database import Database
+from src.databases.instrumentation import format_query_report
 
 # Load environment variables
 load_dotenv(dotenv_path=".env", override=True)
 
 
+async def stream_turn(multi_agent_workflow, input, config):
+    """Stream one conversation turn to stdout as it is generated."""
+    current_node = None
+    async for event in multi_agent_workflow.astream_response(input, config):
+        if event.kind == "token":
+            # Start a new line whenever a different agent starts talking
+            if event.node != current_node:
+                print(f"\n[{event.node}] ", end="")
+                current_node = event.node
+            print(event.content, end="", flush=True)
+            continue
+
+        current_node = None
+        if event.kind == "tool_call":
+            print(f"\n[{event.node}] calling {event.content}...")
+        elif event.kind == "tool_result":
+            print(f"\n[{event.node}] returned {len(str(event.content))} characters")
+        elif event.kind in ("message", "interrupt"):
+            print(f"\n[{event.node}] {event.content}")
+    print()
+
+
+async def run_conversation(multi_agent_workflow, initial_message, user_input, config):
+    """Stream the example conversation and return the final state."""
+    await stream_turn(multi_agent_workflow, {"messages": [initial_message]}, config)
+    await stream_turn(multi_agent_workflow, Command(resume=user_input), config)
+    snapshot = await multi_agent_workflow.graph.aget_state(config)
+    return snapshot.values
+
+
 def main():
     """Main function to run the multi-agent system."""
 
@@ -29,7 +61,7 @@ def main():
     # Create the multi-agent system
     print("\nCreating multi-agent workflow...")
     multi_agent_workflow = MultiAgentWorkflow(settings)
-    workflow = multi_agent_workflow.build_graph()
+    multi_agent_workflow.build_graph()
 
     # Example conversation
     initial_message = HumanMessage(
@@ -40,29 +72,31 @@ def main():
     thread_id = uuid.uuid4()
 
     # Configuration for the conversation
+    db = Database()
     config = {
         "configurable": {
             "thread_id": thread_id,
             "user_id": "Deepak",
-            "db": Database(),
+            "db": db,
+            "settings": settings,
         }
     }
 
     print("\nStarting conversation...")
 
-    # Execute the workflow
-    result = workflow.invoke({"messages": [initial_message]}, config=config)
-
+    # Execute the workflow, printing agent output as it streams in
     user_input = "My phone number is +55 (12) 3923-5555."
-    result = workflow.invoke(Command(resume=user_input), config=config)
-
-    # Print the conversation messages to see the verification and subsequent processing.
-    for message in result["messages"]:
-        message.pretty_print()
+    result = asyncio.run(
+        run_conversation(multi_agent_workflow, initial_message, user_input, config)
+    )
 
     print(f"\nCustomer ID: {result.get('customer_id', 'Not verified')}")
     print(f"Loaded Memory: {result.get('loaded_memory', 'None')}")
 
+    # Show how much of the conversation was spent in SQL
+    print("\nQuery statistics:")
+    print(format_query_report(db.get_query_stats(), db.get_slow_queries()))
+
 
 if __name__ == "__main__":
     """Main execution function."""
@@ -2,7 +2,8 @@
 
 from src.schemas.state import State
 from src.config.prompts import SystemPrompts
-from src.tools import get_invoice_tools
+from src.config.settings import Settings
+from src.tools import get_invoice_tools, get_tool_execution_config
 
 
 class InvoiceAgent:
@@ -13,17 +14,19 @@ class InvoiceAgent:
     including customer purchase history and employee assistance details.
     """
 
-    def __init__(self, llm, tools=None):
+    def __init__(self, llm, tools=None, settings=None):
         """
         Initialize the invoice agent.
 
         Args:
             llm: Language model instance
             tools: List of invoice-related tools (defaults to INVOICE_TOOLS)
+            settings: Application settings (defaults to a fresh Settings instance)
         """
         self.name = "invoice_agent"
         self.description = "Handles invoice and billing information queries"
         self.llm = llm
+        self.settings = settings or Settings()
         self.tools = tools or get_invoice_tools()
         self.invoice_agent = self._create_react_agent()
 
@@ -32,7 +35,9 @@ class InvoiceAgent:
         Create a ReAct agent using LangGraph's prebuilt functionality.
 
         This method demonstrates how to use LangGraph's create_react_agent
-        for this invoice agent.
+        for this invoice agent. Parallel tool calls of one model turn (such as
+        invoices and employee details) run concurrently, bounded by
+        ``Settings.tool_max_concurrency``.
 
         Returns:
             Compiled LangGraph agent
@@ -45,4 +50,4 @@ class InvoiceAgent:
             prompt=SystemPrompts.invoice_assistant_prompt(),
             state_schema=State,
             name=self.name,
-        )
+        ).with_config(get_tool_execution_config(self.settings))
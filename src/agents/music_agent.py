@@ -2,7 +2,8 @@
 
 from src.schemas.state import State
 from src.config.prompts import SystemPrompts
-from src.tools import get_music_tools
+from src.config.settings import Settings
+from src.tools import get_music_tools, get_tool_execution_config
 
 
 class MusicAgent:
@@ -13,23 +14,28 @@ class MusicAgent:
     music recommendations based on customer preferences.
     """
 
-    def __init__(self, llm, tools=None, db=None):
+    def __init__(self, llm, tools=None, settings=None):
         """
         Initialize the music agent.
 
         Args:
             llm: Language model instance
             tools: List of music-related tools (defaults to MUSIC_TOOLS)
+            settings: Application settings (defaults to a fresh Settings instance)
         """
         self.name = "music_agent"
         self.description = "Handles music catalog queries and recommendations"
         self.llm = llm
-        self.tools = tools or get_music_tools(db)
+        self.settings = settings or Settings()
+        self.tools = tools or get_music_tools()
         self.music_agent = self._create_react_agent()
 
     def _create_react_agent(self):
         """
         Create a ReAct agent using LangGraph's prebuilt functionality.
+
+        Parallel tool calls of one model turn run concurrently, bounded by
+        ``Settings.tool_max_concurrency``.
         """
         from langgraph.prebuilt import create_react_agent
 
@@ -39,4 +45,4 @@ class MusicAgent:
             prompt=SystemPrompts.music_assistant_prompt(),
             state_schema=State,
             name=self.name,
-        )
+        ).with_config(get_tool_execution_config(self.settings))
@@ -2,5 +2,6 @@
 
 from .settings import Settings
 from .prompts import SystemPrompts
+from .runtime import get_run_database, get_run_settings
 
-__all__ = ["Settings", "SystemPrompts"]
+__all__ = ["Settings", "SystemPrompts", "get_run_database", "get_run_settings"]
@@ -0,0 +1,46 @@
+"""Per-run objects passed to nodes and tools through a RunnableConfig."""
+
+from typing import TYPE_CHECKING
+
+from langchain_core.runnables import RunnableConfig
+
+from .settings import Settings
+
+if TYPE_CHECKING:
+    from src.databases.database import Database
+
+
+def get_run_settings(config: RunnableConfig) -> Settings:
+    """
+    Get the settings of a run.
+
+    LangGraph only passes ``configurable`` on to nodes and tools, so the
+    settings are read from ``config["configurable"]["settings"]``.
+
+    Args:
+        config: Configuration of the running node or tool
+
+    Returns:
+        Settings: The run's settings, or default settings when none were given
+    """
+    settings = config.get("configurable", {}).get("settings")
+    return settings if settings is not None else Settings()
+
+
+def get_run_database(config: RunnableConfig) -> "Database":
+    """
+    Get the database of a run from ``config["configurable"]["db"]``.
+
+    Args:
+        config: Configuration of the running node or tool
+
+    Returns:
+        Database: The run's database, or the shared instance when none was given
+    """
+    db = config.get("configurable", {}).get("db")
+    if db is None:
+        # Imported here so reading settings does not load the database package
+        from src.databases.database import get_database
+
+        db = get_database()
+    return db
@@ -18,11 +18,76 @@ class Settings:
     temperature: float = 0.0
     api_version: str = "2024-08-01-preview"
 
+    # LLM Response Cache Configuration (temperature 0 only). Off by default:
+    # cached conversations hold customer details in a plaintext file
+    llm_cache_enabled: bool = os.getenv("LLM_CACHE_ENABLED", "false").lower() == "true"
+    llm_cache_path: Optional[str] = os.getenv("LLM_CACHE_PATH")  # Defaults to data/
+    llm_cache_max_entries: int = 10000
+    llm_cache_max_bytes: int = 256 * 1024 * 1024  # Size cap of stored responses
+    llm_cache_ttl: float = float(os.getenv("LLM_CACHE_TTL", "86400"))  # 0: no expiry
+
+    # LLM HTTP Connection Pool Configuration (shared per endpoint)
+    llm_http2: bool = False  # Opt-in HTTP/2; needs the optional 'h2' package
+    llm_max_connections: int = 20
+    llm_max_keepalive_connections: int = 10
+    llm_keepalive_expiry: float = 60.0  # Seconds an idle connection is kept open
+
+    # LLM Rate Limiting Configuration (client-side, per endpoint; 0 disables a limit)
+    llm_requests_per_minute: int = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "300"))
+    llm_tokens_per_minute: int = int(os.getenv("LLM_TOKENS_PER_MINUTE", "50000"))
+    llm_max_concurrent_requests: int = 8
+    llm_background_reserve: float = 0.2  # Budget share kept for user-facing calls
+    llm_completion_token_estimate: int = 512  # Charged when a call sets no max_tokens
+    llm_max_retries: int = 4  # Retries of 429, 5xx and connection errors
+    llm_retry_base_delay: float = 0.5  # Backoff cap of the first retry, in seconds
+    llm_retry_max_delay: float = 20.0
+
     # Embedding Configuration
+    # Options: "hashing" (lexical, no model), "sentence-transformers" (semantic,
+    # loads embedding_model; install requirements-embeddings.txt)
+    embedding_backend: str = os.getenv("EMBEDDING_BACKEND", "hashing")
     embedding_model: str = "Alibaba-NLP/gte-modernbert-base"
+    embedding_batch_size: int = 64  # Texts embedded per batch when building the index
+
+    # Vector Index Configuration
+    vector_index_partitions: int = 0  # IVF partitions; 0 searches every vector
+    vector_index_probes: int = 4  # Partitions searched per query in IVF mode
 
     # Database Configuration
-    database_url: Optional[str] = None
+    database_url: Optional[str] = os.getenv("DATABASE_URL")  # Overrides the snapshot
+    database_snapshot_path: Optional[str] = os.getenv("DATABASE_SNAPSHOT_PATH")
+    database_script_path: Optional[str] = os.getenv("DATABASE_SCRIPT_PATH")
+    database_mmap_size: int = 256 * 1024 * 1024  # Bytes of the snapshot to memory-map
+    database_storage: str = "snapshot"  # Options: "snapshot", "memory"
+    database_pool_size: int = 5  # Read-only connections shared by tool calls
+    database_pool_timeout: float = 30.0  # Seconds to wait for a free connection
+    database_async_workers: int = 5  # Threads serving async tool calls concurrently
+    database_max_overflow: int = 10  # Extra connections on top of the pool (URL only)
+    database_pool_recycle: int = 1800  # Seconds before a server connection is replaced
+    database_provision_indexes: bool = False  # Create registry indexes on database_url
+
+    # Query Instrumentation Configuration
+    database_slow_query_seconds: float = 0.25  # Slow-query log threshold; 0 disables
+    database_slow_query_explain: bool = True  # Capture EXPLAIN QUERY PLAN (SQLite)
+    database_slow_query_log_size: int = 100  # Slow queries kept in memory
+    # JSON-lines file slow queries are appended to
+    database_slow_query_log_path: Optional[str] = os.getenv("DATABASE_SLOW_QUERY_LOG")
+
+    # Tool Execution Configuration
+    tool_max_concurrency: int = 5  # Tool calls of one model turn run at once
+
+    # Tool Result Budget Configuration
+    tool_max_rows: int = 50  # Rows returned per page by paginated tools
+    tool_max_tokens: int = 2000  # Approximate token budget of one tool result
+
+    # Catalog Result Cache Configuration
+    result_cache_max_entries: int = 4096
+    result_cache_max_bytes: int = 64 * 1024 * 1024  # Estimated size cap of cached rows
+    result_cache_ttl: float = 3600.0  # Seconds a cached result stays valid
+
+    # Invoice Summary Cache Configuration
+    invoice_summary_max_entries: int = 1024  # Verified customers kept in memory
+    invoice_summary_check_interval: float = 5.0  # Seconds between invoice table checks
 
     # Memory Configuration
     memory_store_type: str = "memory"  # Options: "memory", "redis", "postgres"
@@ -1,3 +1,24 @@
-from .database import Database, db
+from .database import Database, get_database
+from .queries import QUERIES, QueryRegistry, Statement
+from .results import QueryResult, ResultPage
 
-__all__ = ["Database", "db"]
+__all__ = [
+    "Database",
+    "get_database",
+    "QUERIES",
+    "QueryRegistry",
+    "Statement",
+    "QueryResult",
+    "ResultPage",
+]
+
+
+def __getattr__(name: str):
+    """
+    Create the shared ``db`` instance lazily so importing this package is cheap.
+
+    ``db`` is left out of ``__all__``, so ``import *`` never creates the database.
+    """
+    if name == "db":
+        return get_database()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,16 @@
+"""Print a query report from a statistics dump or a slow-query log file.
+
+Usage: ``python -m src.databases <file>``, where the file is a JSON dump written
+by ``Database.dump_query_stats`` or the JSON-lines log written while
+``database_slow_query_log_path`` is set.
+"""
+
+import sys
+
+from .instrumentation import load_report
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python -m src.databases <dump.json|slow.jsonl>")
+        sys.exit(2)
+    print(load_report(sys.argv[1]))
@@ -0,0 +1,198 @@
+"""Process-wide bounded cache for results of immutable catalog queries."""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Mapping, Optional, Tuple
+
+from src.config.settings import Settings
+from .results import QueryResult
+
+
+def parameters_key(parameters: Optional[Mapping[str, Any]]) -> Tuple:
+    """
+    Build a hashable cache key part from statement parameters.
+
+    Values are kept exactly as given: SQLite's ``LOWER()`` only folds ASCII and
+    whitespace matters to ``LIKE``, so parameters that differ in case or spacing
+    can select different rows.
+
+    Args:
+        parameters: Statement parameters
+
+    Returns:
+        Tuple: Sorted ``(name, value)`` pairs
+    """
+    if not parameters:
+        return ()
+    return tuple(sorted(parameters.items()))
+
+
+def estimate_result_size(result: QueryResult) -> int:
+    """
+    Approximate the memory held by a query result, in bytes.
+
+    Args:
+        result: Query result
+
+    Returns:
+        int: Estimated size of the row tuples and their values
+    """
+    size = sys.getsizeof(result.rows)
+    for row in result.rows:
+        size += sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+    return size
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache with a TTL, an entry limit and a memory cap.
+
+    Entries are keyed on ``(namespace, statement, parameters)``; the
+    namespace identifies the catalog snapshot so a reload can drop only its
+    entries. Cached results are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached results
+            max_bytes: Maximum estimated size of all cached results
+            ttl: Seconds an entry stays valid
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # key -> (expiry time, estimated size, result), least recently used first
+        self._entries: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[QueryResult]:
+        """
+        Look up a cached result and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Optional[QueryResult]: The cached result, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, size, result = entry
+            if expires_at <= time.monotonic():
+                self._remove(key, size)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key: Hashable, result: QueryResult):
+        """
+        Cache a result, evicting least recently used entries to stay within limits.
+
+        Results larger than the whole memory cap are not cached.
+
+        Args:
+            key: Cache key
+            result: Result to cache
+        """
+        size = estimate_result_size(result)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (time.monotonic() + self.ttl, size, result)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def invalidate(self, namespace: Optional[Hashable] = None):
+        """
+        Drop cached results.
+
+        Args:
+            namespace: Only drop entries of this namespace; drop everything if None
+        """
+        with self._lock:
+            if namespace is None:
+                self._entries.clear()
+                self._bytes = 0
+                return
+            for key in [key for key in self._entries if key[0] == namespace]:
+                self._remove(key, self._entries[key][1])
+
+    def _remove(self, key: Hashable, size: int):
+        """Remove an entry; the caller holds the lock."""
+        del self._entries[key]
+        self._bytes -= size
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters and current occupancy.
+
+        Returns:
+            Dict[str, Any]: Hits, misses, evictions, expirations, hit rate and size
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+
+# Shared by every Database instance in the process with the same limits,
+# keyed on (max entries, max bytes, TTL)
+_shared_caches: Dict[Tuple[int, int, float], ResultCache] = {}
+_shared_cache_lock = threading.Lock()
+
+
+def get_result_cache(settings: Settings) -> ResultCache:
+    """
+    Get the process-wide result cache for the settings' limits.
+
+    Databases configured with the same limits share one cache; different
+    limits get a cache of their own, so a disabled or smaller cache is never
+    replaced by one created earlier with other settings.
+
+    Args:
+        settings: Settings providing the cache limits
+
+    Returns:
+        ResultCache: The shared cache
+    """
+    key = (
+        settings.result_cache_max_entries,
+        settings.result_cache_max_bytes,
+        settings.result_cache_ttl,
+    )
+    with _shared_cache_lock:
+        cache = _shared_caches.get(key)
+        if cache is None:
+            cache = _shared_caches[key] = ResultCache(*key)
+    return cache
@@ -0,0 +1,131 @@
+"""In-memory index of customer identifiers used for account verification."""
+
+import re
+import threading
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+# E.164 numbers carry at most 15 digits; anything shorter than 7 is not a phone number
+MIN_PHONE_DIGITS = 7
+MAX_PHONE_DIGITS = 15
+
+_NON_DIGITS = re.compile(r"\D")
+
+# (customer IDs, phone key -> ID, email key -> ID)
+_IndexMaps = Tuple[FrozenSet[int], Dict[str, int], Dict[str, int]]
+
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """
+    Normalize a phone number to an E.164-style ``+<digits>`` key.
+
+    Spaces, dashes, dots and parentheses are dropped, so ``+55 (12) 3923-5555``
+    and ``+551239235555`` map to the same key.
+
+    Args:
+        phone: Phone number as stored or as typed by the customer
+
+    Returns:
+        Optional[str]: Normalized number, or None if it cannot be a phone number
+    """
+    if not phone:
+        return None
+    digits = _NON_DIGITS.sub("", phone)
+    if not MIN_PHONE_DIGITS <= len(digits) <= MAX_PHONE_DIGITS:
+        return None
+    return f"+{digits}"
+
+
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    """
+    Normalize an email address for case-insensitive matching.
+
+    Args:
+        email: Email address
+
+    Returns:
+        Optional[str]: Stripped, case-folded address, or None if empty
+    """
+    if not email:
+        return None
+    normalized = email.strip().casefold()
+    return normalized or None
+
+
+class CustomerIdentifierIndex:
+    """
+    Hash maps from normalized phone numbers and emails to customer IDs.
+
+    The maps are replaced as a whole on rebuild, so lookups never observe a
+    partially built index. After ``invalidate`` the index is rebuilt from the
+    database on the next lookup.
+    """
+
+    def __init__(self):
+        """Initialize an empty, unbuilt index."""
+        self._lock = threading.Lock()
+        self._maps: Optional[_IndexMaps] = None
+
+    @property
+    def is_built(self) -> bool:
+        """Whether the index currently holds data."""
+        return self._maps is not None
+
+    def build(self, rows: Iterable[Tuple[int, Optional[str], Optional[str]]]):
+        """
+        Build the index from ``(CustomerId, Phone, Email)`` rows.
+
+        Args:
+            rows: Customer rows
+        """
+        ids = set()
+        by_phone: Dict[str, int] = {}
+        by_email: Dict[str, int] = {}
+
+        for customer_id, phone, email in rows:
+            ids.add(customer_id)
+            phone_key = normalize_phone(phone)
+            if phone_key is not None:
+                by_phone.setdefault(phone_key, customer_id)
+            email_key = normalize_email(email)
+            if email_key is not None:
+                by_email.setdefault(email_key, customer_id)
+
+        self._maps = (frozenset(ids), by_phone, by_email)
+
+    def invalidate(self):
+        """Drop the index so it is rebuilt on the next lookup."""
+        self._maps = None
+
+    def lookup(self, identifier: str, loader) -> Optional[int]:
+        """
+        Resolve a customer ID, email or phone number to a customer ID.
+
+        Args:
+            identifier: Identifier as provided by the customer
+            loader: Callable returning customer rows, used if the index is not built
+
+        Returns:
+            Optional[int]: The CustomerId if found, otherwise None
+        """
+        maps = self._maps
+        if maps is None:
+            with self._lock:
+                if self._maps is None:
+                    self.build(loader())
+                maps = self._maps
+        ids, by_phone, by_email = maps
+
+        identifier = identifier.strip()
+
+        # Direct customer ID; a bare digit string that is not an ID may be a phone number
+        if identifier.isdigit() and int(identifier) in ids:
+            return int(identifier)
+
+        if "@" in identifier:
+            return by_email.get(normalize_email(identifier))
+
+        phone_key = normalize_phone(identifier)
+        if phone_key is not None:
+            return by_phone.get(phone_key)
+
+        return None
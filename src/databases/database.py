@@ -1,52 +1,337 @@
 """Database utilities and setup functions."""
 
+import asyncio
+import functools
+import hashlib
+import json
+import os
+import re
 import sqlite3
+import tempfile
+import threading
+import time
 import requests
-import ast
-from typing import Optional
+from itertools import islice
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
 from langchain_community.utilities.sql_database import SQLDatabase
-from sqlalchemy import create_engine
-from sqlalchemy.pool import StaticPool
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from src.config.settings import Settings
+from .cache import estimate_result_size, get_result_cache, parameters_key
+from .customer_index import CustomerIdentifierIndex
+from .embeddings import get_embedder
+from .fuzzy import FuzzyNameIndex
+from .instrumentation import SlowQueryLog
+from .invoice_summaries import InvoiceSummary, InvoiceSummaryCache
+from .pool import PoolMetrics
+from .queries import INVOICE_VERSION_STATEMENTS, QUERIES, StatementStats
+from .recommendations import Recommendation, RecommendationIndex
+from .results import QueryResult, ResultPage, decode_cursor, encode_cursor
+from .search import build_search_index, fts_match_expression
+from .vectors import VectorIndex
+
+# Upstream source of the Chinook sample database
+CHINOOK_SCRIPT_URL = "https://raw.githubusercontent.com/lerocha/chinook-database/master/ChinookDatabase/DataSources/Chinook_Sqlite.sql"
+
+# Bump whenever the snapshot contents or build steps change so stale files are rebuilt
+CHINOOK_SNAPSHOT_VERSION = 3
+
+# Default location of the on-disk snapshot (<project root>/data/)
+DEFAULT_SNAPSHOT_DIR = Path(__file__).resolve().parents[2] / "data"
+
+# Plan step reading every row of a table, as reported by EXPLAIN QUERY PLAN
+# ("SCAN Track", or "SCAN TABLE Track" before SQLite 3.36). Walking a whole
+# index ("SCAN Track USING COVERING INDEX ix") is a full scan too; index
+# lookups are SEARCH steps, and virtual tables and subqueries carry more detail.
+_TABLE_SCAN = re.compile(
+    r"^SCAN (?:TABLE )?\w+(?: AS \w+)?(?: USING (?:COVERING )?INDEX \w+)?$"
+)
+
+# Rows fetched per round trip when streaming a page from the cursor
+STREAM_BATCH_SIZE = 100
+
+# Largest invoices kept in each customer's invoice summary
+INVOICE_SUMMARY_TOP_INVOICES = 10
+
+# Date bounds covering every invoice in the [start_date, end_date) statements
+EARLIEST_INVOICE_DATE = "0001-01-01"
+LATEST_INVOICE_DATE = "9999-12-31"
+
+# Per-connection prepared statement cache, sized to hold every registered statement
+STATEMENT_CACHE_SIZE = max(128, 2 * len(QUERIES))
 
 
 class Database:
     """
     Database utilities and setup class for managing Chinook database operations.
+
+    The Chinook data is built once into a versioned SQLite snapshot file and then
+    opened read-only, so constructing a Database does not need network access.
+    Queries are served from a pool of read-only connections, either directly on
+    the snapshot file or on a shared-cache in-memory copy of it.
+
+    When ``Settings.database_url`` is set, any SQLAlchemy URL with the Chinook
+    schema (e.g. a catalog replica) is used instead of the snapshot.
     """
 
-    def __init__(self):
-        """Initialize the database instance."""
+    def __init__(self, settings: Optional[Settings] = None):
+        """
+        Initialize the database instance.
+
+        Args:
+            settings: Application settings (defaults to a fresh Settings instance)
+        """
+        self.settings = settings or Settings()
+        self.url = CHINOOK_SCRIPT_URL
+        self.snapshot_path = self.get_snapshot_path()
+        self.memory_uri = f"file:chinook-v{CHINOOK_SNAPSHOT_VERSION}-{id(self)}?mode=memory&cache=shared"
+        self._memory_anchor: Optional[sqlite3.Connection] = None
+        self.pool_metrics = PoolMetrics()
+        self.statement_stats = StatementStats()
+        self.slow_queries = SlowQueryLog(
+            threshold=self.settings.database_slow_query_seconds,
+            max_entries=self.settings.database_slow_query_log_size,
+            path=self.settings.database_slow_query_log_path,
+        )
+        self.customer_index = CustomerIdentifierIndex()
+        self.name_index = FuzzyNameIndex()
+        # Vector files live next to the snapshot and are built on first use
+        self.vector_index = VectorIndex(
+            self.snapshot_path.parent,
+            get_embedder(self.settings),
+            partitions=self.settings.vector_index_partitions,
+            probes=self.settings.vector_index_probes,
+            batch_size=self.settings.embedding_batch_size,
+        )
+        self.recommendations = RecommendationIndex()
+        self.invoice_summaries = InvoiceSummaryCache(
+            max_entries=self.settings.invoice_summary_max_entries,
+            check_interval=self.settings.invoice_summary_check_interval,
+        )
+        self.result_cache = get_result_cache(self.settings)
+        # Async callers share a bounded set of worker threads instead of the event loop
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.settings.database_async_workers,
+            thread_name_prefix="catalog-db",
+        )
         self.db = self.setup_database()
-        self.url = "https://raw.githubusercontent.com/lerocha/chinook-database/master/ChinookDatabase/DataSources/Chinook_Sqlite.sql"
+        # Cached catalog results are shared by all instances reading the same catalog
+        self.cache_namespace = (
+            self.engine.url.render_as_string(hide_password=True)
+            if self.settings.database_url
+            else str(self.snapshot_path.resolve())
+        )
+        self.has_search_index = self._detect_search_index()
+        self.rebuild_customer_index()
 
-    def get_engine_for_chinook_db(self):
+    def get_snapshot_path(self) -> Path:
         """
-        Pull SQL file, populate in-memory database, and create engine.
+        Resolve the path of the versioned Chinook snapshot file.
 
-        Downloads the Chinook database SQL script from GitHub and creates an in-memory
-        SQLite database populated with the sample data.
+        Returns:
+            Path: Configured snapshot path, or the default versioned file under data/
+        """
+        if self.settings.database_snapshot_path:
+            return Path(self.settings.database_snapshot_path)
+        return DEFAULT_SNAPSHOT_DIR / f"chinook-v{CHINOOK_SNAPSHOT_VERSION}.sqlite"
+
+    def load_chinook_script(self) -> str:
+        """
+        Load the Chinook SQL script.
+
+        A local dump configured via ``database_script_path`` takes precedence over
+        downloading the script from GitHub.
 
         Returns:
-            sqlalchemy.engine.Engine: SQLAlchemy engine connected to the in-memory database
+            str: The Chinook SQL script
         """
+        if self.settings.database_script_path:
+            return Path(self.settings.database_script_path).read_text(encoding="utf-8")
+
         # Download the Chinook database SQL script from the official repository
-        response = requests.get(self.url)
-        sql_script = response.text
+        response = requests.get(self.url, timeout=60)
+        response.raise_for_status()
+        return response.text
+
+    def build_snapshot(self) -> Path:
+        """
+        Build the Chinook snapshot file from the SQL script.
+
+        The script is replayed into an in-memory database, the full-text search
+        index and the indexes required by the query registry are built, and the
+        result is copied to disk with the SQLite backup API. The file is written under a temporary name and
+        renamed into place, so concurrent builders never observe a partial file.
+
+        Returns:
+            Path: Path of the written snapshot
+        """
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+
+        source = sqlite3.connect(":memory:")
+        try:
+            source.executescript(self.load_chinook_script())
+            build_search_index(source)
+            self.provision_indexes(source)
+
+            fd, tmp_path = tempfile.mkstemp(
+                prefix=f"{self.snapshot_path.name}.", dir=self.snapshot_path.parent
+            )
+            os.close(fd)
+            try:
+                target = sqlite3.connect(tmp_path)
+                try:
+                    source.backup(target)
+                    # WAL lets readers and a writer coexist if the file is ever opened writable
+                    target.execute("PRAGMA journal_mode = WAL")
+                    target.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                finally:
+                    target.close()
+                os.replace(tmp_path, self.snapshot_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        finally:
+            source.close()
+
+        return self.snapshot_path
+
+    def provision_indexes(self, connection: sqlite3.Connection):
+        """
+        Create the secondary indexes declared by the registered statements.
+
+        Planner statistics are refreshed afterwards so SQLite picks the new
+        indexes for the tool queries.
+
+        Args:
+            connection: Writable connection to the catalog database
+        """
+        for index in QUERIES.required_indexes():
+            connection.execute(index.ddl)
+        connection.execute("ANALYZE")
+        connection.commit()
 
-        # Create an in-memory SQLite database connection
+    def connect_snapshot(self) -> sqlite3.Connection:
+        """
+        Open a read-only connection to the snapshot file.
+
+        The file is opened with ``immutable=1`` so SQLite skips locking and change
+        detection, and ``mmap_size`` is set so pages are served from the OS page cache.
+
+        Returns:
+            sqlite3.Connection: Read-only connection to the snapshot
+        """
+        uri = f"{self.snapshot_path.resolve().as_uri()}?mode=ro&immutable=1"
         # check_same_thread=False allows the connection to be used across threads
-        connection = sqlite3.connect(":memory:", check_same_thread=False)
+        connection = sqlite3.connect(
+            uri,
+            uri=True,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        connection.execute(
+            f"PRAGMA mmap_size = {int(self.settings.database_mmap_size)}"
+        )
+        return connection
 
-        # Execute the SQL script to populate the database with sample data
-        connection.executescript(sql_script)
+    def load_shared_memory(self):
+        """
+        Copy the snapshot into a shared-cache in-memory database.
 
-        # Create and return a SQLAlchemy engine that uses the populated connection
-        return create_engine(
+        An anchor connection is kept open for the lifetime of this instance, since
+        SQLite drops a shared in-memory database once its last connection closes.
+        """
+        self._memory_anchor = sqlite3.connect(
+            self.memory_uri, uri=True, check_same_thread=False
+        )
+        snapshot = self.connect_snapshot()
+        try:
+            snapshot.backup(self._memory_anchor)
+        finally:
+            snapshot.close()
+
+    def connect_shared_memory(self) -> sqlite3.Connection:
+        """
+        Open a read-only connection to the shared in-memory database.
+
+        Returns:
+            sqlite3.Connection: Connection restricted to read-only statements
+        """
+        connection = sqlite3.connect(
+            self.memory_uri,
+            uri=True,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        connection.execute("PRAGMA query_only = 1")
+        return connection
+
+    def get_engine_for_chinook_db(self):
+        """
+        Open the Chinook snapshot (building it on first use) and create a pooled engine.
+
+        Each pooled connection is an independent read-only SQLite connection, so
+        concurrent tool calls no longer serialize on a single shared connection.
+
+        Returns:
+            sqlalchemy.engine.Engine: SQLAlchemy engine backed by a connection pool
+        """
+        if not self.snapshot_path.exists():
+            self.build_snapshot()
+
+        if self.settings.database_storage == "memory":
+            self.load_shared_memory()
+            creator = self.connect_shared_memory
+        elif self.settings.database_storage == "snapshot":
+            creator = self.connect_snapshot
+        else:
+            raise ValueError(
+                f"Unsupported database storage: {self.settings.database_storage}"
+            )
+
+        engine = create_engine(
             "sqlite://",  # SQLite URL scheme
-            creator=lambda: connection,  # Function that returns the database connection
-            poolclass=StaticPool,  # Use StaticPool to maintain single connection
-            connect_args={"check_same_thread": False},  # Allow cross-thread usage
+            creator=creator,  # Opens a new read-only connection for the pool
+            poolclass=QueuePool,
+            pool_size=self.settings.database_pool_size,
+            max_overflow=0,  # Callers wait for a free connection instead of opening more
+            pool_timeout=self.settings.database_pool_timeout,
+        )
+        self.pool_metrics.attach(engine)
+        return engine
+
+    def get_engine_for_url(self):
+        """
+        Create a pooled engine for ``Settings.database_url``.
+
+        Connections are pre-pinged on checkout and recycled periodically, so
+        connections dropped by a database server are replaced transparently.
+        Indexes declared by the query registry are created only when
+        ``database_provision_indexes`` is enabled, since replicas are often read-only.
+
+        Returns:
+            sqlalchemy.engine.Engine: SQLAlchemy engine backed by a connection pool
+        """
+        engine = create_engine(
+            self.settings.database_url,
+            poolclass=QueuePool,
+            pool_size=self.settings.database_pool_size,
+            max_overflow=self.settings.database_max_overflow,
+            pool_timeout=self.settings.database_pool_timeout,
+            pool_recycle=self.settings.database_pool_recycle,
+            pool_pre_ping=True,
         )
+        self.pool_metrics.attach(engine)
+
+        if self.settings.database_provision_indexes:
+            with engine.begin() as connection:
+                for index in QUERIES.required_indexes():
+                    connection.exec_driver_sql(index.ddl)
+
+        return engine
 
     def setup_database(self):
         """
@@ -55,17 +340,543 @@ class Database:
         Returns:
             SQLDatabase: LangChain SQLDatabase wrapper
         """
-        engine = self.get_engine_for_chinook_db()
-        return SQLDatabase(engine)
+        if self.settings.database_url:
+            self.engine = self.get_engine_for_url()
+        else:
+            self.engine = self.get_engine_for_chinook_db()
+        # Table metadata is reflected on demand to keep construction cheap
+        return SQLDatabase(self.engine, lazy_table_reflection=True)
+
+    def reload_catalog(self):
+        """
+        Reopen the catalog and drop everything derived from the old one.
+
+        Call this after the snapshot file has been replaced or the catalog
+        behind ``database_url`` has changed. Cached query results,
+        the fuzzy name index, the customer identifier index and the invoice
+        summaries are invalidated.
+        """
+        previous_engine = self.engine
+        self.db = self.setup_database()
+        previous_engine.dispose()
+
+        self.has_search_index = self._detect_search_index()
+        self.result_cache.invalidate(self.cache_namespace)
+        self.invalidate_name_index()
+        self.vector_index.invalidate()
+        self.recommendations.invalidate()
+        self.invoice_summaries.invalidate()
+        self.rebuild_customer_index()
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """
+        Get connection pool statistics.
+
+        Returns:
+            Dict[str, Any]: Checkout counters plus the pool's configured size and status
+        """
+        stats: Dict[str, Any] = self.pool_metrics.snapshot()
+        stats["pool_size"] = self.engine.pool.size()
+        stats["status"] = self.engine.pool.status()
+        return stats
+
+    def query(
+        self, sql: str, parameters: Optional[Dict[str, Any]] = None
+    ) -> QueryResult:
+        """
+        Execute a read query and return typed rows straight from the cursor.
+
+        Args:
+            sql: SQL statement, using ``:name`` placeholders for parameters
+            parameters: Values bound to the placeholders
+
+        Returns:
+            QueryResult: Column names and row tuples
+        """
+        return self._execute(text(sql), parameters)
+
+    def execute(
+        self, name: str, parameters: Optional[Dict[str, Any]] = None
+    ) -> QueryResult:
+        """
+        Execute a registered statement by name with bound parameters.
+
+        Results of cacheable catalog statements are served from the shared
+        result cache when present; they must be treated as read-only.
+
+        Args:
+            name: Name of a statement in the query registry
+            parameters: Values bound to the statement's placeholders
+
+        Returns:
+            QueryResult: Column names and row tuples
+        """
+        statement = QUERIES.get(name)
+
+        cache_key = None
+        if statement.cacheable:
+            cache_key = (self.cache_namespace, name, parameters_key(parameters))
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        start = time.perf_counter()
+        try:
+            result = self._execute(statement.clause, parameters)
+        except Exception:
+            self._record_statement(name, parameters, time.perf_counter() - start)
+            raise
+        self._record_statement(name, parameters, time.perf_counter() - start, result)
+
+        if cache_key is not None:
+            self.result_cache.put(cache_key, result)
+        return result
+
+    def _execute(self, clause, parameters: Optional[Dict[str, Any]]) -> QueryResult:
+        """Run a clause on a pooled connection and collect its rows."""
+        with self.engine.connect() as connection:
+            result = connection.execute(clause, parameters or {})
+            columns = tuple(result.keys())
+            rows = [tuple(row) for row in result]
+        return QueryResult(columns, rows)
+
+    def _record_statement(
+        self,
+        name: str,
+        parameters: Optional[Dict[str, Any]],
+        elapsed: float,
+        result: Optional[QueryResult] = None,
+    ):
+        """
+        Record an execution's latency, rows and size, and log it if it was slow.
+
+        Args:
+            name: Statement name
+            parameters: Values bound to the statement
+            elapsed: Execution time in seconds
+            result: Returned rows, or None if the execution raised
+        """
+        rows = len(result) if result is not None else 0
+        size = estimate_result_size(result) if result is not None else 0
+        self.statement_stats.record(
+            name, elapsed, error=result is None, rows=rows, size=size
+        )
+        if not self.slow_queries.is_slow(elapsed):
+            return
+
+        plan = None
+        if self.settings.database_slow_query_explain:
+            try:
+                plan = self.explain(name, parameters)
+            except Exception:
+                # Plans are best effort: other dialects or a dropped connection
+                plan = None
+        self.slow_queries.record(
+            name, parameters, elapsed, rows, size, plan=plan, error=result is None
+        )
+
+    def execute_page(
+        self,
+        name: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> ResultPage:
+        """
+        Execute a registered statement and return one page of its rows.
+
+        Rows are streamed from the database cursor and fetching stops as soon as
+        the page and one look-ahead row are read, so large result sets are never
+        materialized. Pages of cacheable statements are cached individually.
+
+        Args:
+            name: Name of a statement in the query registry
+            parameters: Values bound to the statement's placeholders
+            cursor: Cursor returned with the previous page, or None for the first page
+            limit: Maximum rows in the page, capped at ``Settings.tool_max_rows``
+
+        Returns:
+            ResultPage: Rows of the page and the cursor of the next one
+        """
+        statement = QUERIES.get(name)
+        offset = decode_cursor(cursor)
+        max_rows = self.settings.tool_max_rows
+        limit = max(1, min(limit, max_rows)) if limit else max_rows
+
+        cache_key = None
+        if statement.cacheable:
+            cache_key = (
+                self.cache_namespace,
+                name,
+                parameters_key(parameters),
+                offset,
+                limit,
+            )
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        start = time.perf_counter()
+        try:
+            with self.engine.connect() as connection:
+                result = connection.execution_options(
+                    yield_per=STREAM_BATCH_SIZE
+                ).execute(statement.clause, parameters or {})
+                columns = tuple(result.keys())
+                rows = [
+                    tuple(row) for row in islice(result, offset, offset + limit + 1)
+                ]
+                result.close()
+        except Exception:
+            self._record_statement(name, parameters, time.perf_counter() - start)
+            raise
+        elapsed = time.perf_counter() - start
+
+        next_cursor = encode_cursor(offset + limit) if len(rows) > limit else None
+        page = ResultPage(columns, rows[:limit], offset, next_cursor)
+        self._record_statement(name, parameters, elapsed, page)
+        if cache_key is not None:
+            self.result_cache.put(cache_key, page)
+        return page
+
+    def explain(
+        self, name: str, parameters: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
+        """
+        Get the SQLite query plan of a registered statement.
+
+        Args:
+            name: Name of a statement in the query registry
+            parameters: Values bound to the statement; NULL for missing ones
+
+        Returns:
+            List[str]: Plan steps as reported by EXPLAIN QUERY PLAN
+        """
+        if self.engine.dialect.name != "sqlite":
+            raise ValueError("EXPLAIN QUERY PLAN is only available on SQLite")
+
+        statement = QUERIES.get(name)
+        parameters = {
+            key: (parameters or {}).get(key)
+            for key in statement.clause.compile().params
+        }
+        plan = self.query(f"EXPLAIN QUERY PLAN {statement.sql}", parameters)
+        return plan.column("detail")
+
+    def find_scanning_statements(self) -> Dict[str, List[str]]:
+        """
+        Find registered statements whose plan scans a table without an index.
+
+        Statements registered with ``full_scan=True`` are skipped, as are
+        statements that need the full-text index when it is not available.
+
+        Returns:
+            Dict[str, List[str]]: Statement name to its offending plan steps
+        """
+        offenders = {}
+        for statement in QUERIES:
+            if statement.full_scan:
+                continue
+            if statement.name.endswith("_fts") and not self.has_search_index:
+                continue
+            scans = [
+                step for step in self.explain(statement.name) if _TABLE_SCAN.match(step)
+            ]
+            if scans:
+                offenders[statement.name] = scans
+        return offenders
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get hit, miss and eviction counters of the shared result cache.
+
+        Returns:
+            Dict[str, Any]: Cache counters and occupancy
+        """
+        return self.result_cache.stats()
+
+    def get_query_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-statement call counts, latency histograms and result sizes.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Statement name to calls, errors, timings,
+            latency percentiles, rows and bytes
+        """
+        return self.statement_stats.snapshot()
+
+    def get_slow_queries(self) -> List[Dict[str, Any]]:
+        """
+        Get the statements that exceeded ``database_slow_query_seconds``.
+
+        Returns:
+            List[Dict[str, Any]]: Slow-query entries with parameters and plans,
+            oldest first
+        """
+        return self.slow_queries.entries()
+
+    def reset_query_stats(self):
+        """Clear the statement statistics and the in-memory slow-query log."""
+        self.statement_stats.reset()
+        self.slow_queries.clear()
+
+    def dump_query_stats(self, path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Collect statement statistics, slow queries, pool and cache counters.
+
+        Print a saved dump with ``python -m src.databases <path>``.
+
+        Args:
+            path: File to write the dump to as JSON, or None
+
+        Returns:
+            Dict[str, Any]: The dump
+        """
+        dump = {
+            "statements": self.get_query_stats(),
+            "slow_queries": self.get_slow_queries(),
+            "pool": self.get_pool_stats(),
+            "result_cache": self.get_cache_stats(),
+            "invoice_summaries": self.get_invoice_summary_stats(),
+        }
+        if path:
+            Path(path).write_text(json.dumps(dump, indent=2), encoding="utf-8")
+        return dump
+
+    def _detect_search_index(self) -> bool:
+        """Check whether the catalog contains the full-text search tables."""
+        if self.engine.dialect.name != "sqlite":
+            return False
+        result = self.query(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'track_fts'"
+        )
+        return bool(result)
+
+    def search(self, name: str, parameter: str, term: str) -> QueryResult:
+        """
+        Run a catalog name search, using the full-text index when available.
+
+        With the index, ``<name>_fts`` is executed with the term turned into a
+        token-prefix MATCH expression and results come back ranked by relevance.
+        Otherwise the LIKE-based ``<name>`` statement is executed.
+
+        Args:
+            name: Base name of the registered search statement
+            parameter: Name of the statement's search parameter
+            term: Search text
+
+        Returns:
+            QueryResult: Matching rows
+        """
+        match = fts_match_expression(term)
+        if self.has_search_index and match is not None:
+            return self.execute(f"{name}_fts", {parameter: match})
+        return self.execute(name, {parameter: term})
+
+    def search_page(
+        self,
+        name: str,
+        parameter: str,
+        term: str,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> ResultPage:
+        """
+        Paginated variant of ``search``.
+
+        Args:
+            name: Base name of the registered search statement
+            parameter: Name of the statement's search parameter
+            term: Search text
+            cursor: Cursor returned with the previous page, or None for the first page
+            limit: Maximum rows in the page
+
+        Returns:
+            ResultPage: Matching rows of the page and the cursor of the next one
+        """
+        match = fts_match_expression(term)
+        if self.has_search_index and match is not None:
+            return self.execute_page(f"{name}_fts", {parameter: match}, cursor, limit)
+        return self.execute_page(name, {parameter: term}, cursor, limit)
+
+    def search_many(
+        self,
+        name: str,
+        parameter: str,
+        terms: Sequence[str],
+        limit: Optional[int] = None,
+    ) -> Dict[str, ResultPage]:
+        """
+        Run a catalog name search for several terms at once.
+
+        On SQLite all terms are answered by the set-based ``<name>_batch``
+        statement (or ``<name>_batch_fts`` with the full-text index), which
+        joins a JSON array of terms and keeps the first rows of each term.
+        Other backends run the single-term search once per term.
+
+        Args:
+            name: Base name of the registered single-term search statement
+            parameter: Name of the single-term statement's search parameter
+            terms: Search texts; blank and duplicate terms are ignored
+            limit: Maximum rows per term, capped at ``Settings.tool_max_rows``
+
+        Returns:
+            Dict[str, ResultPage]: First page of matches per term, in input order
+        """
+        terms = list(dict.fromkeys(term.strip() for term in terms if term.strip()))
+        max_rows = self.settings.tool_max_rows
+        limit = max(1, min(limit, max_rows)) if limit else max_rows
+
+        # json_each is SQLite-specific
+        if self.engine.dialect.name != "sqlite":
+            return {
+                term: self.search_page(name, parameter, term, limit=limit)
+                for term in terms
+            }
+
+        statement = f"{name}_batch"
+        searched = terms
+        if self.has_search_index:
+            statement = f"{name}_batch_fts"
+            matches = {term: fts_match_expression(term) for term in terms}
+            searched = [term for term in terms if matches[term] is not None]
+            payload = [matches[term] for term in searched]
+        else:
+            payload = searched
+
+        # One look-ahead row per term tells whether more rows are available
+        result = self.execute(
+            statement, {"terms": json.dumps(payload), "limit": limit + 1}
+        )
+        # The first column is the term's position in the payload
+        columns = result.columns[1:]
+        grouped: Dict[int, List[tuple]] = {}
+        for row in result.rows:
+            grouped.setdefault(row[0], []).append(row[1:])
+
+        pages = {term: ResultPage(columns, [], 0, None) for term in terms}
+        for index, term in enumerate(searched):
+            rows = grouped.get(index, [])
+            more = len(rows) > limit
+            pages[term] = ResultPage(
+                columns, rows[:limit], 0, encode_cursor(limit) if more else None
+            )
+        return pages
+
+    def find_closest_names(
+        self, text: str, kinds: Optional[List[str]] = None, limit: int = 5
+    ) -> QueryResult:
+        """
+        Find the artist, album and track names closest to possibly misspelled text.
+
+        Args:
+            text: Name as given by the customer
+            kinds: Restrict matches to "artist", "album" and/or "track"
+            limit: Maximum number of matches
+
+        Returns:
+            QueryResult: Kind, Name, ArtistName and Score columns, best match first
+        """
+        matches = self.name_index.search(
+            text, lambda: self.execute("catalog_names").rows, kinds, limit
+        )
+        return QueryResult(
+            ("Kind", "Name", "ArtistName", "Score"),
+            [(kind, name, artist, score) for (kind, _, name, artist), score in matches],
+        )
+
+    def find_similar(
+        self, text: str, kinds: Optional[List[str]] = None, limit: int = 5
+    ) -> QueryResult:
+        """
+        Find the catalog entries whose embeddings are closest to a name or description.
+
+        Args:
+            text: Catalog name (e.g. a song title) or free-text description
+            kinds: Restrict matches to "track", "album", "artist" and/or "genre"
+            limit: Maximum number of matches
+
+        Returns:
+            QueryResult: Kind, Name, ArtistName and Score columns, best match first
+        """
+        matches = self.vector_index.search(
+            text,
+            lambda: self.execute("vector_documents").rows,
+            f"{self.cache_namespace}:v{CHINOOK_SNAPSHOT_VERSION}",
+            kinds,
+            limit,
+        )
+        return QueryResult(
+            ("Kind", "Name", "ArtistName", "Score"),
+            [(kind, name, artist, score) for (kind, _, name, artist), score in matches],
+        )
+
+    def invalidate_name_index(self):
+        """Drop the fuzzy name index; it is rebuilt on the next search."""
+        self.name_index.invalidate()
+
+    def _load_recommendation_data(self):
+        """Fetch the catalog, playlist and purchase rows the matrices are built from."""
+        return (
+            self.execute("recommendation_tracks").rows,
+            self.execute("recommendation_playlists").rows,
+            self.execute("recommendation_purchases", {"after_line_id": 0}).rows,
+        )
+
+    def refresh_recommendations(self):
+        """Apply invoice lines added since the matrices were built or last refreshed."""
+        if not self.recommendations.is_built:
+            return
+        after_line_id = self.recommendations.last_invoice_line_id
+        result = self.execute(
+            "recommendation_purchases", {"after_line_id": after_line_id}
+        )
+        if result:
+            self.recommendations.add_purchases(result.rows)
+
+    def recommend_for_customer(
+        self, customer_id: int, limit: int = 5
+    ) -> List[Recommendation]:
+        """
+        Recommend artists and tracks from the customer's purchase history.
+
+        The co-occurrence matrices are built on first use; later calls only
+        fetch the invoice lines added since and update the matrices in place.
+
+        Args:
+            customer_id: Customer to recommend for
+            limit: Maximum number of recommendations
+
+        Returns:
+            List[Recommendation]: Artist, genre, suggested track and score, best first
+        """
+        self.refresh_recommendations()
+        return self.recommendations.recommend(
+            customer_id, self._load_recommendation_data, limit
+        )
+
+    def _load_customer_identifiers(self):
+        """Fetch the rows the customer identifier index is built from."""
+        return self.execute("customer_identifiers").rows
+
+    def rebuild_customer_index(self):
+        """Rebuild the customer identifier index from the Customer table."""
+        self.customer_index.build(self._load_customer_identifiers())
+
+    def invalidate_customer_index(self):
+        """Drop the customer identifier index; it is rebuilt on the next lookup."""
+        self.customer_index.invalidate()
 
     def get_customer_id_from_identifier(self, identifier: str) -> Optional[int]:
         """
         Retrieve Customer ID using an identifier, which can be a customer ID, email, or phone number.
 
         This function supports three types of identifiers:
-        1. Direct customer ID (numeric string)
-        2. Phone number (starts with '+')
-        3. Email address (contains '@')
+        1. Direct customer ID (numeric string), checked for existence
+        2. Email address (contains '@'), matched case-insensitively
+        3. Phone number, matched on its digits regardless of formatting
+
+        Lookups are served from the in-memory customer identifier index.
 
         Args:
             identifier (str): The identifier can be customer ID, email, or phone number.
@@ -73,28 +884,251 @@ class Database:
         Returns:
             Optional[int]: The CustomerId if found, otherwise None.
         """
-        # Check if identifier is a direct customer ID (numeric)
-        if identifier.isdigit():
-            return int(identifier)
+        return self.customer_index.lookup(identifier, self._load_customer_identifiers)
+
+    def _load_invoice_tables_version(self) -> str:
+        """
+        Checksum the Invoice, InvoiceLine, Customer and Employee columns summaries read.
+
+        Any change to a value a summary is computed from, such as a reassigned
+        support rep or an edited unit price, changes the checksum. The tables
+        are read in full, at most once per ``invoice_summary_check_interval``.
+        """
+        digest = hashlib.sha256()
+        for name in INVOICE_VERSION_STATEMENTS:
+            for row in self.execute(name).rows:
+                digest.update(repr(row).encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    @staticmethod
+    def _invoice_summary_key(customer_id) -> Optional[int]:
+        """Customer ID as an int, or None if it is not numeric."""
+        customer_id = str(customer_id).strip()
+        return int(customer_id) if customer_id.isdigit() else None
+
+    def load_invoice_summary(self, customer_id) -> Optional[InvoiceSummary]:
+        """
+        Compute a customer's invoice summary and cache it.
+
+        Args:
+            customer_id: Verified customer ID
+
+        Returns:
+            Optional[InvoiceSummary]: The summary, or None if the ID is not numeric
+        """
+        key = self._invoice_summary_key(customer_id)
+        if key is None:
+            return None
+
+        # Read the version first, so writes made while computing leave it stale
+        version = self.invoice_summaries.validate(self._load_invoice_tables_version)
+        parameters = {"customer_id": key}
+        summary = InvoiceSummary(
+            key,
+            invoices=self.execute("invoices_by_customer", parameters),
+            invoice_lines=self.execute("invoice_lines_by_unit_price", parameters),
+            spend=self.execute(
+                "invoice_spend_summary",
+                {
+                    **parameters,
+                    "start_date": EARLIEST_INVOICE_DATE,
+                    "end_date": LATEST_INVOICE_DATE,
+                },
+            ),
+            top_invoices=self.execute(
+                "invoice_top_by_total",
+                {
+                    **parameters,
+                    "start_date": EARLIEST_INVOICE_DATE,
+                    "end_date": LATEST_INVOICE_DATE,
+                    "limit": INVOICE_SUMMARY_TOP_INVOICES,
+                },
+            ),
+            support_rep=self.execute("customer_support_rep", parameters),
+            version=version,
+        )
+        self.invoice_summaries.put(summary)
+        return summary
+
+    def prefetch_invoice_summary(self, customer_id) -> Future:
+        """
+        Compute a customer's invoice summary on the database worker threads.
+
+        Called once a customer is verified, so the summary is usually ready by
+        the time the first invoice question reaches the tools.
+
+        Args:
+            customer_id: Verified customer ID
+
+        Returns:
+            Future: Resolves to the summary
+        """
+        return self.executor.submit(self.load_invoice_summary, customer_id)
+
+    def get_invoice_summary(self, customer_id) -> Optional[InvoiceSummary]:
+        """
+        Get a customer's cached invoice summary if it is still current.
+
+        Only the invoice table version is read from the database, at most once
+        per ``invoice_summary_check_interval``; the summary itself is never
+        computed here.
+
+        Args:
+            customer_id: Customer ID
+
+        Returns:
+            Optional[InvoiceSummary]: The summary, or None if not cached or stale
+        """
+        key = self._invoice_summary_key(customer_id)
+        if key is None:
+            return None
+        self.invoice_summaries.validate(self._load_invoice_tables_version)
+        return self.invoice_summaries.get(key)
 
-        # Check if identifier is a phone number (starts with '+')
-        elif identifier.startswith("+"):
-            query = f"SELECT CustomerId FROM Customer WHERE Phone = '{identifier}';"
-            result = self.db.run(query)
-            formatted_result = ast.literal_eval(result)
-            if formatted_result:
-                return formatted_result[0][0]
+    def invalidate_invoice_summaries(self, customer_id=None):
+        """
+        Drop cached invoice summaries after writing to the invoice tables.
+
+        Args:
+            customer_id: Only drop this customer's summary; drop all if None
+        """
+        if customer_id is None:
+            self.invoice_summaries.invalidate()
+            return
+        key = self._invoice_summary_key(customer_id)
+        if key is not None:
+            self.invoice_summaries.invalidate(key)
+
+    def get_invoice_summary_stats(self) -> Dict[str, Any]:
+        """
+        Get hit, miss and eviction counters of the invoice summary cache.
+
+        Returns:
+            Dict[str, Any]: Cache counters and occupancy
+        """
+        return self.invoice_summaries.stats()
+
+    async def run_async(self, func: Callable, *args, **kwargs):
+        """
+        Run a blocking database call on the database worker threads.
+
+        At most ``database_async_workers`` calls run at once; further calls wait
+        in the executor queue without blocking the event loop.
+
+        Args:
+            func: Blocking callable, usually a method of this instance
+            *args: Positional arguments for the callable
+            **kwargs: Keyword arguments for the callable
+
+        Returns:
+            Any: The callable's return value
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(func, *args, **kwargs)
+        )
+
+    async def aquery(
+        self, sql: str, parameters: Optional[Dict[str, Any]] = None
+    ) -> QueryResult:
+        """Async variant of ``query``."""
+        return await self.run_async(self.query, sql, parameters)
+
+    async def aexecute(
+        self, name: str, parameters: Optional[Dict[str, Any]] = None
+    ) -> QueryResult:
+        """Async variant of ``execute``."""
+        return await self.run_async(self.execute, name, parameters)
+
+    async def asearch(self, name: str, parameter: str, term: str) -> QueryResult:
+        """Async variant of ``search``."""
+        return await self.run_async(self.search, name, parameter, term)
+
+    async def aexecute_page(
+        self,
+        name: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> ResultPage:
+        """Async variant of ``execute_page``."""
+        return await self.run_async(self.execute_page, name, parameters, cursor, limit)
+
+    async def asearch_page(
+        self,
+        name: str,
+        parameter: str,
+        term: str,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> ResultPage:
+        """Async variant of ``search_page``."""
+        return await self.run_async(
+            self.search_page, name, parameter, term, cursor, limit
+        )
+
+    async def asearch_many(
+        self,
+        name: str,
+        parameter: str,
+        terms: Sequence[str],
+        limit: Optional[int] = None,
+    ) -> Dict[str, ResultPage]:
+        """Async variant of ``search_many``."""
+        return await self.run_async(self.search_many, name, parameter, terms, limit)
+
+    async def arecommend_for_customer(
+        self, customer_id: int, limit: int = 5
+    ) -> List[Recommendation]:
+        """Async variant of ``recommend_for_customer``."""
+        return await self.run_async(self.recommend_for_customer, customer_id, limit)
+
+    async def afind_similar(
+        self, text: str, kinds: Optional[List[str]] = None, limit: int = 5
+    ) -> QueryResult:
+        """Async variant of ``find_similar``."""
+        return await self.run_async(self.find_similar, text, kinds, limit)
+
+    async def afind_closest_names(
+        self, text: str, kinds: Optional[List[str]] = None, limit: int = 5
+    ) -> QueryResult:
+        """Async variant of ``find_closest_names``."""
+        return await self.run_async(self.find_closest_names, text, kinds, limit)
+
+    async def aget_customer_id_from_identifier(self, identifier: str) -> Optional[int]:
+        """Async variant of ``get_customer_id_from_identifier``."""
+        return await self.run_async(self.get_customer_id_from_identifier, identifier)
+
+    async def aget_invoice_summary(self, customer_id) -> Optional[InvoiceSummary]:
+        """Async variant of ``get_invoice_summary``."""
+        return await self.run_async(self.get_invoice_summary, customer_id)
+
+
+# Process-wide instance, created on first access rather than at import time
+_default_database: Optional[Database] = None
+_default_database_lock = threading.Lock()
+
+
+def get_database() -> Database:
+    """
+    Get the shared Database instance, creating it on first use.
+
+    Returns:
+        Database: The process-wide Database instance
+    """
+    global _default_database
 
-        # Check if identifier is an email address (contains '@')
-        elif "@" in identifier:
-            query = f"SELECT CustomerId FROM Customer WHERE Email = '{identifier}';"
-            result = self.db.run(query)
-            formatted_result = ast.literal_eval(result)
-            if formatted_result:
-                return formatted_result[0][0]
+    if _default_database is None:
+        with _default_database_lock:
+            if _default_database is None:
+                _default_database = Database()
 
-        # Return None if no match found
-        return None
+    return _default_database
 
 
-db = Database()
+def __getattr__(name: str):
+    """Resolve the lazily created module-level ``db`` instance."""
+    if name == "db":
+        return get_database()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
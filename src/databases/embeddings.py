@@ -0,0 +1,158 @@
+"""Text embedders used by the catalog vector index."""
+
+import hashlib
+import re
+import threading
+from typing import Sequence
+
+import numpy as np
+
+from src.config.settings import Settings
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+class Embedder:
+    """
+    Interface of the embedders accepted by the vector index.
+
+    Implementations return one L2-normalized float32 row per text, so inner
+    products between embeddings are cosine similarities.
+    """
+
+    # Identifies the embedding space; vectors from different ids are not comparable
+    id: str = "embedder"
+    dimension: int = 0
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed a batch of texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            np.ndarray: ``(len(texts), dimension)`` float32 array of unit vectors
+        """
+        raise NotImplementedError
+
+
+class HashingEmbedder(Embedder):
+    """
+    Deterministic bag-of-features embedder that needs no model download.
+
+    Word tokens and character trigrams are hashed into signed buckets, so texts
+    sharing words or spellings end up close. Results are stable across
+    processes and platforms, which makes it suitable for tests and offline use.
+    """
+
+    def __init__(self, dimension: int = 256):
+        """
+        Initialize the embedder.
+
+        Args:
+            dimension: Number of hash buckets
+        """
+        self.dimension = dimension
+        self.id = f"hashing-{dimension}"
+
+    def _features(self, text: str):
+        """Yield the word and character trigram features of a text."""
+        for token in _TOKEN.findall(text.casefold()):
+            yield f"w:{token}"
+            padded = f" {token} "
+            for i in range(len(padded) - 2):
+                yield f"c:{padded[i : i + 3]}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed a batch of texts by feature hashing."""
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text or ""):
+                digest = hashlib.blake2b(
+                    feature.encode("utf-8"), digest_size=8
+                ).digest()
+                value = int.from_bytes(digest, "little")
+                sign = 1.0 if value & 1 else -1.0
+                vectors[row, (value >> 1) % self.dimension] += sign
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+class SentenceTransformerEmbedder(Embedder):
+    """
+    Embedder backed by a sentence-transformers model.
+
+    Used with ``Settings.embedding_model``; the model is loaded on first use,
+    so creating the embedder is cheap.
+    """
+
+    def __init__(self, model_name: str, batch_size: int = 64):
+        """
+        Initialize the embedder.
+
+        Args:
+            model_name: Hugging Face model name
+            batch_size: Texts encoded per forward pass
+        """
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.id = f"st-{model_name.replace('/', '--')}"
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        """The loaded sentence-transformers model."""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    try:
+                        from sentence_transformers import SentenceTransformer
+                    except ImportError as e:
+                        raise ImportError(
+                            "The sentence-transformers embedding backend requires "
+                            "the 'sentence-transformers' package; install "
+                            "requirements-embeddings.txt"
+                        ) from e
+                    self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    @property
+    def dimension(self) -> int:
+        """Size of the model's embeddings."""
+        return self.model.get_sentence_embedding_dimension()
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed a batch of texts with the model."""
+        return self.model.encode(
+            list(texts),
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        ).astype(np.float32)
+
+
+def get_embedder(settings: Settings) -> Embedder:
+    """
+    Create the embedder selected by ``Settings.embedding_backend``.
+
+    The default "hashing" backend matches shared words and spellings only and
+    ignores ``Settings.embedding_model``. The "sentence-transformers" backend
+    embeds by meaning with that model and needs the optional packages listed
+    in ``requirements-embeddings.txt``.
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        Embedder: The configured embedder
+    """
+    if settings.embedding_backend == "hashing":
+        return HashingEmbedder()
+    if settings.embedding_backend == "sentence-transformers":
+        return SentenceTransformerEmbedder(
+            settings.embedding_model, settings.embedding_batch_size
+        )
+    raise ValueError(f"Unknown embedding backend: {settings.embedding_backend}")
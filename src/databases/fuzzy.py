@@ -0,0 +1,176 @@
+"""Trigram and edit-distance matching over artist, album and track names."""
+
+import difflib
+import re
+import threading
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+# Number of trigram candidates re-scored with the more expensive edit-distance ratio
+_CANDIDATE_POOL = 50
+
+# (kind, id, name, artist name)
+CatalogName = Tuple[str, int, str, Optional[str]]
+
+# (entries, normalized names, trigram counts, trigram -> entry positions)
+_IndexData = Tuple[List[CatalogName], List[str], List[int], Dict[str, List[int]]]
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """
+    Normalize a name for fuzzy comparison.
+
+    Diacritics are stripped, case is folded and punctuation collapses to single
+    spaces, so "Beyoncé" and "beyonce" or "AC/DC" and "ac dc" compare equal.
+
+    Args:
+        name: Raw name
+
+    Returns:
+        str: Normalized name
+    """
+    if not name:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _NON_ALNUM.sub(" ", stripped.casefold()).strip()
+
+
+def trigrams(normalized: str) -> set:
+    """
+    Get the padded character trigrams of a normalized name.
+
+    Args:
+        normalized: Output of ``normalize_name``
+
+    Returns:
+        set: Distinct trigrams
+    """
+    padded = f"  {normalized} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _best_ratio(query: str, name: str) -> float:
+    """
+    Edit-distance similarity of a query to a name or to any run of its words.
+
+    Comparing against word windows of the query's length lets a partial name
+    such as "stones" score highly against "the rolling stones".
+    """
+    best = difflib.SequenceMatcher(None, query, name).ratio()
+    words = name.split()
+    width = len(query.split())
+    if width < len(words):
+        for start in range(len(words) - width + 1):
+            window = " ".join(words[start : start + width])
+            best = max(best, difflib.SequenceMatcher(None, query, window).ratio())
+    return best
+
+
+class FuzzyNameIndex:
+    """
+    Candidate index for misspelled or partial catalog names.
+
+    A trigram inverted index narrows the catalog to the names sharing the most
+    trigrams with the query; those candidates are re-scored with a blend of
+    trigram similarity and ``difflib`` edit-distance ratio, taken against the
+    whole name or its best-matching run of words. The index is built
+    lazily on the first search and can be invalidated to force a rebuild.
+    """
+
+    def __init__(self):
+        """Initialize an empty, unbuilt index."""
+        self._lock = threading.Lock()
+        self._index: Optional[_IndexData] = None
+
+    @property
+    def is_built(self) -> bool:
+        """Whether the index currently holds data."""
+        return self._index is not None
+
+    def build(self, names: Iterable[CatalogName]):
+        """
+        Build the index from ``(kind, id, name, artist)`` rows.
+
+        Args:
+            names: Catalog names to index
+        """
+        entries: List[CatalogName] = []
+        normalized_names: List[str] = []
+        trigram_counts: List[int] = []
+        postings: Dict[str, List[int]] = {}
+
+        for entry in names:
+            normalized = normalize_name(entry[2])
+            if not normalized:
+                continue
+            position = len(entries)
+            grams = trigrams(normalized)
+            entries.append(entry)
+            normalized_names.append(normalized)
+            trigram_counts.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(position)
+
+        self._index = (entries, normalized_names, trigram_counts, postings)
+
+    def invalidate(self):
+        """Drop the index so it is rebuilt on the next search."""
+        self._index = None
+
+    def search(
+        self,
+        text: str,
+        loader,
+        kinds: Optional[Sequence[str]] = None,
+        limit: int = 5,
+    ) -> List[Tuple[CatalogName, float]]:
+        """
+        Find the catalog names closest to the given text.
+
+        Args:
+            text: Possibly misspelled or partial name
+            loader: Callable returning catalog names, used if the index is not built
+            kinds: Restrict results to these kinds ("artist", "album", "track")
+            limit: Maximum number of matches to return
+
+        Returns:
+            List[Tuple[CatalogName, float]]: Matches with scores in [0, 1], best first
+        """
+        index = self._index
+        if index is None:
+            with self._lock:
+                if self._index is None:
+                    self.build(loader())
+                index = self._index
+        entries, normalized_names, trigram_counts, postings = index
+
+        query = normalize_name(text)
+        if not query:
+            return []
+        query_grams = trigrams(query)
+
+        # Count shared trigrams per candidate using the inverted index
+        shared: Counter = Counter()
+        for gram in query_grams:
+            shared.update(postings.get(gram, ()))
+
+        allowed = set(kinds) if kinds else None
+        scored = []
+        for position, overlap in shared.items():
+            if allowed is not None and entries[position][0] not in allowed:
+                continue
+            # Dice coefficient over trigram sets
+            dice = 2 * overlap / (len(query_grams) + trigram_counts[position])
+            scored.append((dice, position))
+        scored.sort(reverse=True)
+
+        results = []
+        for dice, position in scored[:_CANDIDATE_POOL]:
+            ratio = _best_ratio(query, normalized_names[position])
+            results.append((entries[position], round((dice + ratio) / 2, 3)))
+        results.sort(key=lambda match: match[1], reverse=True)
+        return results[:limit]
@@ -0,0 +1,187 @@
+"""Slow-query log and query statistics reports for the Database layer."""
+
+import json
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+# Longest parameter value kept in a slow-query entry
+_MAX_PARAMETER_LENGTH = 200
+
+
+def _loggable(value: Any) -> Any:
+    """A parameter value as stored in the log: JSON types, long strings cut short."""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    text = str(value)
+    if len(text) > _MAX_PARAMETER_LENGTH:
+        return text[:_MAX_PARAMETER_LENGTH] + "..."
+    return text
+
+
+class SlowQueryLog:
+    """
+    Bounded in-memory log of statements slower than a threshold.
+
+    Each entry records the statement, its parameters, latency, row count,
+    result size and, when available, its ``EXPLAIN QUERY PLAN`` steps. With a
+    ``path``, entries are also appended to that file as JSON lines so they
+    outlive the process.
+    """
+
+    def __init__(
+        self, threshold: float, max_entries: int = 100, path: Optional[str] = None
+    ):
+        """
+        Initialize the log.
+
+        Args:
+            threshold: Seconds above which a statement is logged
+            max_entries: Number of most recent entries kept in memory
+            path: File to append entries to as JSON lines, or None
+        """
+        self.threshold = threshold
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._entries: deque = deque(maxlen=max_entries)
+
+    def is_slow(self, elapsed: float) -> bool:
+        """Whether a statement taking ``elapsed`` seconds belongs in the log."""
+        return self.threshold > 0 and elapsed >= self.threshold
+
+    def record(
+        self,
+        name: str,
+        parameters: Optional[Mapping[str, Any]],
+        elapsed: float,
+        rows: int,
+        size: int,
+        plan: Optional[List[str]] = None,
+        error: bool = False,
+    ):
+        """
+        Add a slow statement to the log.
+
+        Args:
+            name: Statement name
+            parameters: Values bound to the statement
+            elapsed: Execution time in seconds
+            rows: Number of rows returned
+            size: Estimated size of the returned rows, in bytes
+            plan: Query plan steps, if captured
+            error: Whether the execution raised
+        """
+        entry = {
+            "timestamp": time.time(),
+            "statement": name,
+            "parameters": {
+                key: _loggable(value) for key, value in (parameters or {}).items()
+            },
+            "seconds": round(elapsed, 6),
+            "rows": rows,
+            "bytes": size,
+            "error": error,
+            "plan": plan,
+        }
+        with self._lock:
+            self._entries.append(entry)
+            if self.path is not None:
+                with self.path.open("a", encoding="utf-8") as log_file:
+                    log_file.write(json.dumps(entry) + "\n")
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """
+        Get the logged entries.
+
+        Returns:
+            List[Dict[str, Any]]: Entries, oldest first
+        """
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self):
+        """Drop the in-memory entries; the log file is left as is."""
+        with self._lock:
+            self._entries.clear()
+
+
+def format_query_report(
+    statements: Mapping[str, Mapping[str, Any]],
+    slow_queries: Sequence[Mapping[str, Any]] = (),
+) -> str:
+    """
+    Render statement statistics and slow queries as plain-text tables.
+
+    Args:
+        statements: Statement name to its statistics, as from ``get_query_stats``
+        slow_queries: Slow-query log entries
+
+    Returns:
+        str: The report
+    """
+    lines = []
+    if statements:
+        lines.append(
+            "Statement | Calls | Errors | Mean ms | p95 ms | Max ms | Rows | KiB"
+        )
+    ranked = sorted(
+        statements.items(), key=lambda item: item[1]["total_seconds"], reverse=True
+    )
+    for name, stats in ranked:
+        lines.append(
+            " | ".join(
+                [
+                    name,
+                    str(stats["calls"]),
+                    str(stats["errors"]),
+                    f"{stats['mean_seconds'] * 1000:.2f}",
+                    f"{stats['p95_seconds'] * 1000:.2f}",
+                    f"{stats['max_seconds'] * 1000:.2f}",
+                    str(stats.get("rows", 0)),
+                    f"{stats.get('bytes', 0) / 1024:.1f}",
+                ]
+            )
+        )
+
+    if slow_queries:
+        if lines:
+            lines.append("")
+        lines.append("Slow queries:")
+        for entry in slow_queries:
+            stamp = time.strftime(
+                "%Y-%m-%d %H:%M:%S", time.localtime(entry["timestamp"])
+            )
+            lines.append(
+                f"{stamp} {entry['statement']} {entry['seconds'] * 1000:.1f} ms, "
+                f"{entry['rows']} rows {json.dumps(entry['parameters'])}"
+            )
+            for step in entry.get("plan") or []:
+                lines.append(f"    {step}")
+    return "\n".join(lines) or "No queries recorded."
+
+
+def load_report(path: str) -> str:
+    """
+    Build a report from a statistics dump or a slow-query log file.
+
+    Args:
+        path: JSON dump from ``Database.dump_query_stats`` or a JSON-lines log
+
+    Returns:
+        str: The report
+    """
+    content = Path(path).read_text(encoding="utf-8").strip()
+    if not content:
+        return "No queries recorded."
+    try:
+        dump = json.loads(content)
+    except json.JSONDecodeError:
+        dump = None
+    if isinstance(dump, dict) and "statements" in dump:
+        return format_query_report(dump["statements"], dump["slow_queries"])
+
+    # A slow-query log holds one JSON object per line
+    entries = [json.loads(line) for line in content.splitlines() if line.strip()]
+    return format_query_report({}, entries)
@@ -0,0 +1,201 @@
+"""Bounded per-customer cache of invoice summaries computed at verification."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from .results import QueryResult
+
+
+class InvoiceSummary:
+    """
+    Invoice data of one customer, read by the invoice tools instead of SQL.
+
+    Every field holds the result of the statement the matching tool would run,
+    so a tool answers from the summary exactly as it would from the database.
+    """
+
+    __slots__ = (
+        "customer_id",
+        "invoices",
+        "invoice_lines",
+        "spend",
+        "top_invoices",
+        "support_rep",
+        "version",
+    )
+
+    def __init__(
+        self,
+        customer_id: int,
+        invoices: QueryResult,
+        invoice_lines: QueryResult,
+        spend: QueryResult,
+        top_invoices: QueryResult,
+        support_rep: QueryResult,
+        version: Hashable,
+    ):
+        """
+        Initialize the summary.
+
+        Args:
+            customer_id: Customer the summary belongs to
+            invoices: Invoices, most recent first (``invoices_by_customer``)
+            invoice_lines: Invoice lines, highest unit price first
+            spend: Spend summary over all invoices (``invoice_spend_summary``)
+            top_invoices: Largest invoices by total (``invoice_top_by_total``)
+            support_rep: Name, title and email of the customer's support rep
+            version: Invoice table version the summary was computed at
+        """
+        self.customer_id = customer_id
+        self.invoices = invoices
+        self.invoice_lines = invoice_lines
+        self.spend = spend
+        self.top_invoices = top_invoices
+        self.support_rep = support_rep
+        self.version = version
+
+    def has_invoice(self, invoice_id: Any) -> bool:
+        """
+        Check whether an invoice belongs to the customer.
+
+        Args:
+            invoice_id: Invoice ID, as an int or numeric string
+
+        Returns:
+            bool: True if the invoice is one of the customer's invoices
+        """
+        return str(invoice_id).strip() in {
+            str(value) for value in self.invoices.column("InvoiceId")
+        }
+
+
+class InvoiceSummaryCache:
+    """
+    Thread-safe LRU cache of invoice summaries keyed by customer ID.
+
+    The cache tracks a version of the invoice tables (a checksum of the
+    ``Invoice``, ``InvoiceLine``, ``Customer`` and ``Employee`` columns the
+    summaries read) and re-reads it at most every ``check_interval`` seconds.
+    Summaries computed at an older version are dropped, so a write to any of
+    those columns is picked up within one interval.
+    """
+
+    def __init__(self, max_entries: int, check_interval: float):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached customers
+            check_interval: Seconds between checks of the invoice table version
+        """
+        self.max_entries = max_entries
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._check_lock = threading.Lock()
+        self._entries: "OrderedDict[int, InvoiceSummary]" = OrderedDict()
+        self._version: Optional[Hashable] = None
+        self._checked_at = float("-inf")
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def validate(self, loader: Callable[[], Hashable]) -> Hashable:
+        """
+        Re-read the invoice table version if the check interval has passed.
+
+        When the version changed, every cached summary is dropped.
+
+        Args:
+            loader: Callable returning the current invoice table version
+
+        Returns:
+            Hashable: The current version
+        """
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return self._version
+        with self._check_lock:
+            if time.monotonic() - self._checked_at >= self.check_interval:
+                version = loader()
+                with self._lock:
+                    if version != self._version:
+                        if self._entries:
+                            self.invalidations += 1
+                        self._entries.clear()
+                        self._version = version
+                self._checked_at = time.monotonic()
+            return self._version
+
+    def get(self, customer_id: int) -> Optional[InvoiceSummary]:
+        """
+        Look up a customer's summary and mark it as recently used.
+
+        Args:
+            customer_id: Customer ID
+
+        Returns:
+            Optional[InvoiceSummary]: The summary, or None if not cached or stale
+        """
+        with self._lock:
+            summary = self._entries.get(customer_id)
+            if summary is None or summary.version != self._version:
+                if summary is not None:
+                    del self._entries[customer_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(customer_id)
+            self.hits += 1
+            return summary
+
+    def put(self, summary: InvoiceSummary):
+        """
+        Cache a summary, evicting the least recently used customers beyond the limit.
+
+        Summaries computed at a version other than the current one are ignored.
+
+        Args:
+            summary: Summary to cache
+        """
+        with self._lock:
+            if summary.version != self._version:
+                return
+            self._entries[summary.customer_id] = summary
+            self._entries.move_to_end(summary.customer_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, customer_id: Optional[int] = None):
+        """
+        Drop cached summaries.
+
+        Args:
+            customer_id: Only drop this customer's summary; drop everything if None
+        """
+        with self._lock:
+            if customer_id is None:
+                self._entries.clear()
+                self._version = None
+                self._checked_at = float("-inf")
+            else:
+                self._entries.pop(customer_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters and current occupancy.
+
+        Returns:
+            Dict[str, Any]: Hits, misses, evictions, invalidations, hit rate and size
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+            }
@@ -0,0 +1,74 @@
+"""Connection pool metrics for the database engine."""
+
+import threading
+from typing import Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class PoolMetrics:
+    """
+    Thread-safe counters describing how a SQLAlchemy connection pool is used.
+
+    Counters are updated from pool events, so they cover every checkout made
+    through the engine, including those made by LangChain's SQLDatabase.
+    """
+
+    def __init__(self):
+        """Initialize all counters to zero."""
+        self._lock = threading.Lock()
+        self.connections_created = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+
+    def attach(self, engine: Engine) -> "PoolMetrics":
+        """
+        Register pool event listeners on the given engine.
+
+        Args:
+            engine: Engine whose pool should be observed
+
+        Returns:
+            PoolMetrics: This instance, for chaining
+        """
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        return self
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        """Count a newly opened DBAPI connection."""
+        with self._lock:
+            self.connections_created += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        """Count a checkout and track the high-water mark."""
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        """Count a connection returned to the pool."""
+        with self._lock:
+            self.checkins += 1
+            self.in_use = max(self.in_use - 1, 0)
+
+    def snapshot(self) -> Dict[str, int]:
+        """
+        Get a consistent copy of the current counters.
+
+        Returns:
+            Dict[str, int]: Counter name to value
+        """
+        with self._lock:
+            return {
+                "connections_created": self.connections_created,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+            }
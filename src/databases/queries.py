@@ -0,0 +1,747 @@
+"""Registry of the named, parameterized SQL statements used by the tools."""
+
+import bisect
+import threading
+from typing import Any, Dict, Iterator, List, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
+
+
+class Index:
+    """A secondary index a statement relies on, created when the database loads."""
+
+    def __init__(self, table: str, columns: Sequence[str]):
+        """
+        Initialize the index definition.
+
+        Args:
+            table: Indexed table
+            columns: Indexed columns, in key order
+        """
+        self.table = table
+        self.columns = tuple(columns)
+        self.name = f"ix_{table}_{'_'.join(self.columns)}".lower()
+
+    @property
+    def ddl(self) -> str:
+        """Idempotent CREATE INDEX statement for this index."""
+        return (
+            f"CREATE INDEX IF NOT EXISTS {self.name} "
+            f"ON {self.table} ({', '.join(self.columns)})"
+        )
+
+    def __repr__(self) -> str:
+        """Short description of the index."""
+        return f"Index(name={self.name!r})"
+
+
+class Statement:
+    """
+    A named SQL statement with ``:name`` bind parameters.
+
+    The SQLAlchemy clause is built once and reused for every execution, so the
+    SQL string sent to the driver is identical across calls and hits both
+    SQLAlchemy's compiled cache and SQLite's per-connection statement cache.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        sql: str,
+        cacheable: bool = False,
+        indexes: Sequence[Index] = (),
+        full_scan: bool = False,
+    ):
+        """
+        Initialize the statement.
+
+        Args:
+            name: Unique statement name used by callers
+            sql: SQL text with ``:name`` placeholders
+            cacheable: Whether results may be served from the shared result cache
+            indexes: Secondary indexes the statement's access path relies on
+            full_scan: Whether a table scan is expected (bulk loads, LIKE fallbacks)
+        """
+        self.name = name
+        self.sql = sql
+        self.cacheable = cacheable
+        self.indexes = tuple(indexes)
+        self.full_scan = full_scan
+        self.clause: TextClause = text(sql)
+
+    def __repr__(self) -> str:
+        """Short description of the statement."""
+        return f"Statement(name={self.name!r})"
+
+
+class QueryRegistry:
+    """Collection of named statements, looked up by name at execution time."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._statements: Dict[str, Statement] = {}
+
+    def register(
+        self,
+        name: str,
+        sql: str,
+        cacheable: bool = False,
+        indexes: Sequence[Index] = (),
+        full_scan: bool = False,
+    ) -> Statement:
+        """
+        Register a statement under a unique name.
+
+        Args:
+            name: Statement name
+            sql: SQL text with ``:name`` placeholders
+            cacheable: Whether results only depend on the read-only catalog
+            indexes: Secondary indexes to provision for this statement
+            full_scan: Whether a table scan is expected for this statement
+
+        Returns:
+            Statement: The registered statement
+        """
+        if name in self._statements:
+            raise ValueError(f"Statement already registered: {name}")
+        statement = Statement(name, sql, cacheable, indexes, full_scan)
+        self._statements[name] = statement
+        return statement
+
+    def get(self, name: str) -> Statement:
+        """
+        Look up a statement by name.
+
+        Args:
+            name: Statement name
+
+        Returns:
+            Statement: The registered statement
+        """
+        try:
+            return self._statements[name]
+        except KeyError:
+            raise KeyError(f"Unknown statement: {name}") from None
+
+    def required_indexes(self) -> List[Index]:
+        """
+        Get the distinct indexes required by all registered statements.
+
+        Returns:
+            List[Index]: Indexes in registration order
+        """
+        indexes: Dict[str, Index] = {}
+        for statement in self._statements.values():
+            for index in statement.indexes:
+                indexes.setdefault(index.name, index)
+        return list(indexes.values())
+
+    def __contains__(self, name: str) -> bool:
+        """Whether a statement with this name is registered."""
+        return name in self._statements
+
+    def __iter__(self) -> Iterator[Statement]:
+        """Iterate over the registered statements."""
+        return iter(self._statements.values())
+
+    def __len__(self) -> int:
+        """Number of registered statements."""
+        return len(self._statements)
+
+
+# Upper bounds, in seconds, of the latency histogram buckets; the last is open-ended
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _bucket_label(index: int) -> str:
+    """Label of a latency histogram bucket."""
+    if index < len(LATENCY_BUCKETS):
+        return f"<={LATENCY_BUCKETS[index]:g}s"
+    return f">{LATENCY_BUCKETS[-1]:g}s"
+
+
+def _percentile(histogram: List[int], fraction: float, slowest: float) -> float:
+    """
+    Estimate a latency percentile from a histogram.
+
+    Returns the upper bound of the bucket holding the given fraction of the
+    calls, capped at the slowest call seen.
+    """
+    rank = fraction * sum(histogram)
+    seen = 0
+    for index, count in enumerate(histogram):
+        seen += count
+        if count and seen >= rank:
+            if index < len(LATENCY_BUCKETS):
+                return min(LATENCY_BUCKETS[index], slowest)
+            return slowest
+    return 0.0
+
+
+class StatementStats:
+    """
+    Thread-safe per-statement call counts, latency histograms and result sizes.
+
+    Latencies are counted in the fixed ``LATENCY_BUCKETS``, so percentiles are
+    reported as the upper bound of the bucket they fall in.
+    """
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def record(
+        self,
+        name: str,
+        elapsed: float,
+        error: bool = False,
+        rows: int = 0,
+        size: int = 0,
+    ):
+        """
+        Record one execution of a statement.
+
+        Args:
+            name: Statement name
+            elapsed: Execution time in seconds
+            error: Whether the execution raised
+            rows: Number of rows returned
+            size: Estimated size of the returned rows, in bytes
+        """
+        bucket = bisect.bisect_left(LATENCY_BUCKETS, elapsed)
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = {
+                    "calls": 0,
+                    "errors": 0,
+                    "total_seconds": 0.0,
+                    "max_seconds": 0.0,
+                    "rows": 0,
+                    "max_rows": 0,
+                    "bytes": 0,
+                    "max_bytes": 0,
+                    "histogram": [0] * (len(LATENCY_BUCKETS) + 1),
+                }
+            stats["calls"] += 1
+            stats["total_seconds"] += elapsed
+            stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+            stats["rows"] += rows
+            stats["max_rows"] = max(stats["max_rows"], rows)
+            stats["bytes"] += size
+            stats["max_bytes"] = max(stats["max_bytes"], size)
+            stats["histogram"][bucket] += 1
+            if error:
+                stats["errors"] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get a copy of the statistics with means and latency percentiles added.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Statement name to its statistics
+        """
+        with self._lock:
+            return {
+                name: {
+                    **stats,
+                    "mean_seconds": stats["total_seconds"] / stats["calls"],
+                    "p50_seconds": _percentile(
+                        stats["histogram"], 0.5, stats["max_seconds"]
+                    ),
+                    "p95_seconds": _percentile(
+                        stats["histogram"], 0.95, stats["max_seconds"]
+                    ),
+                    "p99_seconds": _percentile(
+                        stats["histogram"], 0.99, stats["max_seconds"]
+                    ),
+                    "histogram": {
+                        _bucket_label(index): count
+                        for index, count in enumerate(stats["histogram"])
+                        if count
+                    },
+                }
+                for name, stats in self._stats.items()
+            }
+
+    def reset(self):
+        """Clear all recorded statistics."""
+        with self._lock:
+            self._stats.clear()
+
+
+# Indexes backing the tool access paths
+ALBUM_BY_ARTIST = Index("Album", ["ArtistId", "Title"])
+TRACK_BY_ALBUM = Index("Track", ["AlbumId", "Name"])
+TRACK_BY_GENRE = Index("Track", ["GenreId", "AlbumId", "Name"])
+INVOICE_BY_CUSTOMER = Index("Invoice", ["CustomerId", "InvoiceDate"])
+INVOICE_LINE_BY_INVOICE = Index("InvoiceLine", ["InvoiceId", "UnitPrice"])
+
+# Statements used by the tools and customer verification
+QUERIES = QueryRegistry()
+
+# Customer verification (loads the in-memory identifier index)
+QUERIES.register(
+    "customer_identifiers",
+    "SELECT CustomerId, Phone, Email FROM Customer",
+    full_scan=True,
+)
+
+# Music catalog
+QUERIES.register(
+    "albums_by_artist",
+    """
+    SELECT Album.Title, Artist.Name
+    FROM Album
+    JOIN Artist ON Album.ArtistId = Artist.ArtistId
+    WHERE LOWER(Artist.Name) LIKE '%' || LOWER(:artist) || '%'
+    ORDER BY Artist.Name, Album.AlbumId
+    """,
+    cacheable=True,
+    full_scan=True,
+)
+QUERIES.register(
+    "tracks_by_artist",
+    """
+    SELECT Track.Name as SongName, Artist.Name as ArtistName
+    FROM Album
+    LEFT JOIN Artist ON Album.ArtistId = Artist.ArtistId
+    LEFT JOIN Track ON Track.AlbumId = Album.AlbumId
+    WHERE LOWER(Artist.Name) LIKE '%' || LOWER(:artist) || '%'
+    ORDER BY Artist.Name, Album.AlbumId, Track.TrackId
+    """,
+    cacheable=True,
+    full_scan=True,
+)
+QUERIES.register(
+    "songs_by_genre",
+    """
+    SELECT MIN(Track.Name) as SongName, Artist.Name as ArtistName
+    FROM Track
+    LEFT JOIN Album ON Track.AlbumId = Album.AlbumId
+    LEFT JOIN Artist ON Album.ArtistId = Artist.ArtistId
+    WHERE Track.GenreId IN (
+        SELECT GenreId FROM Genre WHERE LOWER(Name) LIKE '%' || LOWER(:genre) || '%'
+    )
+    GROUP BY Artist.Name
+    ORDER BY Artist.Name
+    LIMIT 8
+    """,
+    cacheable=True,
+    indexes=[TRACK_BY_GENRE],
+    full_scan=True,
+)
+QUERIES.register(
+    "songs_by_title",
+    """
+    SELECT * FROM Track
+    WHERE LOWER(Name) LIKE '%' || LOWER(:song_title) || '%'
+    ORDER BY TrackId
+    """,
+    cacheable=True,
+    full_scan=True,
+)
+
+# Names loaded into the fuzzy name index
+QUERIES.register(
+    "catalog_names",
+    """
+    SELECT 'artist' AS Kind, Artist.ArtistId AS Id, Artist.Name AS Name,
+           NULL AS ArtistName
+    FROM Artist
+    UNION ALL
+    SELECT 'album', Album.AlbumId, Album.Title, Artist.Name
+    FROM Album
+    LEFT JOIN Artist ON Album.ArtistId = Artist.ArtistId
+    UNION ALL
+    SELECT 'track', Track.TrackId, Track.Name, Artist.Name
+    FROM Track
+    LEFT JOIN Album ON Track.AlbumId = Album.AlbumId
+    LEFT JOIN Artist ON Album.ArtistId = Artist.ArtistId
+    """,
+    full_scan=True,
+)
+
+# Documents embedded into the catalog vector index
+QUERIES.register(
+    "vector_documents",
+    """
+    SELECT 'track' AS Kind, Track.TrackId AS Id, Track.Name AS Name,
+           Artist.Name AS ArtistName, Album.Title AS AlbumTitle,
+           Genre.Name AS GenreName, Track.Composer AS Composer
+    FROM Track
+    LEFT JOIN Album ON Track.AlbumId = Album.AlbumId
+    LEFT JOIN Artist ON Album.ArtistId = Artist.ArtistId
+    LEFT JOIN Genre ON Track.GenreId = Genre.GenreId
+    UNION ALL
+    SELECT 'album', Album.AlbumId, Album.Title, Artist.Name, NULL, NULL, NULL
+    FROM Album
+    LEFT JOIN Artist ON Album.ArtistId = Artist.ArtistId
+    UNION ALL
+    SELECT 'artist', ArtistId, Name, NULL, NULL, NULL, NULL FROM Artist
+    UNION ALL
+    SELECT 'genre', GenreId, Name, NULL, NULL, NULL, NULL FROM Genre
+    """,
+    full_scan=True,
+)
+
+# Music catalog, full-text variants (parameters are FTS5 MATCH expressions)
+QUERIES.register(
+    "albums_by_artist_fts",
+    """
+    SELECT Album.Title, Artist.Name
+    FROM artist_fts
+    JOIN Artist ON Artist.ArtistId = artist_fts.rowid
+    JOIN Album ON Album.ArtistId = Artist.ArtistId
+    WHERE artist_fts MATCH :artist
+    ORDER BY artist_fts.rank, Artist.Name, Album.AlbumId
+    """,
+    cacheable=True,
+    indexes=[ALBUM_BY_ARTIST],
+)
+QUERIES.register(
+    "tracks_by_artist_fts",
+    """
+    SELECT Track.Name as SongName, Artist.Name as ArtistName
+    FROM artist_fts
+    JOIN Artist ON Artist.ArtistId = artist_fts.rowid
+    JOIN Album ON Album.ArtistId = Artist.ArtistId
+    LEFT JOIN Track ON Track.AlbumId = Album.AlbumId
+    WHERE artist_fts MATCH :artist
+    ORDER BY artist_fts.rank, Artist.Name, Album.AlbumId, Track.TrackId
+    """,
+    cacheable=True,
+    indexes=[ALBUM_BY_ARTIST, TRACK_BY_ALBUM],
+)
+QUERIES.register(
+    "songs_by_genre_fts",
+    """
+    SELECT MIN(Track.Name) as SongName, Artist.Name as ArtistName
+    FROM Track
+    LEFT JOIN Album ON Track.AlbumId = Album.AlbumId
+    LEFT JOIN Artist ON Album.ArtistId = Artist.ArtistId
+    WHERE Track.GenreId IN (
+        SELECT rowid FROM genre_fts WHERE genre_fts MATCH :genre
+    )
+    GROUP BY Artist.Name
+    ORDER BY Artist.Name
+    LIMIT 8
+    """,
+    cacheable=True,
+    indexes=[TRACK_BY_GENRE],
+)
+QUERIES.register(
+    "songs_by_title_fts",
+    """
+    SELECT Track.*
+    FROM track_fts
+    JOIN Track ON Track.TrackId = track_fts.rowid
+    WHERE track_fts MATCH :song_title
+    ORDER BY track_fts.rank, Track.TrackId
+    """,
+    cacheable=True,
+)
+
+# Music catalog, batched variants answering several search terms in one statement.
+# :terms is a JSON array of search terms (FTS5 MATCH expressions for the _fts
+# variants); rows carry the term's array position and at most :limit rows per term.
+# Each term's rows are numbered in the order of its single-term statement, so a
+# batch page continues with the single-term statement's cursor.
+QUERIES.register(
+    "albums_by_artist_batch",
+    """
+    SELECT Position, Title, Name FROM (
+        SELECT terms.key AS Position, Album.Title, Artist.Name,
+               ROW_NUMBER() OVER (
+                   PARTITION BY terms.key ORDER BY Artist.Name, Album.AlbumId
+               ) AS RowNumber
+        FROM json_each(:terms) AS terms
+        JOIN Artist ON LOWER(Artist.Name) LIKE '%' || LOWER(terms.value) || '%'
+        JOIN Album ON Album.ArtistId = Artist.ArtistId
+    )
+    WHERE RowNumber <= :limit
+    ORDER BY Position, RowNumber
+    """,
+    cacheable=True,
+    indexes=[ALBUM_BY_ARTIST],
+    full_scan=True,
+)
+QUERIES.register(
+    "tracks_by_artist_batch",
+    """
+    SELECT Position, SongName, ArtistName FROM (
+        SELECT terms.key AS Position, Track.Name AS SongName,
+               Artist.Name AS ArtistName,
+               ROW_NUMBER() OVER (
+                   PARTITION BY terms.key
+                   ORDER BY Artist.Name, Album.AlbumId, Track.TrackId
+               ) AS RowNumber
+        FROM json_each(:terms) AS terms
+        JOIN Artist ON LOWER(Artist.Name) LIKE '%' || LOWER(terms.value) || '%'
+        JOIN Album ON Album.ArtistId = Artist.ArtistId
+        LEFT JOIN Track ON Track.AlbumId = Album.AlbumId
+    )
+    WHERE RowNumber <= :limit
+    ORDER BY Position, RowNumber
+    """,
+    cacheable=True,
+    indexes=[ALBUM_BY_ARTIST, TRACK_BY_ALBUM],
+    full_scan=True,
+)
+QUERIES.register(
+    "songs_by_genre_batch",
+    """
+    SELECT Position, SongName, ArtistName FROM (
+        SELECT terms.key AS Position, MIN(Track.Name) AS SongName,
+               Artist.Name AS ArtistName,
+               ROW_NUMBER() OVER (PARTITION BY terms.key ORDER BY Artist.Name)
+                   AS RowNumber
+        FROM json_each(:terms) AS terms
+        JOIN Genre ON LOWER(Genre.Name) LIKE '%' || LOWER(terms.value) || '%'
+        JOIN Track ON Track.GenreId = Genre.GenreId
+        LEFT JOIN Album ON Track.AlbumId = Album.AlbumId
+        LEFT JOIN Artist ON Album.ArtistId = Artist.ArtistId
+        GROUP BY terms.key, Artist.Name
+    )
+    WHERE RowNumber <= :limit
+    ORDER BY Position, RowNumber
+    """,
+    cacheable=True,
+    indexes=[TRACK_BY_GENRE],
+    full_scan=True,
+)
+QUERIES.register(
+    "songs_by_title_batch",
+    """
+    SELECT Position, TrackId, Name, AlbumId, MediaTypeId, GenreId, Composer,
+           Milliseconds, Bytes, UnitPrice
+    FROM (
+        SELECT terms.key AS Position, Track.*,
+               ROW_NUMBER() OVER (PARTITION BY terms.key ORDER BY Track.TrackId)
+                   AS RowNumber
+        FROM json_each(:terms) AS terms
+        JOIN Track ON LOWER(Track.Name) LIKE '%' || LOWER(terms.value) || '%'
+    )
+    WHERE RowNumber <= :limit
+    ORDER BY Position, RowNumber
+    """,
+    cacheable=True,
+    full_scan=True,
+)
+QUERIES.register(
+    "albums_by_artist_batch_fts",
+    """
+    SELECT Position, Title, Name FROM (
+        SELECT terms.key AS Position, Album.Title, Artist.Name,
+               ROW_NUMBER() OVER (
+                   PARTITION BY terms.key
+                   ORDER BY artist_fts.rank, Artist.Name, Album.AlbumId
+               ) AS RowNumber
+        FROM json_each(:terms) AS terms
+        JOIN artist_fts ON artist_fts MATCH terms.value
+        JOIN Artist ON Artist.ArtistId = artist_fts.rowid
+        JOIN Album ON Album.ArtistId = Artist.ArtistId
+    )
+    WHERE RowNumber <= :limit
+    ORDER BY Position, RowNumber
+    """,
+    cacheable=True,
+    indexes=[ALBUM_BY_ARTIST],
+)
+QUERIES.register(
+    "tracks_by_artist_batch_fts",
+    """
+    SELECT Position, SongName, ArtistName FROM (
+        SELECT terms.key AS Position, Track.Name AS SongName,
+               Artist.Name AS ArtistName,
+               ROW_NUMBER() OVER (
+                   PARTITION BY terms.key
+                   ORDER BY artist_fts.rank, Artist.Name, Album.AlbumId, Track.TrackId
+               ) AS RowNumber
+        FROM json_each(:terms) AS terms
+        JOIN artist_fts ON artist_fts MATCH terms.value
+        JOIN Artist ON Artist.ArtistId = artist_fts.rowid
+        JOIN Album ON Album.ArtistId = Artist.ArtistId
+        LEFT JOIN Track ON Track.AlbumId = Album.AlbumId
+    )
+    WHERE RowNumber <= :limit
+    ORDER BY Position, RowNumber
+    """,
+    cacheable=True,
+    indexes=[ALBUM_BY_ARTIST, TRACK_BY_ALBUM],
+)
+QUERIES.register(
+    "songs_by_genre_batch_fts",
+    """
+    SELECT Position, SongName, ArtistName FROM (
+        SELECT terms.key AS Position, MIN(Track.Name) AS SongName,
+               Artist.Name AS ArtistName,
+               ROW_NUMBER() OVER (PARTITION BY terms.key ORDER BY Artist.Name)
+                   AS RowNumber
+        FROM json_each(:terms) AS terms
+        JOIN genre_fts ON genre_fts MATCH terms.value
+        JOIN Track ON Track.GenreId = genre_fts.rowid
+        LEFT JOIN Album ON Track.AlbumId = Album.AlbumId
+        LEFT JOIN Artist ON Album.ArtistId = Artist.ArtistId
+        GROUP BY terms.key, Artist.Name
+    )
+    WHERE RowNumber <= :limit
+    ORDER BY Position, RowNumber
+    """,
+    cacheable=True,
+    indexes=[TRACK_BY_GENRE],
+)
+QUERIES.register(
+    "songs_by_title_batch_fts",
+    """
+    SELECT Position, TrackId, Name, AlbumId, MediaTypeId, GenreId, Composer,
+           Milliseconds, Bytes, UnitPrice
+    FROM (
+        SELECT terms.key AS Position, Track.*,
+               ROW_NUMBER() OVER (
+                   PARTITION BY terms.key ORDER BY track_fts.rank, Track.TrackId
+               ) AS RowNumber
+        FROM json_each(:terms) AS terms
+        JOIN track_fts ON track_fts MATCH terms.value
+        JOIN Track ON Track.TrackId = track_fts.rowid
+    )
+    WHERE RowNumber <= :limit
+    ORDER BY Position, RowNumber
+    """,
+    cacheable=True,
+)
+
+# Recommendation matrices (purchases are read incrementally by invoice line)
+QUERIES.register(
+    "recommendation_tracks",
+    """
+    SELECT Track.TrackId, Track.Name, Album.ArtistId, Artist.Name,
+           Track.GenreId, Genre.Name
+    FROM Track
+    JOIN Album ON Track.AlbumId = Album.AlbumId
+    LEFT JOIN Artist ON Album.ArtistId = Artist.ArtistId
+    LEFT JOIN Genre ON Track.GenreId = Genre.GenreId
+    """,
+    full_scan=True,
+)
+QUERIES.register(
+    "recommendation_playlists",
+    "SELECT PlaylistId, TrackId FROM PlaylistTrack",
+    full_scan=True,
+)
+QUERIES.register(
+    "recommendation_purchases",
+    """
+    SELECT InvoiceLine.InvoiceLineId, Invoice.CustomerId, InvoiceLine.TrackId
+    FROM InvoiceLine
+    JOIN Invoice ON Invoice.InvoiceId = InvoiceLine.InvoiceId
+    WHERE InvoiceLine.InvoiceLineId > :after_line_id
+    ORDER BY InvoiceLine.InvoiceLineId
+    """,
+)
+
+# Invoices
+QUERIES.register(
+    "invoices_by_customer",
+    """
+    SELECT * FROM Invoice
+    WHERE CustomerId = :customer_id
+    ORDER BY InvoiceDate DESC
+    """,
+    indexes=[INVOICE_BY_CUSTOMER],
+)
+QUERIES.register(
+    "invoice_lines_by_unit_price",
+    """
+    SELECT Invoice.*, InvoiceLine.UnitPrice
+    FROM Invoice
+    JOIN InvoiceLine ON Invoice.InvoiceId = InvoiceLine.InvoiceId
+    WHERE Invoice.CustomerId = :customer_id
+    ORDER BY InvoiceLine.UnitPrice DESC
+    """,
+    indexes=[INVOICE_BY_CUSTOMER, INVOICE_LINE_BY_INVOICE],
+)
+
+# Invoice analytics; dates are bounded by :start_date (inclusive) and :end_date
+# (exclusive) so both bounds use the (CustomerId, InvoiceDate) index range
+QUERIES.register(
+    "invoice_spend_summary",
+    """
+    SELECT COUNT(*) AS Invoices, ROUND(SUM(Total), 2) AS TotalSpent,
+           ROUND(AVG(Total), 2) AS AverageInvoice, MAX(Total) AS LargestInvoice,
+           MIN(InvoiceDate) AS FirstInvoice, MAX(InvoiceDate) AS LastInvoice
+    FROM Invoice
+    WHERE CustomerId = :customer_id
+      AND InvoiceDate >= :start_date AND InvoiceDate < :end_date
+    """,
+    indexes=[INVOICE_BY_CUSTOMER],
+)
+QUERIES.register(
+    "invoice_top_by_total",
+    """
+    SELECT Invoice.InvoiceId, Invoice.InvoiceDate, Invoice.Total,
+           COUNT(InvoiceLine.InvoiceLineId) AS Tracks
+    FROM Invoice
+    JOIN InvoiceLine ON InvoiceLine.InvoiceId = Invoice.InvoiceId
+    WHERE Invoice.CustomerId = :customer_id
+      AND Invoice.InvoiceDate >= :start_date AND Invoice.InvoiceDate < :end_date
+    GROUP BY Invoice.InvoiceId, Invoice.InvoiceDate, Invoice.Total
+    ORDER BY Invoice.Total DESC, Invoice.InvoiceDate DESC
+    LIMIT :limit
+    """,
+    indexes=[INVOICE_BY_CUSTOMER, INVOICE_LINE_BY_INVOICE],
+)
+QUERIES.register(
+    "employee_by_invoice_and_customer",
+    """
+    SELECT Employee.FirstName, Employee.Title, Employee.Email
+    FROM Employee
+    JOIN Customer ON Customer.SupportRepId = Employee.EmployeeId
+    JOIN Invoice ON Invoice.CustomerId = Customer.CustomerId
+    WHERE Invoice.InvoiceId = :invoice_id AND Invoice.CustomerId = :customer_id
+    """,
+)
+
+# Invoice summaries cached per customer at verification
+# The rows a summary is computed from, hashed into the invoice table version
+INVOICE_VERSION_STATEMENTS = (
+    "invoice_version_invoices",
+    "invoice_version_invoice_lines",
+    "invoice_version_customers",
+    "invoice_version_employees",
+)
+QUERIES.register(
+    "invoice_version_invoices",
+    "SELECT * FROM Invoice ORDER BY InvoiceId",
+    full_scan=True,
+)
+QUERIES.register(
+    "invoice_version_invoice_lines",
+    """
+    SELECT InvoiceLineId, InvoiceId, TrackId, UnitPrice, Quantity
+    FROM InvoiceLine
+    ORDER BY InvoiceLineId
+    """,
+    full_scan=True,
+)
+QUERIES.register(
+    "invoice_version_customers",
+    "SELECT CustomerId, SupportRepId FROM Customer ORDER BY CustomerId",
+    full_scan=True,
+)
+QUERIES.register(
+    "invoice_version_employees",
+    "SELECT EmployeeId, FirstName, Title, Email FROM Employee ORDER BY EmployeeId",
+    full_scan=True,
+)
+QUERIES.register(
+    "customer_support_rep",
+    """
+    SELECT Employee.FirstName, Employee.Title, Employee.Email
+    FROM Employee
+    JOIN Customer ON Customer.SupportRepId = Employee.EmployeeId
+    WHERE Customer.CustomerId = :customer_id
+    """,
+)
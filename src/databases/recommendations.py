@@ -0,0 +1,312 @@
+"""Artist recommendations from co-purchase and playlist co-occurrence matrices."""
+
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Weights of the co-purchase, playlist co-occurrence and genre affinity signals
+CO_PURCHASE_WEIGHT = 0.5
+PLAYLIST_WEIGHT = 0.3
+GENRE_WEIGHT = 0.2
+
+# (TrackId, track name, ArtistId, artist name, GenreId, genre name)
+CatalogTrack = Tuple[
+    int, str, Optional[int], Optional[str], Optional[int], Optional[str]
+]
+
+# (InvoiceLineId, CustomerId, TrackId)
+Purchase = Tuple[int, int, int]
+
+# (ArtistName, GenreName, TrackName, Score)
+Recommendation = Tuple[str, Optional[str], str, float]
+
+
+def _cosine_normalize(matrix: np.ndarray) -> np.ndarray:
+    """Scale a co-occurrence matrix to cosine similarities with a zero diagonal."""
+    norms = np.sqrt(np.diag(matrix))
+    norms[norms == 0] = 1.0
+    similarity = matrix / norms[:, None] / norms[None, :]
+    np.fill_diagonal(similarity, 0.0)
+    return similarity
+
+
+def _scaled(scores: np.ndarray) -> np.ndarray:
+    """Scale non-negative scores to [0, 1]."""
+    peak = scores.max() if scores.size else 0.0
+    return scores / peak if peak > 0 else scores
+
+
+class RecommendationIndex:
+    """
+    Precomputed artist and genre co-occurrence matrices for recommendations.
+
+    Purchases are kept as a binary customer-by-artist matrix ``P`` and a
+    customer-by-genre matrix ``G``; the co-purchase matrices are ``P^T P`` and
+    ``G^T G``, so entry (i, j) counts the customers who bought both. Playlist
+    co-occurrence ``Q^T Q`` counts the playlists holding both artists.
+
+    New invoice lines are applied incrementally: when a customer with binary
+    row ``r`` gains the new items ``d``, the co-purchase matrix becomes
+    ``C + r d^T + d r^T + d d^T``, so no full rebuild is needed.
+    """
+
+    def __init__(self):
+        """Initialize an empty, unbuilt index."""
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._built = False
+        self.last_invoice_line_id = 0
+
+    @property
+    def is_built(self) -> bool:
+        """Whether the index currently holds data."""
+        return self._built
+
+    def build(
+        self,
+        tracks: Iterable[CatalogTrack],
+        playlist_tracks: Iterable[Tuple[int, int]],
+        purchases: Iterable[Purchase],
+    ):
+        """
+        Build the matrices from the catalog, playlists and invoice lines.
+
+        Args:
+            tracks: Catalog tracks with their artist and genre
+            playlist_tracks: ``(PlaylistId, TrackId)`` rows
+            purchases: ``(InvoiceLineId, CustomerId, TrackId)`` rows
+        """
+        with self._lock:
+            self._load_catalog(tracks)
+
+            # Playlist co-occurrence over artists
+            playlist_rows: Dict[int, int] = {}
+            pairs = []
+            for playlist_id, track_id in playlist_tracks:
+                artist = self._track_artist.get(track_id)
+                if artist is not None:
+                    row = playlist_rows.setdefault(playlist_id, len(playlist_rows))
+                    pairs.append((row, artist))
+            playlists = np.zeros((len(playlist_rows), len(self._artist_ids)))
+            if pairs:
+                rows, columns = zip(*pairs)
+                playlists[list(rows), list(columns)] = 1.0
+            self._playlist_similarity = _cosine_normalize(playlists.T @ playlists)
+
+            # Purchases start empty and are applied through the incremental path
+            self._customer_rows: Dict[int, int] = {}
+            self._artist_purchases = np.zeros((0, len(self._artist_ids)))
+            self._genre_purchases = np.zeros((0, len(self._genre_ids)))
+            self._artist_co_purchases = np.zeros((len(self._artist_ids),) * 2)
+            self._genre_co_purchases = np.zeros((len(self._genre_ids),) * 2)
+            self._customer_tracks: Dict[int, set] = {}
+            self._track_popularity = np.zeros(len(self._track_ids))
+            self.last_invoice_line_id = 0
+            self._apply(purchases)
+            self._built = True
+
+    def _load_catalog(self, tracks: Iterable[CatalogTrack]):
+        """Assign matrix positions to artists, genres and tracks."""
+        artist_positions: Dict[int, int] = {}
+        genre_positions: Dict[int, int] = {}
+        self._artist_ids: List[int] = []
+        self._artist_names: List[str] = []
+        self._genre_names: List[Optional[str]] = []
+        self._genre_ids: List[int] = []
+        self._track_ids: List[int] = []
+        self._track_names: List[str] = []
+        self._track_positions: Dict[int, int] = {}
+        self._track_artist: Dict[int, int] = {}
+        self._track_genre: Dict[int, int] = {}
+        artist_tracks: Dict[int, List[int]] = {}
+        artist_genre_counts = []
+
+        for track_id, name, artist_id, artist, genre_id, genre in tracks:
+            if artist_id is None:
+                continue
+            if artist_id not in artist_positions:
+                artist_positions[artist_id] = len(self._artist_ids)
+                self._artist_ids.append(artist_id)
+                self._artist_names.append(artist)
+            position = artist_positions[artist_id]
+            self._track_positions[track_id] = len(self._track_ids)
+            self._track_ids.append(track_id)
+            self._track_names.append(name)
+            self._track_artist[track_id] = position
+            artist_tracks.setdefault(position, []).append(
+                self._track_positions[track_id]
+            )
+            if genre_id is not None:
+                if genre_id not in genre_positions:
+                    genre_positions[genre_id] = len(self._genre_ids)
+                    self._genre_ids.append(genre_id)
+                    self._genre_names.append(genre)
+                self._track_genre[track_id] = genre_positions[genre_id]
+                artist_genre_counts.append((position, genre_positions[genre_id]))
+
+        self._artist_tracks = [
+            np.array(artist_tracks.get(i, []), dtype=int)
+            for i in range(len(self._artist_ids))
+        ]
+        # Share of each artist's tracks in each genre
+        artist_genres = np.zeros((len(self._artist_ids), len(self._genre_ids)))
+        for position, genre in artist_genre_counts:
+            artist_genres[position, genre] += 1.0
+        totals = artist_genres.sum(axis=1, keepdims=True)
+        totals[totals == 0] = 1.0
+        self._artist_genres = artist_genres / totals
+
+    def add_purchases(self, purchases: Iterable[Purchase]):
+        """
+        Apply new invoice lines without rebuilding the matrices.
+
+        Lines at or below ``last_invoice_line_id`` are ignored, so the same
+        rows can safely be applied twice.
+
+        Args:
+            purchases: ``(InvoiceLineId, CustomerId, TrackId)`` rows
+        """
+        with self._lock:
+            self._apply(purchases)
+
+    def _apply(self, purchases: Iterable[Purchase]):
+        """Apply invoice lines; the caller holds the lock."""
+        new_items: Dict[int, Tuple[set, set]] = {}
+        for line_id, customer_id, track_id in purchases:
+            if line_id <= self.last_invoice_line_id:
+                continue
+            self.last_invoice_line_id = max(self.last_invoice_line_id, line_id)
+            position = self._track_positions.get(track_id)
+            if position is None:
+                continue
+            self._track_popularity[position] += 1.0
+            self._customer_tracks.setdefault(customer_id, set()).add(track_id)
+            artists, genres = new_items.setdefault(customer_id, (set(), set()))
+            artists.add(self._track_artist[track_id])
+            if track_id in self._track_genre:
+                genres.add(self._track_genre[track_id])
+
+        # Append rows for first-time customers
+        new_customers = [c for c in new_items if c not in self._customer_rows]
+        for customer_id in new_customers:
+            self._customer_rows[customer_id] = len(self._customer_rows)
+        if new_customers:
+            self._artist_purchases = np.vstack(
+                [
+                    self._artist_purchases,
+                    np.zeros((len(new_customers), len(self._artist_ids))),
+                ]
+            )
+            self._genre_purchases = np.vstack(
+                [
+                    self._genre_purchases,
+                    np.zeros((len(new_customers), len(self._genre_ids))),
+                ]
+            )
+
+        for customer_id, (artists, genres) in new_items.items():
+            row = self._customer_rows[customer_id]
+            self._update_co_purchases(
+                self._artist_purchases, self._artist_co_purchases, row, artists
+            )
+            self._update_co_purchases(
+                self._genre_purchases, self._genre_co_purchases, row, genres
+            )
+
+        self._artist_similarity = _cosine_normalize(self._artist_co_purchases)
+        self._genre_similarity = _cosine_normalize(self._genre_co_purchases)
+
+    @staticmethod
+    def _update_co_purchases(
+        purchases: np.ndarray, co_purchases: np.ndarray, row: int, items: set
+    ):
+        """Add items to a customer's binary row and update ``P^T P`` in place."""
+        current = purchases[row].copy()
+        delta = np.zeros_like(current)
+        delta[list(items)] = 1.0
+        delta[current > 0] = 0.0
+        if not delta.any():
+            return
+        co_purchases += (
+            np.outer(current, delta) + np.outer(delta, current) + np.outer(delta, delta)
+        )
+        purchases[row] = current + delta
+
+    def invalidate(self):
+        """Drop the matrices so they are rebuilt on the next recommendation."""
+        self._built = False
+
+    def recommend(
+        self, customer_id: int, loader, limit: int = 5
+    ) -> List[Recommendation]:
+        """
+        Recommend artists, each with a track, the customer has not bought yet.
+
+        Candidate artists are scored by their co-purchase and playlist similarity
+        to the customer's artists and by the customer's genre affinity. Customers
+        without purchases get the best-selling artists.
+
+        Args:
+            customer_id: Customer to recommend for
+            loader: Callable returning the ``build`` arguments, used if not built
+            limit: Maximum number of recommendations
+
+        Returns:
+            List[Recommendation]: Artist, genre, suggested track and score, best first
+        """
+        if not self._built:
+            with self._build_lock:
+                if not self._built:
+                    self.build(*loader())
+
+        with self._lock:
+            row = self._customer_rows.get(customer_id)
+            popularity = np.array(
+                [self._track_popularity[tracks].sum() for tracks in self._artist_tracks]
+            )
+
+            if row is None:
+                scores = _scaled(popularity)
+                owned = np.zeros(len(self._artist_ids), dtype=bool)
+            else:
+                artists = self._artist_purchases[row]
+                genres = self._genre_purchases[row]
+                genre_profile = genres + self._genre_similarity @ genres
+                scores = (
+                    CO_PURCHASE_WEIGHT * _scaled(self._artist_similarity @ artists)
+                    + PLAYLIST_WEIGHT * _scaled(self._playlist_similarity @ artists)
+                    + GENRE_WEIGHT * _scaled(self._artist_genres @ genre_profile)
+                )
+                # Popularity only breaks ties between equally scored artists
+                scores = scores + 1e-6 * _scaled(popularity)
+                owned = artists > 0
+
+            bought = self._customer_tracks.get(customer_id, set())
+            recommendations = []
+            for position in np.argsort(-scores, kind="stable"):
+                if len(recommendations) >= limit or scores[position] <= 0:
+                    break
+                if owned[position]:
+                    continue
+                track = self._pick_track(position, bought)
+                if track is None:
+                    continue
+                genre = np.argmax(self._artist_genres[position])
+                recommendations.append(
+                    (
+                        self._artist_names[position],
+                        self._genre_names[genre] if self._genre_names else None,
+                        self._track_names[track],
+                        round(float(scores[position]), 3),
+                    )
+                )
+            return recommendations
+
+    def _pick_track(self, artist: int, bought: set) -> Optional[int]:
+        """Best-selling track of an artist that the customer has not bought."""
+        tracks = self._artist_tracks[artist]
+        for track in tracks[np.argsort(-self._track_popularity[tracks], kind="stable")]:
+            if self._track_ids[track] not in bought:
+                return int(track)
+        return None
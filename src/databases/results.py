@@ -0,0 +1,149 @@
+"""Typed query results returned by the Database query API."""
+
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+class QueryResult:
+    """
+    Columnar-header result set: column names stored once, rows as plain tuples.
+
+    Rows are taken straight from the database cursor, so callers work with native
+    Python values instead of re-parsing a string representation.
+    """
+
+    __slots__ = ("columns", "rows")
+
+    def __init__(self, columns: Sequence[str], rows: List[Tuple[Any, ...]]):
+        """
+        Initialize the result.
+
+        Args:
+            columns: Column names, in cursor order
+            rows: Row tuples, one value per column
+        """
+        self.columns: Tuple[str, ...] = tuple(columns)
+        self.rows = rows
+
+    def __len__(self) -> int:
+        """Number of rows in the result."""
+        return len(self.rows)
+
+    def __bool__(self) -> bool:
+        """True when at least one row was returned."""
+        return bool(self.rows)
+
+    def __iter__(self) -> Iterator[Tuple[Any, ...]]:
+        """Iterate over the row tuples."""
+        return iter(self.rows)
+
+    def __repr__(self) -> str:
+        """Short description of the result shape."""
+        return f"QueryResult(columns={self.columns!r}, rows={len(self.rows)})"
+
+    def as_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Convert the rows to dictionaries keyed by column name.
+
+        Returns:
+            List[Dict[str, Any]]: One dictionary per row
+        """
+        columns = self.columns
+        return [dict(zip(columns, row)) for row in self.rows]
+
+    def column(self, name: str) -> List[Any]:
+        """
+        Get all values of a single column.
+
+        Args:
+            name: Column name
+
+        Returns:
+            List[Any]: Column values in row order
+        """
+        index = self.columns.index(name)
+        return [row[index] for row in self.rows]
+
+    def scalar(self) -> Optional[Any]:
+        """
+        Get the first value of the first row.
+
+        Returns:
+            Optional[Any]: The value, or None for an empty result
+        """
+        if not self.rows:
+            return None
+        return self.rows[0][0]
+
+
+class ResultPage(QueryResult):
+    """
+    One page of a larger result set, with the cursor of the following page.
+
+    Cursors are opaque to callers; they encode the row offset of the next page
+    in the statement's result order, which is stable on the immutable catalog.
+    """
+
+    __slots__ = ("offset", "next_cursor")
+
+    def __init__(
+        self,
+        columns: Sequence[str],
+        rows: List[Tuple[Any, ...]],
+        offset: int,
+        next_cursor: Optional[str],
+    ):
+        """
+        Initialize the page.
+
+        Args:
+            columns: Column names, in cursor order
+            rows: Row tuples of this page
+            offset: Position of the first row of this page in the full result
+            next_cursor: Cursor of the next page, or None if this is the last one
+        """
+        super().__init__(columns, rows)
+        self.offset = offset
+        self.next_cursor = next_cursor
+
+    @property
+    def has_more(self) -> bool:
+        """Whether more rows are available after this page."""
+        return self.next_cursor is not None
+
+    def __repr__(self) -> str:
+        """Short description of the page shape."""
+        return (
+            f"ResultPage(columns={self.columns!r}, rows={len(self.rows)}, "
+            f"offset={self.offset}, next_cursor={self.next_cursor!r})"
+        )
+
+
+def encode_cursor(offset: int) -> str:
+    """
+    Encode a row offset as a page cursor.
+
+    Args:
+        offset: Row offset of the page
+
+    Returns:
+        str: Cursor string
+    """
+    return str(offset)
+
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    """
+    Decode a page cursor into a row offset.
+
+    Args:
+        cursor: Cursor returned with a previous page, or None for the first page
+
+    Returns:
+        int: Row offset of the requested page
+    """
+    if cursor is None or not str(cursor).strip():
+        return 0
+    cursor = str(cursor).strip()
+    if not cursor.isdigit():
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return int(cursor)
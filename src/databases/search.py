@@ -0,0 +1,73 @@
+"""Full-text search index over the music catalog."""
+
+import re
+import sqlite3
+from typing import Optional
+
+# Indexed catalog tables: (FTS table, content table, key column, indexed column)
+SEARCH_TABLES = (
+    ("artist_fts", "Artist", "ArtistId", "Name"),
+    ("album_fts", "Album", "AlbumId", "Title"),
+    ("track_fts", "Track", "TrackId", "Name"),
+    ("genre_fts", "Genre", "GenreId", "Name"),
+)
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_search_index(connection: sqlite3.Connection) -> bool:
+    """
+    Create and populate the FTS5 tables for artist, album, track and genre names.
+
+    The FTS tables are external-content tables over the catalog tables, so they
+    only store the inverted index. Diacritics are folded, so "Beyonce" matches
+    "Beyoncé", and two- and three-character prefix indexes speed up the
+    prefix queries issued by the music tools.
+
+    Args:
+        connection: Writable connection to the catalog database
+
+    Returns:
+        bool: True if the index was built, False if SQLite lacks FTS5 support
+    """
+    try:
+        for fts_table, table, key, column in SEARCH_TABLES:
+            connection.execute(
+                f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(
+                    {column},
+                    content='{table}',
+                    content_rowid='{key}',
+                    tokenize='unicode61 remove_diacritics 2',
+                    prefix='2 3'
+                )
+                """
+            )
+            connection.execute(
+                f"INSERT INTO {fts_table}({fts_table}) VALUES('rebuild')"
+            )
+        connection.commit()
+    except sqlite3.OperationalError:
+        # SQLite was compiled without FTS5; the tools fall back to LIKE scans
+        connection.rollback()
+        return False
+    return True
+
+
+def fts_match_expression(text: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 query matching every token as a prefix.
+
+    "rolling st" becomes ``"rolling"* "st"*``, which matches names containing
+    words starting with both tokens, in any order.
+
+    Args:
+        text: Search text as provided by the LLM or the customer
+
+    Returns:
+        Optional[str]: FTS5 MATCH expression, or None if the text has no tokens
+    """
+    tokens = _TOKEN.findall(text or "")
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
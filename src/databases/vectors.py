@@ -0,0 +1,338 @@
+"""Memory-mapped vector index over catalog names for similarity search."""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .embeddings import Embedder
+from .fuzzy import normalize_name
+
+# Bump whenever the document texts or file layout change so stale files are rebuilt
+VECTOR_INDEX_VERSION = 1
+
+# Lloyd iterations and training sample size of the IVF partitioning
+_KMEANS_ITERATIONS = 10
+_KMEANS_SAMPLE = 20000
+
+# (kind, id, name, artist name)
+VectorDocument = Tuple[str, int, str, Optional[str]]
+
+# (kind, id, name, artist name, album title, genre name, composer)
+CatalogDocument = Tuple[
+    str, int, str, Optional[str], Optional[str], Optional[str], Optional[str]
+]
+
+# (vectors, documents, kind per vector, normalized name -> positions, IVF centroids,
+# IVF partition offsets)
+_IndexData = Tuple[
+    np.ndarray,
+    List[VectorDocument],
+    np.ndarray,
+    Dict[str, List[int]],
+    Optional[np.ndarray],
+    Optional[List[int]],
+]
+
+
+def document_text(row: CatalogDocument) -> str:
+    """
+    Build the text embedded for a catalog row.
+
+    Args:
+        row: Kind, id, name, artist, album, genre and composer of the row
+
+    Returns:
+        str: Descriptive text combining the available fields
+    """
+    kind, _, name, artist, album, genre, composer = row
+    parts = [f"{kind} {name}"]
+    if artist:
+        parts.append(f"by {artist}")
+    if album:
+        parts.append(f"from the album {album}")
+    if genre:
+        parts.append(f"genre {genre}")
+    if composer:
+        parts.append(f"composed by {composer}")
+    return ", ".join(parts)
+
+
+def _scratch_path(path: Path) -> Path:
+    """Create an empty, uniquely named scratch file next to ``path``."""
+    fd, scratch = tempfile.mkstemp(prefix=f"{path.name}.", dir=path.parent)
+    os.close(fd)
+    return Path(scratch)
+
+
+def _kmeans(vectors: np.ndarray, partitions: int) -> np.ndarray:
+    """Spherical k-means centroids of unit vectors, trained on a fixed sample."""
+    rng = np.random.default_rng(0)
+    sample = vectors
+    if len(vectors) > _KMEANS_SAMPLE:
+        sample = vectors[np.sort(rng.choice(len(vectors), _KMEANS_SAMPLE, False))]
+    sample = np.asarray(sample)
+    centroids = sample[rng.choice(len(sample), partitions, replace=False)].copy()
+    for _ in range(_KMEANS_ITERATIONS):
+        assignment = np.argmax(sample @ centroids.T, axis=1)
+        for partition in range(partitions):
+            members = sample[assignment == partition]
+            if len(members):
+                centroids[partition] = members.sum(axis=0)
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        centroids /= norms
+    return centroids.astype(np.float32)
+
+
+class VectorIndex:
+    """
+    Embeddings of catalog names stored in a memory-mapped float32 file.
+
+    The index is built offline in batches the first time it is needed and
+    reused by later processes. Queries score every vector with one matrix
+    product; with ``partitions`` set, vectors are grouped by nearest k-means
+    centroid (IVF) and only the ``probes`` closest partitions are scored.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        embedder: Embedder,
+        partitions: int = 0,
+        probes: int = 4,
+        batch_size: int = 64,
+    ):
+        """
+        Initialize an unbuilt index.
+
+        Args:
+            directory: Directory holding the index files
+            embedder: Embedder for documents and queries
+            partitions: Number of IVF partitions, or 0 for brute-force search
+            probes: Partitions scored per query in IVF mode
+            batch_size: Documents embedded per batch while building
+        """
+        self.directory = Path(directory)
+        self.embedder = embedder
+        self.partitions = partitions
+        self.probes = probes
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._index: Optional[_IndexData] = None
+        self._stale = False
+
+    @property
+    def is_built(self) -> bool:
+        """Whether the index is currently loaded."""
+        return self._index is not None
+
+    def get_paths(self, key: str) -> Tuple[Path, Path]:
+        """
+        Get the vector and metadata file paths for a catalog.
+
+        Args:
+            key: Identifies the catalog the documents come from
+
+        Returns:
+            Tuple[Path, Path]: Float32 ``.npy`` vector file and JSON metadata file
+        """
+        digest = hashlib.sha1(
+            f"{VECTOR_INDEX_VERSION}:{key}:{self.partitions}".encode("utf-8")
+        ).hexdigest()[:12]
+        stem = f"catalog-vectors-{digest}-{self.embedder.id}"
+        return self.directory / f"{stem}.npy", self.directory / f"{stem}.json"
+
+    def build(self, documents: Iterable[CatalogDocument], key: str):
+        """
+        Embed the documents in batches and write the index files atomically.
+
+        Args:
+            documents: Catalog rows to index
+            key: Identifies the catalog the documents come from
+        """
+        rows = list(documents)
+        vector_path, meta_path = self.get_paths(key)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        # Scratch files get unique names so concurrent builds never share one
+        scratch_path = _scratch_path(vector_path)
+        building_path = _scratch_path(vector_path)
+        meta_scratch = _scratch_path(meta_path)
+        try:
+            # Embed straight into a memory-mapped scratch file, one batch at a time
+            dimension = self.embedder.dimension
+            vectors = np.lib.format.open_memmap(
+                scratch_path, mode="w+", dtype=np.float32, shape=(len(rows), dimension)
+            )
+            for start in range(0, len(rows), self.batch_size):
+                batch = rows[start : start + self.batch_size]
+                vectors[start : start + len(batch)] = self.embedder.embed(
+                    [document_text(row) for row in batch]
+                )
+
+            # Group vectors by partition so each partition is one contiguous slice
+            order = np.arange(len(rows))
+            centroids = None
+            offsets = None
+            if 0 < self.partitions < len(rows):
+                centroids = _kmeans(vectors, self.partitions)
+                assignment = np.concatenate(
+                    [
+                        np.argmax(
+                            vectors[i : i + self.batch_size] @ centroids.T, axis=1
+                        )
+                        for i in range(0, len(rows), self.batch_size)
+                    ]
+                )
+                order = np.argsort(assignment, kind="stable")
+                counts = np.bincount(assignment, minlength=self.partitions)
+                offsets = [0, *np.cumsum(counts).tolist()]
+
+            final = np.lib.format.open_memmap(
+                building_path,
+                mode="w+",
+                dtype=np.float32,
+                shape=(len(rows), dimension),
+            )
+            for start in range(0, len(rows), self.batch_size):
+                final[start : start + self.batch_size] = vectors[
+                    order[start : start + self.batch_size]
+                ]
+            final.flush()
+            del final, vectors
+            os.remove(scratch_path)
+
+            meta = {
+                "version": VECTOR_INDEX_VERSION,
+                "embedder": self.embedder.id,
+                "dimension": dimension,
+                "documents": [list(rows[i][:4]) for i in order.tolist()],
+                "centroids": centroids.tolist() if centroids is not None else None,
+                "offsets": offsets,
+            }
+            meta_scratch.write_text(json.dumps(meta), encoding="utf-8")
+
+            # The metadata file is replaced last; it marks a complete index
+            os.replace(building_path, vector_path)
+            os.replace(meta_scratch, meta_path)
+        except BaseException:
+            for path in (scratch_path, building_path, meta_scratch):
+                if path.exists():
+                    path.unlink()
+            raise
+
+    def load(self, key: str) -> bool:
+        """
+        Memory-map previously built index files.
+
+        Args:
+            key: Identifies the catalog the documents come from
+
+        Returns:
+            bool: True if matching files were found and loaded
+        """
+        vector_path, meta_path = self.get_paths(key)
+        if not meta_path.exists() or not vector_path.exists():
+            return False
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if (
+            meta["version"] != VECTOR_INDEX_VERSION
+            or meta["embedder"] != self.embedder.id
+        ):
+            return False
+
+        vectors = np.load(vector_path, mmap_mode="r")
+        documents = [tuple(document) for document in meta["documents"]]
+        names: Dict[str, List[int]] = {}
+        for position, document in enumerate(documents):
+            names.setdefault(normalize_name(document[2]), []).append(position)
+        centroids = meta["centroids"]
+        self._index = (
+            vectors,
+            documents,
+            np.array([document[0] for document in documents]),
+            names,
+            np.array(centroids, dtype=np.float32) if centroids is not None else None,
+            meta["offsets"],
+        )
+        return True
+
+    def invalidate(self):
+        """Drop the index; it is rebuilt from the catalog on the next search."""
+        self._index = None
+        self._stale = True
+
+    def search(
+        self,
+        text: str,
+        loader,
+        key: str,
+        kinds: Optional[Sequence[str]] = None,
+        limit: int = 5,
+    ) -> List[Tuple[VectorDocument, float]]:
+        """
+        Find the catalog entries whose embeddings are closest to a text.
+
+        When the text is the exact name of a catalog entry, that entry's stored
+        vector is used as the query and entries of the same name are excluded,
+        so "songs like <title>" returns other songs.
+
+        Args:
+            text: Name or free-text description
+            loader: Callable returning catalog rows, used if the index is not built
+            key: Identifies the catalog the documents come from
+            kinds: Restrict results to these kinds ("track", "album", "artist", "genre")
+            limit: Maximum number of matches
+
+        Returns:
+            List[Tuple[VectorDocument, float]]: Matches with cosine scores, best first
+        """
+        index = self._index
+        if index is None:
+            with self._lock:
+                if self._index is None:
+                    if self._stale or not self.load(key):
+                        self.build(loader(), key)
+                        self.load(key)
+                        self._stale = False
+                index = self._index
+        vectors, documents, document_kinds, names, centroids, offsets = index
+
+        anchors = names.get(normalize_name(text), [])
+        if anchors:
+            query = np.asarray(vectors[anchors[0]])
+        else:
+            query = self.embedder.embed([text])[0]
+
+        # Candidate positions: everything, or the closest IVF partitions
+        if centroids is not None:
+            probed = np.argsort(-(centroids @ query))[: self.probes]
+            candidates = np.concatenate(
+                [np.arange(offsets[p], offsets[p + 1]) for p in probed]
+            )
+            scores = np.asarray(vectors[candidates]) @ query
+        else:
+            candidates = np.arange(len(documents))
+            scores = np.asarray(vectors) @ query
+
+        allowed = np.ones(len(candidates), dtype=bool)
+        if kinds:
+            allowed &= np.isin(document_kinds[candidates], list(kinds))
+        if anchors:
+            allowed &= ~np.isin(candidates, anchors)
+        scores = np.where(allowed, scores, -np.inf)
+
+        count = min(limit, int(allowed.sum()))
+        if count == 0:
+            return []
+        top = np.argpartition(-scores, count - 1)[:count]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            (documents[candidates[i]], round(float(scores[i]), 3)) for i in top.tolist()
+        ]
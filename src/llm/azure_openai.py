@@ -1,36 +1,58 @@
-from typing import Type, Dict, Optional
+import dataclasses
+import threading
+from typing import Any, Type, Dict, Optional, Tuple
 from langchain_openai import AzureChatOpenAI
+from langgraph.constants import TAG_NOSTREAM
 from pydantic import BaseModel
 from src.config.settings import Settings
+from .http_clients import get_http_clients
+from .response_cache import get_response_cache
 
 
 class AzureOpenAI:
     """
     Azure OpenAI client wrapper with singleton pattern to avoid repeated initialization.
+
+    Instances are keyed on all settings values, so every ``Settings()`` with
+    the same configuration shares one client, and all clients of an endpoint
+    share its HTTP connection pool.
     """
 
-    # Class-level dictionary to store instances by settings hash
-    _instances: Dict[int, "AzureOpenAI"] = {}
+    # Class-level dictionary to store instances by effective configuration
+    _instances: Dict[Tuple, "AzureOpenAI"] = {}
+    _instances_lock = threading.Lock()
+
+    @staticmethod
+    def _config_key(settings: Settings) -> Tuple:
+        """Every settings field's value, so no setting is left out of the key."""
+        return dataclasses.astuple(settings)
 
     @classmethod
     def get_instance(cls, settings: Settings) -> "AzureOpenAI":
         """
         Get or create an instance of AzureOpenAI for the given settings.
 
+        Safe to call from several threads or tasks at once; only one instance
+        is created per configuration.
+
         Args:
             settings: The settings to use for initialization
 
         Returns:
             An instance of AzureOpenAI
         """
-        # Use settings object id as key to avoid complex hashing
-        settings_key = id(settings)
+        settings_key = cls._config_key(settings)
 
-        # If instance doesn't exist for these settings, create it
-        if settings_key not in cls._instances:
-            cls._instances[settings_key] = cls(settings, _use_singleton=True)
+        instance = cls._instances.get(settings_key)
+        if instance is None:
+            with cls._instances_lock:
+                # If instance doesn't exist for this configuration, create it
+                instance = cls._instances.get(settings_key)
+                if instance is None:
+                    instance = cls(settings, _use_singleton=True)
+                    cls._instances[settings_key] = instance
 
-        return cls._instances[settings_key]
+        return instance
 
     def __init__(self, settings: Settings, _use_singleton: bool = False):
         """
@@ -48,23 +70,37 @@ class AzureOpenAI:
 
         self.settings = settings
         self.llm = None
+        self.response_cache = None
+        self.http_clients = None
         self._structured_llms: Dict[str, AzureChatOpenAI] = {}
+        self._structured_lock = threading.Lock()
         self._initialize_llm()
 
     def _initialize_llm(self):
-        """Initialize the LLM."""
+        """Initialize the LLM on the endpoint's shared HTTP clients and response cache."""
+        self.response_cache = get_response_cache(self.settings)
+        self.http_clients = get_http_clients(self.settings)
         self.llm = AzureChatOpenAI(
             model_name=self.settings.model_name,
             temperature=self.settings.temperature,
             api_version=self.settings.api_version,
             api_key=self.settings.azure_openai_api_key,
             azure_endpoint=self.settings.azure_openai_base_url,
+            cache=self.response_cache,
+            http_client=self.http_clients.client,
+            http_async_client=self.http_clients.async_client,
+            # Retries happen in the endpoint's rate limiter, which backs off
+            # across every model sharing the endpoint
+            max_retries=0,
         )
 
     def get_structured_llm(self, schema: Type[BaseModel]):
         """
         Get the structured LLM for the given schema.
-        Caches the structured LLM to avoid repeated initialization.
+        Caches the structured LLM to avoid repeated initialization. Responses go
+        through the same response cache as ``llm``, keyed on the schema as well.
+        Structured LLMs are tagged so their JSON output is left out of streamed
+        workflow tokens.
 
         Args:
             schema: The schema to use for structured output
@@ -74,8 +110,30 @@ class AzureOpenAI:
 
         # Create and cache structured LLM if it doesn't exist
         if schema_key not in self._structured_llms:
-            self._structured_llms[schema_key] = self.llm.with_structured_output(
-                schema=schema
-            )
+            with self._structured_lock:
+                if schema_key not in self._structured_llms:
+                    self._structured_llms[schema_key] = self.llm.with_structured_output(
+                        schema=schema
+                    ).with_config(tags=[TAG_NOSTREAM])
 
         return self._structured_llms[schema_key]
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get hit, miss and eviction counters of the response cache.
+
+        Returns:
+            Dict[str, Any]: Cache counters, or an empty dict when caching is off
+        """
+        if self.response_cache is None:
+            return {}
+        return self.response_cache.stats()
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """
+        Get request and connection counters of the endpoint's HTTP pool.
+
+        Returns:
+            Dict[str, Any]: Pool statistics shared by all clients of the endpoint
+        """
+        return self.http_clients.snapshot()
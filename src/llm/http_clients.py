@@ -0,0 +1,348 @@
+"""Shared keep-alive HTTP clients for model endpoints, one pool per endpoint."""
+
+import asyncio
+import importlib.util
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from src.config.settings import Settings
+from .rate_limiter import (
+    AsyncRateLimitedTransport,
+    RateLimitedTransport,
+    RequestScheduler,
+)
+
+# HTTP/2 needs the optional 'h2' package; without it clients use HTTP/1.1 keep-alive
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class PoolStats:
+    """Thread-safe request counters of one endpoint's connection pool."""
+
+    def __init__(self):
+        """Initialize zeroed counters."""
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.total_seconds = 0.0
+        self.connections_opened = 0
+
+    def connected(self):
+        """Count a new connection to the endpoint."""
+        with self._lock:
+            self.connections_opened += 1
+
+    def start(self):
+        """Count a request being sent."""
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def finish(self, elapsed: float, error: bool = False):
+        """Count a request whose response headers arrived or that failed."""
+        with self._lock:
+            self.in_flight -= 1
+            self.total_seconds += elapsed
+            if error:
+                self.errors += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get a copy of the counters.
+
+        Returns:
+            Dict[str, Any]: Requests, errors, in-flight requests, mean latency
+                and connections opened
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "connections_opened": self.connections_opened,
+                "errors": self.errors,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "mean_seconds": (
+                    self.total_seconds / self.requests if self.requests else 0.0
+                ),
+            }
+
+
+# httpcore trace event emitted once a new TCP connection is established
+_CONNECTED_EVENT = "connection.connect_tcp.complete"
+
+
+def _traced(request: httpx.Request, stats: PoolStats):
+    """Chain a trace callback onto ``request`` that counts new connections."""
+    trace = request.extensions.get("trace")
+
+    def count_connections(event_name: str, info: Dict[str, Any]):
+        if event_name == _CONNECTED_EVENT:
+            stats.connected()
+        if trace is not None:
+            trace(event_name, info)
+
+    request.extensions["trace"] = count_connections
+
+
+def _async_traced(request: httpx.Request, stats: PoolStats):
+    """Chain an async trace callback onto ``request`` that counts new connections."""
+    trace = request.extensions.get("trace")
+
+    async def count_connections(event_name: str, info: Dict[str, Any]):
+        if event_name == _CONNECTED_EVENT:
+            stats.connected()
+        if trace is not None:
+            await trace(event_name, info)
+
+    request.extensions["trace"] = count_connections
+
+
+class _CountingTransport(httpx.HTTPTransport):
+    """HTTP transport that records every request in the endpoint's PoolStats."""
+
+    def __init__(self, stats: PoolStats, **kwargs):
+        """Initialize the transport; ``kwargs`` go to ``httpx.HTTPTransport``."""
+        super().__init__(**kwargs)
+        self.stats = stats
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request on a pooled connection and count it."""
+        _traced(request, self.stats)
+        self.stats.start()
+        start = time.perf_counter()
+        try:
+            response = super().handle_request(request)
+        except Exception:
+            self.stats.finish(time.perf_counter() - start, error=True)
+            raise
+        self.stats.finish(time.perf_counter() - start)
+        return response
+
+
+class _AsyncCountingTransport(httpx.AsyncHTTPTransport):
+    """Async HTTP transport that records every request in the endpoint's PoolStats."""
+
+    def __init__(self, stats: PoolStats, **kwargs):
+        """Initialize the transport; ``kwargs`` go to ``httpx.AsyncHTTPTransport``."""
+        super().__init__(**kwargs)
+        self.stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request on a pooled connection and count it."""
+        _async_traced(request, self.stats)
+        self.stats.start()
+        start = time.perf_counter()
+        try:
+            response = await super().handle_async_request(request)
+        except Exception:
+            self.stats.finish(time.perf_counter() - start, error=True)
+            raise
+        self.stats.finish(time.perf_counter() - start)
+        return response
+
+
+class _PerLoopAsyncTransport(httpx.AsyncBaseTransport):
+    """
+    Async transport with a separate connection pool for each event loop.
+
+    Async connections belong to the loop that opened them, so a pool shared
+    across ``asyncio.run`` calls would hand a new loop connections of a closed
+    one. Each loop gets its own pool, dropped once the loop is collected.
+    """
+
+    def __init__(self, stats: PoolStats, **kwargs):
+        """Initialize the transport; ``kwargs`` go to ``httpx.AsyncHTTPTransport``."""
+        self.stats = stats
+        self.kwargs = kwargs
+        self._transports: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _AsyncCountingTransport]" = (weakref.WeakKeyDictionary())
+        self._lock = threading.Lock()
+
+    def _transport(self) -> _AsyncCountingTransport:
+        """The pool of the running event loop, created on first use."""
+        loop = asyncio.get_running_loop()
+        transport = self._transports.get(loop)
+        if transport is None:
+            with self._lock:
+                transport = self._transports.get(loop)
+                if transport is None:
+                    transport = _AsyncCountingTransport(self.stats, **self.kwargs)
+                    self._transports[loop] = transport
+        return transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request on the running loop's pool."""
+        return await self._transport().handle_async_request(request)
+
+    async def aclose(self):
+        """Close the running loop's pool."""
+        with self._lock:
+            transport = self._transports.pop(asyncio.get_running_loop(), None)
+        if transport is not None:
+            await transport.aclose()
+
+
+class EndpointClients:
+    """
+    The sync and async HTTP clients sharing one endpoint's pool settings.
+
+    Both clients send their requests through the endpoint's RequestScheduler,
+    which enforces the rate limits and retries throttled requests.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        limits: httpx.Limits,
+        http2: bool,
+        scheduler: RequestScheduler,
+    ):
+        """
+        Create the clients.
+
+        Args:
+            endpoint: Base URL of the model endpoint
+            limits: Connection pool limits, applied to each client
+            http2: Whether to negotiate HTTP/2
+            scheduler: Rate limiter of the endpoint
+        """
+        self.endpoint = endpoint
+        self.http2 = http2
+        self.stats = PoolStats()
+        self.scheduler = scheduler
+        self.transport = _CountingTransport(self.stats, limits=limits, http2=http2)
+        self.async_transport = _PerLoopAsyncTransport(
+            self.stats, limits=limits, http2=http2
+        )
+        self.client = httpx.Client(
+            transport=RateLimitedTransport(self.transport, scheduler)
+        )
+        self.async_client = httpx.AsyncClient(
+            transport=AsyncRateLimitedTransport(self.async_transport, scheduler)
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the endpoint's request and connection counters.
+
+        Returns:
+            Dict[str, Any]: Counters and scheduler state
+        """
+        stats = self.stats.snapshot()
+        stats["http2"] = self.http2
+        stats["scheduler"] = self.scheduler.snapshot()
+        return stats
+
+
+# (endpoint, max connections, max keep-alive connections, keep-alive expiry, HTTP/2)
+_ClientKey = Tuple[str, int, int, float, bool]
+
+_clients: Dict[_ClientKey, EndpointClients] = {}
+_clients_lock = threading.Lock()
+
+# One scheduler per endpoint, shared by its clients whatever their pool limits,
+# with the rate limits it was created with
+_schedulers: Dict[str, Tuple[Dict[str, Any], RequestScheduler]] = {}
+
+
+def _configured_scheduler(endpoint: str, settings: Settings) -> RequestScheduler:
+    """
+    Get the endpoint's scheduler, creating it with the settings' rate limits.
+
+    Must be called with ``_clients_lock`` held.
+
+    Raises:
+        ValueError: If the endpoint's scheduler was created with other limits
+    """
+    limits = dict(
+        requests_per_minute=settings.llm_requests_per_minute,
+        tokens_per_minute=settings.llm_tokens_per_minute,
+        max_concurrency=settings.llm_max_concurrent_requests,
+        background_reserve=settings.llm_background_reserve,
+        completion_tokens=settings.llm_completion_token_estimate,
+        max_retries=settings.llm_max_retries,
+        retry_base_delay=settings.llm_retry_base_delay,
+        retry_max_delay=settings.llm_retry_max_delay,
+    )
+    configured = _schedulers.get(endpoint)
+    if configured is None:
+        scheduler = RequestScheduler(**limits)
+        _schedulers[endpoint] = (limits, scheduler)
+        return scheduler
+
+    configured_limits, scheduler = configured
+    if limits != configured_limits:
+        conflicts = ", ".join(
+            f"{name}={limits[name]} (configured {configured_limits[name]})"
+            for name in limits
+            if limits[name] != configured_limits[name]
+        )
+        raise ValueError(
+            f"Rate limits of {endpoint} conflict with its shared scheduler: {conflicts}"
+        )
+    return scheduler
+
+
+def get_http_clients(settings: Settings) -> EndpointClients:
+    """
+    Get the shared HTTP clients for the settings' model endpoint.
+
+    Every model talking to the same endpoint with the same pool limits reuses
+    one set of clients, so TLS sessions and keep-alive connections survive
+    across models and ``Settings`` instances. All calls to an endpoint count
+    against its one scheduler, so every model of an endpoint must use the
+    same rate limits.
+
+    Args:
+        settings: Settings providing the endpoint, pool and rate limits
+
+    Returns:
+        EndpointClients: The shared clients
+
+    Raises:
+        ValueError: If the endpoint's scheduler was created with other rate limits
+    """
+    http2 = settings.llm_http2 and HTTP2_AVAILABLE
+    key = (
+        settings.azure_openai_base_url.rstrip("/"),
+        settings.llm_max_connections,
+        settings.llm_max_keepalive_connections,
+        settings.llm_keepalive_expiry,
+        http2,
+    )
+    with _clients_lock:
+        scheduler = _configured_scheduler(key[0], settings)
+        clients = _clients.get(key)
+        if clients is None:
+            limits = httpx.Limits(
+                max_connections=settings.llm_max_connections,
+                max_keepalive_connections=settings.llm_max_keepalive_connections,
+                keepalive_expiry=settings.llm_keepalive_expiry,
+            )
+            clients = _clients[key] = EndpointClients(key[0], limits, http2, scheduler)
+    return clients
+
+
+def get_http_pool_stats(endpoint: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Get connection pool statistics of the shared HTTP clients.
+
+    Args:
+        endpoint: Only report pools of this base URL; report all if None
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Endpoint to its pool statistics
+    """
+    with _clients_lock:
+        clients = list(_clients.values())
+    stats = {}
+    for endpoint_clients in clients:
+        if endpoint is None or endpoint_clients.endpoint == endpoint.rstrip("/"):
+            stats[endpoint_clients.endpoint] = endpoint_clients.snapshot()
+    return stats
@@ -0,0 +1,588 @@
+"""Client-side rate limiting, prioritization and retries for model endpoint calls."""
+
+import asyncio
+import contextvars
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import httpx
+
+# Priorities of model calls: user-facing calls are admitted before background ones
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BACKGROUND = "background"
+
+# Statuses worth retrying: throttling and transient server errors
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Longest single sleep while waiting for admission, so waiters re-check priorities
+_MAX_WAIT_SLICE = 0.05
+
+_request_priority: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "llm_request_priority", default=PRIORITY_INTERACTIVE
+)
+
+
+def get_request_priority() -> str:
+    """Priority of model calls made in the current context."""
+    return _request_priority.get()
+
+
+@contextmanager
+def request_priority(priority: str) -> Iterator[None]:
+    """
+    Run the model calls made inside the block at the given priority.
+
+    The priority lives in a context variable, so it follows the call into
+    LangChain, the OpenAI client and the HTTP transport, including async tasks.
+
+    Args:
+        priority: PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+    """
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+class TokenBucket:
+    """
+    Per-minute budget refilled continuously; not thread-safe on its own.
+
+    The bucket holds up to one minute of budget, so a burst may use the whole
+    minute at once and is then paced at the refill rate.
+    """
+
+    def __init__(self, per_minute: int):
+        """
+        Initialize a full bucket.
+
+        Args:
+            per_minute: Budget refilled every minute
+        """
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        """Add the budget accumulated since the last update."""
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, reserve: float, now: float) -> float:
+        """
+        Seconds until ``amount`` can be taken while keeping ``reserve`` of the capacity.
+
+        Args:
+            amount: Budget needed
+            reserve: Fraction of the capacity that must remain afterwards; the
+                total is capped at the capacity so every request fits eventually
+            now: Current monotonic time
+
+        Returns:
+            float: 0 if the amount is available now
+        """
+        self._refill(now)
+        needed = min(amount + reserve * self.capacity, self.capacity) - self.level
+        return max(0.0, needed / self.rate)
+
+    def consume(self, amount: float):
+        """Take budget; call after ``wait_time`` returned 0."""
+        self.level -= min(amount, self.capacity)
+
+    def limit(self, remaining: float):
+        """Lower the level to the budget the server reports as remaining."""
+        self.level = min(self.level, remaining)
+
+
+def _resized_bucket(
+    bucket: Optional[TokenBucket], per_minute: int
+) -> Optional[TokenBucket]:
+    """The bucket for a per-minute budget, reusing ``bucket`` when it already matches."""
+    if not per_minute:
+        return None
+    if bucket is not None and bucket.capacity == per_minute:
+        return bucket
+    return TokenBucket(per_minute)
+
+
+def _header_float(headers: httpx.Headers, name: str) -> Optional[float]:
+    """A numeric response header, or None when missing or malformed."""
+    try:
+        return float(headers[name])
+    except (KeyError, ValueError):
+        return None
+
+
+def retry_after_seconds(headers: httpx.Headers) -> Optional[float]:
+    """
+    Delay requested by the server before retrying, if any.
+
+    Args:
+        headers: Response headers
+
+    Returns:
+        Optional[float]: Seconds from ``retry-after-ms`` or ``retry-after``
+    """
+    milliseconds = _header_float(headers, "retry-after-ms")
+    if milliseconds is not None:
+        return milliseconds / 1000
+    return _header_float(headers, "retry-after")
+
+
+class RequestScheduler:
+    """
+    Admission control for the requests sent to one model endpoint.
+
+    Requests wait until the requests-per-minute and tokens-per-minute buckets
+    hold their budget and a concurrency slot is free. While interactive
+    requests are waiting, background requests are held back, and background
+    requests may never use the last ``background_reserve`` of any budget, so
+    memory extraction cannot starve the user-facing agents.
+
+    Token usage is not known before a response arrives, so each request is
+    charged an estimate up front; the ``x-ratelimit-remaining-*`` headers of
+    the response then bring the buckets in line with the server's count. A
+    throttled response pauses every request until its ``retry-after`` passes.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_concurrency: int,
+        background_reserve: float = 0.2,
+        completion_tokens: int = 512,
+        max_retries: int = 4,
+        retry_base_delay: float = 0.5,
+        retry_max_delay: float = 20.0,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            requests_per_minute: Request budget; 0 disables the limit
+            tokens_per_minute: Token budget; 0 disables the limit
+            max_concurrency: Maximum requests in flight; 0 disables the limit
+            background_reserve: Fraction of each budget kept for interactive calls
+            completion_tokens: Completion estimate for requests without a maximum
+            max_retries: Retries of throttled, failed or transient error responses
+            retry_base_delay: Backoff cap of the first retry, in seconds
+            retry_max_delay: Upper bound of any backoff, in seconds
+        """
+        self._lock = threading.Lock()
+        self.requests: Optional[TokenBucket] = None
+        self.tokens: Optional[TokenBucket] = None
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._waiting = {PRIORITY_INTERACTIVE: 0, PRIORITY_BACKGROUND: 0}
+        self._admitted = {PRIORITY_INTERACTIVE: 0, PRIORITY_BACKGROUND: 0}
+        self._wait_seconds = {PRIORITY_INTERACTIVE: 0.0, PRIORITY_BACKGROUND: 0.0}
+        self.retries = 0
+        self.throttled = 0
+        self.configure(
+            requests_per_minute,
+            tokens_per_minute,
+            max_concurrency,
+            background_reserve,
+            completion_tokens,
+            max_retries,
+            retry_base_delay,
+            retry_max_delay,
+        )
+
+    def configure(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_concurrency: int,
+        background_reserve: float = 0.2,
+        completion_tokens: int = 512,
+        max_retries: int = 4,
+        retry_base_delay: float = 0.5,
+        retry_max_delay: float = 20.0,
+    ):
+        """
+        Apply new limits; arguments as for ``__init__``.
+
+        A budget whose per-minute value is unchanged keeps its current level,
+        so re-applying the same settings does not refill the buckets.
+        """
+        with self._lock:
+            self.requests = _resized_bucket(self.requests, requests_per_minute)
+            self.tokens = _resized_bucket(self.tokens, tokens_per_minute)
+            self.max_concurrency = max_concurrency
+            self.background_reserve = background_reserve
+            self.completion_tokens = completion_tokens
+            self.max_retries = max_retries
+            self.retry_base_delay = retry_base_delay
+            self.retry_max_delay = retry_max_delay
+
+    def _try_admit(self, priority: str, tokens: int) -> float:
+        """Admit a request if the budgets allow; otherwise seconds to wait first."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+
+            background = priority == PRIORITY_BACKGROUND
+            if background and self._waiting[PRIORITY_INTERACTIVE]:
+                return _MAX_WAIT_SLICE
+            reserve = self.background_reserve if background else 0.0
+
+            if self.max_concurrency:
+                slots = self.max_concurrency
+                if background:
+                    slots = max(1, int(slots * (1 - reserve)))
+                if self._in_flight >= slots:
+                    return _MAX_WAIT_SLICE
+
+            wait = 0.0
+            for bucket, amount in ((self.requests, 1), (self.tokens, tokens)):
+                if bucket is not None:
+                    wait = max(wait, bucket.wait_time(amount, reserve, now))
+            if wait > 0:
+                return wait
+
+            if self.requests is not None:
+                self.requests.consume(1)
+            if self.tokens is not None:
+                self.tokens.consume(tokens)
+            self._in_flight += 1
+            self._admitted[priority] += 1
+            return 0.0
+
+    def _set_waiting(self, priority: str, delta: int, waited: float = 0.0):
+        """Track the number of waiters and their total wait per priority."""
+        with self._lock:
+            self._waiting[priority] += delta
+            self._wait_seconds[priority] += waited
+
+    def acquire(self, priority: str, tokens: int):
+        """
+        Block until a request may be sent; pair with ``release``.
+
+        Args:
+            priority: Priority of the request
+            tokens: Estimated tokens the request will use
+        """
+        start = time.monotonic()
+        self._set_waiting(priority, 1)
+        try:
+            while (wait := self._try_admit(priority, tokens)) > 0:
+                time.sleep(min(wait, _MAX_WAIT_SLICE))
+        finally:
+            self._set_waiting(priority, -1, time.monotonic() - start)
+
+    async def aacquire(self, priority: str, tokens: int):
+        """
+        Wait without blocking the event loop until a request may be sent.
+
+        Args:
+            priority: Priority of the request
+            tokens: Estimated tokens the request will use
+        """
+        start = time.monotonic()
+        self._set_waiting(priority, 1)
+        try:
+            while (wait := self._try_admit(priority, tokens)) > 0:
+                await asyncio.sleep(min(wait, _MAX_WAIT_SLICE))
+        finally:
+            self._set_waiting(priority, -1, time.monotonic() - start)
+
+    def release(self, headers: Optional[httpx.Headers] = None):
+        """
+        Free the concurrency slot of a finished request.
+
+        Args:
+            headers: Response headers, used to sync the buckets with the server
+        """
+        with self._lock:
+            self._in_flight -= 1
+            if headers is None:
+                return
+            for bucket, name in (
+                (self.requests, "x-ratelimit-remaining-requests"),
+                (self.tokens, "x-ratelimit-remaining-tokens"),
+            ):
+                remaining = _header_float(headers, name)
+                if bucket is not None and remaining is not None:
+                    bucket.limit(remaining)
+
+    def retry_delay(
+        self,
+        attempt: int,
+        retry_after: Optional[float] = None,
+        throttled: bool = False,
+    ) -> float:
+        """
+        Backoff before a retry, with full jitter.
+
+        Args:
+            attempt: Number of retries already made
+            retry_after: Delay requested by the server, which is honoured
+            throttled: Whether the server rejected the request with 429
+
+        Returns:
+            float: Seconds to wait before retrying
+        """
+        cap = min(self.retry_max_delay, self.retry_base_delay * 2**attempt)
+        delay = random.uniform(0, cap)
+        with self._lock:
+            self.retries += 1
+            if throttled:
+                self.throttled += 1
+            if retry_after is not None:
+                delay = max(delay, min(retry_after, self.retry_max_delay))
+                # Hold back every request, not only this one, until the server recovers
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        return delay
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get scheduler counters and the current budget levels.
+
+        Returns:
+            Dict[str, Any]: Admissions, waits, retries, throttling and budgets
+        """
+        with self._lock:
+            return {
+                "in_flight": self._in_flight,
+                "admitted": dict(self._admitted),
+                "waiting": dict(self._waiting),
+                "wait_seconds": dict(self._wait_seconds),
+                "retries": self.retries,
+                "throttled": self.throttled,
+                "requests_available": (
+                    int(self.requests.level) if self.requests is not None else None
+                ),
+                "tokens_available": (
+                    int(self.tokens.level) if self.tokens is not None else None
+                ),
+            }
+
+
+def estimate_tokens(request: httpx.Request, completion_tokens: int) -> int:
+    """
+    Estimate the tokens a chat completion request will use.
+
+    Prompt tokens are approximated as four bytes of request body per token;
+    completion tokens as the request's ``max_tokens`` or ``completion_tokens``.
+
+    Args:
+        request: Request with its body read
+        completion_tokens: Completion estimate when the request sets no maximum
+
+    Returns:
+        int: Estimated prompt plus completion tokens
+    """
+    prompt_tokens = len(request.content) // 4
+    try:
+        body = json.loads(request.content)
+    except ValueError:
+        return prompt_tokens + completion_tokens
+    if isinstance(body, dict):
+        completion_tokens = (
+            body.get("max_completion_tokens")
+            or body.get("max_tokens")
+            or completion_tokens
+        )
+    return prompt_tokens + completion_tokens
+
+
+class _ReleasingStream(httpx.SyncByteStream):
+    """Response body that frees the request's scheduler slot when closed."""
+
+    def __init__(self, stream: httpx.SyncByteStream, release: Callable[[], None]):
+        """Wrap ``stream``; ``release`` runs once, on close."""
+        self._stream = stream
+        self._release = release
+
+    def __iter__(self) -> Iterator[bytes]:
+        """Yield the body chunks."""
+        yield from self._stream
+
+    def close(self):
+        """Close the body and release the slot."""
+        try:
+            self._stream.close()
+        finally:
+            self._release()
+
+
+class _AsyncReleasingStream(httpx.AsyncByteStream):
+    """Async response body that frees the request's scheduler slot when closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        """Wrap ``stream``; ``release`` runs once, on close."""
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        """Yield the body chunks."""
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        """Close the body and release the slot."""
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+def _release_once(
+    scheduler: RequestScheduler,
+) -> Callable[[Optional[httpx.Headers]], None]:
+    """A callable releasing one scheduler slot on its first call only."""
+    lock = threading.Lock()
+
+    def release(headers: Optional[httpx.Headers] = None):
+        if lock.acquire(blocking=False):
+            scheduler.release(headers)
+
+    return release
+
+
+def _should_retry(response: httpx.Response, attempt: int, max_retries: int) -> bool:
+    """Whether a response is worth another attempt."""
+    return response.status_code in RETRY_STATUS_CODES and attempt < max_retries
+
+
+class RateLimitedTransport(httpx.BaseTransport):
+    """
+    HTTP transport sending requests through a RequestScheduler.
+
+    Throttled (429), transient server errors and connection failures are
+    retried here with jittered exponential backoff, so the OpenAI client must
+    be created with ``max_retries=0`` to avoid retrying twice.
+    """
+
+    def __init__(self, transport: httpx.BaseTransport, scheduler: RequestScheduler):
+        """
+        Initialize the transport.
+
+        Args:
+            transport: Transport that sends the requests
+            scheduler: Scheduler of the endpoint
+        """
+        self.transport = transport
+        self.scheduler = scheduler
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request once admitted, retrying throttled and failed attempts."""
+        priority = get_request_priority()
+        request.read()
+        tokens = estimate_tokens(request, self.scheduler.completion_tokens)
+
+        attempt = 0
+        while True:
+            self.scheduler.acquire(priority, tokens)
+            release = _release_once(self.scheduler)
+            response = None
+            try:
+                response = self.transport.handle_request(request)
+                if not _should_retry(response, attempt, self.scheduler.max_retries):
+                    return httpx.Response(
+                        status_code=response.status_code,
+                        headers=response.headers,
+                        stream=_ReleasingStream(
+                            response.stream, partial(release, response.headers)
+                        ),
+                        extensions=response.extensions,
+                    )
+                delay = self.scheduler.retry_delay(
+                    attempt,
+                    retry_after_seconds(response.headers),
+                    throttled=response.status_code == 429,
+                )
+                response.close()
+                release(response.headers)
+            except httpx.TransportError:
+                release()
+                if attempt >= self.scheduler.max_retries:
+                    raise
+                delay = self.scheduler.retry_delay(attempt)
+            except BaseException:
+                # Any other failure ends the request: free its slot and connection
+                release()
+                if response is not None:
+                    response.close()
+                raise
+            attempt += 1
+            time.sleep(delay)
+
+    def close(self):
+        """Close the wrapped transport."""
+        self.transport.close()
+
+
+class AsyncRateLimitedTransport(httpx.AsyncBaseTransport):
+    """Async version of ``RateLimitedTransport``."""
+
+    def __init__(
+        self, transport: httpx.AsyncBaseTransport, scheduler: RequestScheduler
+    ):
+        """
+        Initialize the transport.
+
+        Args:
+            transport: Transport that sends the requests
+            scheduler: Scheduler of the endpoint
+        """
+        self.transport = transport
+        self.scheduler = scheduler
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request once admitted, retrying throttled and failed attempts."""
+        priority = get_request_priority()
+        await request.aread()
+        tokens = estimate_tokens(request, self.scheduler.completion_tokens)
+
+        attempt = 0
+        while True:
+            await self.scheduler.aacquire(priority, tokens)
+            release = _release_once(self.scheduler)
+            response = None
+            try:
+                response = await self.transport.handle_async_request(request)
+                if not _should_retry(response, attempt, self.scheduler.max_retries):
+                    return httpx.Response(
+                        status_code=response.status_code,
+                        headers=response.headers,
+                        stream=_AsyncReleasingStream(
+                            response.stream, partial(release, response.headers)
+                        ),
+                        extensions=response.extensions,
+                    )
+                delay = self.scheduler.retry_delay(
+                    attempt,
+                    retry_after_seconds(response.headers),
+                    throttled=response.status_code == 429,
+                )
+                await response.aclose()
+                release(response.headers)
+            except httpx.TransportError:
+                release()
+                if attempt >= self.scheduler.max_retries:
+                    raise
+                delay = self.scheduler.retry_delay(attempt)
+            except BaseException:
+                # Cancellation or any other failure ends the request: free its slot
+                # and connection
+                release()
+                if response is not None:
+                    await response.aclose()
+                raise
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def aclose(self):
+        """Close the wrapped transport."""
+        await self.transport.aclose()
@@ -0,0 +1,252 @@
+"""Persistent SQLite cache of chat model responses for deterministic prompts."""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from langchain_core._api.beta_decorator import suppress_langchain_beta_warning
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.outputs import ChatGeneration
+from pydantic import BaseModel
+
+from src.config.settings import Settings
+
+# Bump whenever the stored value format changes so old entries are ignored
+RESPONSE_CACHE_VERSION = 1
+
+# Default location of the cache file (<project root>/data/)
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[2] / "data" / "llm-cache.sqlite"
+
+
+class SQLiteResponseCache(BaseCache):
+    """
+    On-disk LRU cache of chat model generations, shared across processes.
+
+    LangChain calls ``lookup`` and ``update`` with the serialized messages and
+    an ``llm_string`` describing the model, its parameters (temperature
+    included) and any bound tools or structured-output schema. Entries are
+    keyed on a hash of both, so the same conversation sent to a different
+    model or schema is a different entry.
+
+    Entries beyond ``max_entries`` or ``max_bytes`` are evicted least recently
+    used first, and entries older than ``ttl`` seconds are never returned.
+
+    Cached conversations can contain customer details, so the cache is off
+    unless ``Settings.llm_cache_enabled`` is set. Responses are only
+    deterministic at temperature 0, so the cache is attached to temperature 0
+    models only (see ``get_response_cache``).
+    """
+
+    def __init__(self, path: Path, max_entries: int, max_bytes: int, ttl: float = 0):
+        """
+        Initialize the cache, creating the database file if needed.
+
+        Args:
+            path: SQLite file holding the cache
+            max_entries: Maximum number of cached responses
+            max_bytes: Maximum total size of the stored responses
+            ttl: Seconds a response stays valid after it was stored; 0 keeps it
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        # WAL lets several processes read while one writes
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                used_at REAL NOT NULL
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_responses_used_at ON responses (used_at)"
+        )
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        """Hash of the cache version, the model description and the messages."""
+        digest = hashlib.sha256()
+        for part in (str(RESPONSE_CACHE_VERSION), llm_string, prompt):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """
+        Look up the generations cached for a prompt and mark them recently used.
+
+        Args:
+            prompt: Serialized messages
+            llm_string: Serialized model and call parameters
+
+        Returns:
+            Optional[RETURN_VAL_TYPE]: The cached generations, or None on a miss
+        """
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl and row[1] < now - self.ttl:
+                self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._connection.execute(
+                "UPDATE responses SET used_at = ? WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+        with suppress_langchain_beta_warning():
+            return loads(row[0])
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE):
+        """
+        Store the generations of a prompt, evicting old entries to stay within limits.
+
+        Args:
+            prompt: Serialized messages
+            llm_string: Serialized model and call parameters
+            return_val: Generations returned by the model
+        """
+        generations = []
+        for generation in return_val:
+            if isinstance(generation, ChatGeneration):
+                # Replayed messages must not share an ID with the original, or
+                # graph state reducers would treat them as the same message.
+                # Structured outputs are stored as dicts; the output parser
+                # rebuilds the schema object from them.
+                additional_kwargs = {
+                    name: value.model_dump() if isinstance(value, BaseModel) else value
+                    for name, value in generation.message.additional_kwargs.items()
+                }
+                message = generation.message.model_copy(
+                    update={"id": None, "additional_kwargs": additional_kwargs}
+                )
+                generation = generation.model_copy(update={"message": message})
+            generations.append(generation)
+        value = dumps(generations)
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now),
+            )
+            self.writes += 1
+            self._evict()
+
+    def _evict(self):
+        """
+        Delete expired entries, then least recently used ones over the limits.
+
+        The caller holds the lock.
+        """
+        if self.ttl:
+            self._connection.execute(
+                "DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,)
+            )
+        count, total = self._connection.execute(
+            "SELECT COUNT(*), TOTAL(size) FROM responses"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        excess_entries = max(0, count - self.max_entries)
+        excess_bytes = total - self.max_bytes
+        stale = []
+        for key, size in self._connection.execute(
+            "SELECT key, size FROM responses ORDER BY used_at"
+        ):
+            if len(stale) >= excess_entries and excess_bytes <= 0:
+                break
+            stale.append((key,))
+            excess_bytes -= size
+        self._connection.executemany("DELETE FROM responses WHERE key = ?", stale)
+        self.evictions += len(stale)
+
+    def clear(self, **kwargs: Any):
+        """Delete every cached response."""
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters and current occupancy.
+
+        Returns:
+            Dict[str, Any]: Hits, misses, writes, evictions, hit rate and size
+        """
+        with self._lock:
+            count, total = self._connection.execute(
+                "SELECT COUNT(*), TOTAL(size) FROM responses"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": count,
+                "bytes": int(total),
+            }
+
+
+# One cache per file, shared by every model in the process
+_caches: Dict[Path, SQLiteResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache(settings: Settings) -> Optional[SQLiteResponseCache]:
+    """
+    Get the response cache for the given settings.
+
+    Caching is only enabled for deterministic models: with a temperature above
+    0 the same prompt is expected to give different answers.
+
+    Args:
+        settings: Settings providing the model temperature and cache limits
+
+    Returns:
+        Optional[SQLiteResponseCache]: The shared cache, or None if caching is off
+    """
+    if not settings.llm_cache_enabled or settings.temperature != 0:
+        return None
+
+    path = Path(settings.llm_cache_path or DEFAULT_CACHE_PATH).resolve()
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = SQLiteResponseCache(
+                path,
+                max_entries=settings.llm_cache_max_entries,
+                max_bytes=settings.llm_cache_max_bytes,
+                ttl=settings.llm_cache_ttl,
+            )
+        return _caches[path]
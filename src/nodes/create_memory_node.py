@@ -3,8 +3,10 @@ from langchain_core.runnables import RunnableConfig
 from langgraph.store.base import BaseStore
 from src.schemas.state import State
 from src.config.prompts import SystemPrompts
+from src.config.runtime import get_run_settings
 from src.schemas.models import UserProfile
 from src.llm.azure_openai import AzureOpenAI
+from src.llm.rate_limiter import PRIORITY_BACKGROUND, request_priority
 
 
 class CreateMemoryNode:
@@ -22,7 +24,7 @@ class CreateMemoryNode:
     def _initialize_llm(self, config: RunnableConfig):
         """Initialize the Azure OpenAI instance."""
 
-        self.llm = AzureOpenAI.get_instance(config["settings"])
+        self.llm = AzureOpenAI.get_instance(get_run_settings(config))
         self.structured_llm = self.llm.get_structured_llm(UserProfile)
 
     def _get_existing_memory(self, store: BaseStore, customer_id: str) -> str:
@@ -65,7 +67,9 @@ class CreateMemoryNode:
             )
         )
 
-        return self.structured_llm.invoke([formatted_system_message])
+        # Memory extraction is background work: user-facing calls go first
+        with request_priority(PRIORITY_BACKGROUND):
+            return self.structured_llm.invoke([formatted_system_message])
 
     def _store_memory(
         self, store: BaseStore, customer_id: str, updated_memory: UserProfile
@@ -1,9 +1,40 @@
+import threading
+from typing import Dict
+
 from src.llm.azure_openai import AzureOpenAI
 from src.schemas.models import UserInput
 from src.schemas.state import State
+from src.utils.validation import find_customer_identifiers
 from langchain_core.messages import SystemMessage
 from langchain_core.runnables import RunnableConfig
 from src.config.prompts import SystemPrompts
+from src.config.runtime import get_run_database, get_run_settings
+
+# How identifiers were extracted across the process: by the rules, or by the
+# LLM because the message had no recognizable identifier or several of them
+_extraction_counts = {"rules": 0, "llm_no_match": 0, "llm_ambiguous": 0}
+_extraction_lock = threading.Lock()
+
+
+def get_identifier_extraction_stats() -> Dict[str, float]:
+    """
+    Get how often identifier extraction needed the LLM fallback.
+
+    Returns:
+        Dict[str, float]: Extraction counts by path and the fallback rate
+    """
+    with _extraction_lock:
+        stats: Dict[str, float] = dict(_extraction_counts)
+    total = sum(stats.values())
+    fallbacks = stats["llm_no_match"] + stats["llm_ambiguous"]
+    stats["fallback_rate"] = fallbacks / total if total else 0.0
+    return stats
+
+
+def _count_extraction(path: str):
+    """Count one identifier extraction."""
+    with _extraction_lock:
+        _extraction_counts[path] += 1
 
 
 class VerifyInfoNode:
@@ -21,12 +52,16 @@ class VerifyInfoNode:
 
     def _initialize_llm(self, config: RunnableConfig):
         """Initialize the Azure OpenAI instance and structured LLM."""
-        self.llm = AzureOpenAI.get_instance(config["settings"])
+        self.llm = AzureOpenAI.get_instance(get_run_settings(config))
         self.structured_llm = self.llm.get_structured_llm(UserInput)
 
     def _parse_customer_identifier(self, user_input) -> str:
         """
-        Parse customer identifier from user input using structured LLM.
+        Parse customer identifier from user input.
+
+        A message stating exactly one customer ID, email or phone number is
+        resolved by pattern matching; the structured LLM is only asked when
+        the message has none or several.
 
         Args:
             user_input: The user's message containing potential identifier
@@ -34,6 +69,13 @@ class VerifyInfoNode:
         Returns:
             str: The extracted identifier
         """
+        content = user_input.content if isinstance(user_input.content, str) else ""
+        identifiers = find_customer_identifiers(content)
+        if len(identifiers) == 1:
+            _count_extraction("rules")
+            return identifiers[0]
+        _count_extraction("llm_ambiguous" if identifiers else "llm_no_match")
+
         parsed_info = self.structured_llm.invoke(
             [SystemMessage(content=SystemPrompts.structured_extraction_prompt())]
             + [user_input]
@@ -48,10 +90,10 @@ class VerifyInfoNode:
             identifier: Customer identifier (ID, email, or phone)
 
         Returns:
-            Customer ID if found, empty string otherwise
+            Customer ID if found, None or empty string otherwise
         """
         if identifier:
-            return config["db"].get_customer_id_from_identifier(identifier)
+            return get_run_database(config).get_customer_id_from_identifier(identifier)
         return ""
 
     def _create_verification_success_response(self, customer_id) -> dict:
@@ -79,7 +121,7 @@ class VerifyInfoNode:
         Returns:
             dict: State update with error message requesting correct information
         """
-        response = self.llm.invoke(
+        response = self.llm.llm.invoke(
             [SystemMessage(content=SystemPrompts.verification_prompt())]
             + state["messages"]
         )
@@ -111,7 +153,9 @@ class VerifyInfoNode:
             customer_id = self._verify_customer_identity(identifier, config)
 
             # Return appropriate response based on verification result
-            if customer_id != "":
+            if customer_id:
+                # Precompute the invoice summary the invoice tools read from
+                get_run_database(config).prefetch_invoice_summary(customer_id)
                 return self._create_verification_success_response(customer_id)
             else:
                 return self._create_verification_failure_response(state)
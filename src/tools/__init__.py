@@ -2,8 +2,13 @@
 
 from .music_tools import get_music_tools
 from .invoice_tools import get_invoice_tools
+from .formatting import get_format_stats
+from .execution import get_tool_call_stats, get_tool_execution_config
 
 __all__ = [
     "get_music_tools",
     "get_invoice_tools",
+    "get_format_stats",
+    "get_tool_call_stats",
+    "get_tool_execution_config",
 ]
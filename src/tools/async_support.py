@@ -0,0 +1,27 @@
+"""Helpers for giving synchronous tools a native async implementation."""
+
+from langchain_core.tools import StructuredTool
+
+
+def async_variant(sync_tool: StructuredTool):
+    """
+    Register the decorated coroutine as the async implementation of a tool.
+
+    ``ToolNode`` awaits ``tool.ainvoke`` when the graph runs under ``ainvoke`` or
+    ``astream``. Without a coroutine, LangChain runs the synchronous function
+    on the default executor; with one, the tool awaits the async database API,
+    which bounds concurrent queries with its own worker pool. The tool's name,
+    description and argument schema stay those of the synchronous function.
+
+    Args:
+        sync_tool: Tool created with ``@tool`` from a synchronous function
+
+    Returns:
+        Callable: Decorator returning the coroutine function unchanged
+    """
+
+    def decorator(coroutine):
+        sync_tool.coroutine = coroutine
+        return coroutine
+
+    return decorator
@@ -0,0 +1,104 @@
+"""Bounded concurrent execution of the tool calls emitted in one model turn."""
+
+import threading
+import time
+from typing import Any, Dict, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import ToolMessage
+from langchain_core.runnables import RunnableConfig
+
+from src.config.settings import Settings
+from src.databases.queries import StatementStats
+
+# Latency of every tool call in the process, keyed by tool name
+_tool_call_stats = StatementStats()
+
+
+def get_tool_call_stats() -> Dict[str, Dict[str, float]]:
+    """
+    Get per-tool call counts, error counts and latencies.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Tool name to its statistics
+    """
+    return _tool_call_stats.snapshot()
+
+
+class ToolCallTimer(BaseCallbackHandler):
+    """
+    Callback handler recording the latency of every tool call by tool name.
+
+    Tool errors handled by the ToolNode still reach ``on_tool_error`` before
+    they are turned into error ToolMessages, so they are counted as errors.
+    """
+
+    # Record timings on the calling thread rather than a callback executor
+    run_inline = True
+
+    def __init__(self, stats: StatementStats):
+        """
+        Initialize the handler.
+
+        Args:
+            stats: Statistics the calls are recorded in
+        """
+        self.stats = stats
+        self._lock = threading.Lock()
+        self._running: Dict[UUID, Tuple[str, float]] = {}
+
+    def on_tool_start(
+        self,
+        serialized: Dict[str, Any],
+        input_str: str,
+        *,
+        run_id: UUID,
+        **kwargs: Any,
+    ):
+        """Remember when a tool call started."""
+        name = (serialized or {}).get("name") or kwargs.get("name") or "unknown"
+        with self._lock:
+            self._running[run_id] = (name, time.perf_counter())
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any):
+        """Record a finished call; error ToolMessages count as errors."""
+        error = isinstance(output, ToolMessage) and output.status == "error"
+        self._finish(run_id, error)
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        """Record a failed call."""
+        self._finish(run_id, True)
+
+    def _finish(self, run_id: UUID, error: bool):
+        """Record the call started under ``run_id``."""
+        with self._lock:
+            started = self._running.pop(run_id, None)
+        if started is not None:
+            name, start = started
+            self.stats.record(name, time.perf_counter() - start, error=error)
+
+
+# Shared by every agent in the process
+_tool_call_timer = ToolCallTimer(_tool_call_stats)
+
+
+def get_tool_execution_config(settings: Settings) -> RunnableConfig:
+    """
+    Get the run configuration bounding and timing an agent's tool calls.
+
+    Attach it to an agent with ``agent.with_config(...)``. ``max_concurrency``
+    caps the thread pool ToolNode runs one turn's tool calls on; async calls
+    are gathered, and their database work is bounded by the catalog's
+    ``database_async_workers`` threads.
+
+    Args:
+        settings: Settings providing ``tool_max_concurrency``
+
+    Returns:
+        RunnableConfig: ``max_concurrency`` and the tool call timing callback
+    """
+    return {
+        "max_concurrency": settings.tool_max_concurrency,
+        "callbacks": [_tool_call_timer],
+    }
@@ -0,0 +1,264 @@
+"""Conversion of typed query results into the text handed back to the LLM."""
+
+import threading
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from src.databases.results import QueryResult, ResultPage, encode_cursor
+
+# Rough characters-per-token ratio of English text and Python literals
+CHARS_PER_TOKEN = 4
+
+# Separator between the cells of a rendered row
+CELL_SEPARATOR = " | "
+
+# Marker appended to a page that has more rows; {cursor} is the next page's cursor
+CONTINUATION = 'Call again with cursor="{cursor}" to continue.'
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate the number of LLM tokens in a text.
+
+    Args:
+        text: Text handed back to the LLM
+
+    Returns:
+        int: Estimated token count
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+class FormatStats:
+    """
+    Thread-safe totals of the text size saved by the compact formatter.
+
+    The baseline is the previous rendering of the same rows: a list of
+    dictionaries repeating every column name on every row, before projection.
+    """
+
+    def __init__(self):
+        """Initialize empty totals."""
+        self._lock = threading.Lock()
+        self.results = 0
+        self.baseline_chars = 0
+        self.compact_chars = 0
+
+    def record(self, baseline_chars: int, compact_chars: int):
+        """
+        Record one formatted result.
+
+        Args:
+            baseline_chars: Size of the list-of-dictionaries rendering
+            compact_chars: Size of the text actually returned
+        """
+        with self._lock:
+            self.results += 1
+            self.baseline_chars += baseline_chars
+            self.compact_chars += compact_chars
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the totals with the size saved in characters, estimated tokens and ratio.
+
+        Returns:
+            Dict[str, Any]: Formatting totals
+        """
+        with self._lock:
+            saved = self.baseline_chars - self.compact_chars
+            return {
+                "results": self.results,
+                "baseline_chars": self.baseline_chars,
+                "compact_chars": self.compact_chars,
+                "saved_chars": saved,
+                "saved_tokens": saved // CHARS_PER_TOKEN,
+                "saved_ratio": (
+                    saved / self.baseline_chars if self.baseline_chars else 0.0
+                ),
+            }
+
+    def reset(self):
+        """Clear all totals."""
+        with self._lock:
+            self.results = 0
+            self.baseline_chars = 0
+            self.compact_chars = 0
+
+
+# Shared by every tool in the process
+_format_stats = FormatStats()
+
+
+def get_format_stats() -> Dict[str, Any]:
+    """
+    Get the process-wide totals of the size saved by compact formatting.
+
+    Returns:
+        Dict[str, Any]: Formatting totals
+    """
+    return _format_stats.snapshot()
+
+
+def project(result: QueryResult, columns: Optional[Sequence[str]]) -> QueryResult:
+    """
+    Keep only the given columns of a result, in the given order.
+
+    Args:
+        result: Typed query result
+        columns: Columns to keep, or None to keep all of them
+
+    Returns:
+        QueryResult: Result with the selected columns
+    """
+    if columns is None or tuple(columns) == result.columns:
+        return result
+    positions = [result.columns.index(column) for column in columns]
+    return QueryResult(
+        columns, [tuple(row[i] for i in positions) for row in result.rows]
+    )
+
+
+def _format_cell(value: Any) -> str:
+    """Render a single value on one line; NULL becomes an empty cell."""
+    if value is None:
+        return ""
+    return " ".join(str(value).split())
+
+
+def _format_row(row: Sequence[Any]) -> str:
+    """Render a row as separator-joined cells."""
+    return CELL_SEPARATOR.join(_format_cell(value) for value in row)
+
+
+def _cell_size(value: Any) -> int:
+    """Length of a value's repr, without building it for strings."""
+    if isinstance(value, str):
+        return len(value) + 2
+    return len(str(value))
+
+
+def _baseline_size(result: QueryResult, rows: int) -> int:
+    """
+    Estimate the size of the list-of-dictionaries rendering of the first rows.
+
+    Computed from the column names and cell lengths rather than by rendering
+    the dictionaries: every row repeats ``{'Column': ...}`` for each column,
+    rows and cells are separated by ``, `` and the list adds its brackets.
+    Strings are counted with plain quotes, ignoring escapes.
+    """
+    rows = min(rows, len(result.rows))
+    if rows <= 0:
+        return 2
+    # Braces, the quoted names with ": " and the ", " between cells of one row
+    row_overhead = (
+        2
+        + sum(len(column) + 4 for column in result.columns)
+        + 2 * max(len(result.columns) - 1, 0)
+    )
+    cells = sum(_cell_size(value) for row in result.rows[:rows] for value in row)
+    return 2 + rows * row_overhead + 2 * (rows - 1) + cells
+
+
+def format_result(result: QueryResult, columns: Optional[Sequence[str]] = None) -> str:
+    """
+    Render a query result as header-once tabular text for the LLM.
+
+    This is the single point where rows are turned into text; everything before
+    it works on the typed rows returned by ``Database.query``. The first line
+    holds the column names and every following line one row, with cells
+    separated by `` | ``.
+
+    Args:
+        result: Typed query result
+        columns: Columns to include, or None for all of them
+
+    Returns:
+        str: Text representation, or an empty string when there are no rows
+    """
+    if not result:
+        return ""
+    projected = project(result, columns)
+    lines = [CELL_SEPARATOR.join(projected.columns)]
+    lines.extend(_format_row(row) for row in projected.rows)
+    text = "\n".join(lines)
+    _format_stats.record(_baseline_size(result, len(result)), len(text))
+    return text
+
+
+def format_page(
+    page: ResultPage,
+    columns: Optional[Sequence[str]] = None,
+    max_tokens: Optional[int] = None,
+    continuation: str = CONTINUATION,
+) -> str:
+    """
+    Render a result page as tabular text within an approximate token budget.
+
+    Rows are rendered one at a time and rendering stops before the budget is
+    exceeded; the first row is always included. When rows were cut, or the
+    page has a successor, a continuation marker with the cursor to pass on
+    the next call is appended.
+
+    Args:
+        page: Result page
+        columns: Columns to include, or None for all of them
+        max_tokens: Approximate token budget, or None for no budget
+        continuation: Instruction shown when more rows are available
+
+    Returns:
+        str: Text representation, or an empty string when there are no rows
+    """
+    if not page:
+        return ""
+
+    projected = project(page, columns)
+    header = CELL_SEPARATOR.join(projected.columns)
+    lines: List[str] = [header]
+    used = estimate_tokens(header)
+    for row in projected.rows:
+        line = _format_row(row)
+        cost = estimate_tokens(line) + 1
+        if len(lines) > 1 and max_tokens is not None and used + cost > max_tokens:
+            break
+        lines.append(line)
+        used += cost
+
+    rendered_rows = len(lines) - 1
+    next_cursor = page.next_cursor
+    if rendered_rows < len(page):
+        next_cursor = encode_cursor(page.offset + rendered_rows)
+
+    text = "\n".join(lines)
+    if next_cursor is not None:
+        text += (
+            "\n[More results available. " f"{continuation.format(cursor=next_cursor)}]"
+        )
+    _format_stats.record(_baseline_size(page, rendered_rows), len(text))
+    return text
+
+
+def format_groups(
+    pages: Mapping[str, ResultPage],
+    columns: Optional[Sequence[str]] = None,
+    max_tokens: Optional[int] = None,
+    continuation: str = CONTINUATION,
+) -> str:
+    """
+    Render the results of a batched search as one section per input.
+
+    The token budget is split evenly between the inputs.
+
+    Args:
+        pages: First page of matches per input, in input order
+        columns: Columns to include, or None for all of them
+        max_tokens: Approximate token budget of the whole text, or None
+        continuation: Instruction shown when an input has more rows
+
+    Returns:
+        str: Sections headed by their input, "No matches." for empty ones
+    """
+    budget = max_tokens // len(pages) if max_tokens and pages else max_tokens
+    sections = []
+    for term, page in pages.items():
+        body = format_page(page, columns, budget, continuation) or "No matches."
+        sections.append(f"{term}:\n{body}")
+    return "\n\n".join(sections)
@@ -1,11 +1,27 @@
+import asyncio
+from datetime import date, timedelta
+from typing import Optional
 from langchain_core.tools import tool
 from langchain_core.runnables import RunnableConfig
 
+from src.config.runtime import get_run_database
+from src.databases.database import (
+    EARLIEST_INVOICE_DATE,
+    INVOICE_SUMMARY_TOP_INVOICES,
+    LATEST_INVOICE_DATE,
+)
+from src.databases.results import QueryResult
+from .async_support import async_variant
+from .formatting import format_result
+
+# Top invoices listed by get_invoice_analytics when top_n is not given
+DEFAULT_TOP_INVOICES = 3
+
 
 @tool
 def get_invoices_by_customer_sorted_by_date(
     customer_id: str, config: RunnableConfig
-) -> list[dict]:
+) -> str:
     """
     Look up all invoices for a customer using their ID.
     The invoices are sorted in descending order by invoice date, which helps when the customer wants to view their most recent/oldest invoice, or if
@@ -17,17 +33,34 @@ def get_invoices_by_customer_sorted_by_date(
         config (RunnableConfig): The configuration for the runnable.
 
     Returns:
-        list[dict]: A list of invoices for the customer.
+        str: The customer's invoices, one per line.
     """
-    return config["db"].run(
-        f"SELECT * FROM Invoice WHERE CustomerId = {customer_id} ORDER BY InvoiceDate DESC;"
+    # Served from the summary cached when the customer was verified, if current
+    summary = get_run_database(config).get_invoice_summary(customer_id)
+    if summary is not None:
+        return format_result(summary.invoices)
+    result = get_run_database(config).execute(
+        "invoices_by_customer", {"customer_id": customer_id}
     )
+    return format_result(result)
 
 
-@tool
-def get_invoices_sorted_by_unit_price(
+@async_variant(get_invoices_by_customer_sorted_by_date)
+async def aget_invoices_by_customer_sorted_by_date(
     customer_id: str, config: RunnableConfig
-) -> list[dict]:
+) -> str:
+    """Async implementation of ``get_invoices_by_customer_sorted_by_date``."""
+    summary = await get_run_database(config).aget_invoice_summary(customer_id)
+    if summary is not None:
+        return format_result(summary.invoices)
+    result = await get_run_database(config).aexecute(
+        "invoices_by_customer", {"customer_id": customer_id}
+    )
+    return format_result(result)
+
+
+@tool
+def get_invoices_sorted_by_unit_price(customer_id: str, config: RunnableConfig) -> str:
     """
     Use this tool when the customer wants to know the details of one of their invoices based on the unit price/cost of the invoice.
     This tool looks up all invoices for a customer, and sorts the unit price from highest to lowest. In order to find the invoice associated with the customer,
@@ -38,22 +71,35 @@ def get_invoices_sorted_by_unit_price(
         customer_id (str): customer_id, which serves as the identifier.
         config (RunnableConfig): The configuration for the runnable.
     Returns:
-        list[dict]: A list of invoices sorted by unit price.
+        str: The customer's invoice lines sorted by unit price, one per line.
     """
-    query = f"""
-        SELECT Invoice.*, InvoiceLine.UnitPrice
-        FROM Invoice
-        JOIN InvoiceLine ON Invoice.InvoiceId = InvoiceLine.InvoiceId
-        WHERE Invoice.CustomerId = {customer_id}
-        ORDER BY InvoiceLine.UnitPrice DESC;
-    """
-    return config["db"].run(query)
+    summary = get_run_database(config).get_invoice_summary(customer_id)
+    if summary is not None:
+        return format_result(summary.invoice_lines)
+    result = get_run_database(config).execute(
+        "invoice_lines_by_unit_price", {"customer_id": customer_id}
+    )
+    return format_result(result)
+
+
+@async_variant(get_invoices_sorted_by_unit_price)
+async def aget_invoices_sorted_by_unit_price(
+    customer_id: str, config: RunnableConfig
+) -> str:
+    """Async implementation of ``get_invoices_sorted_by_unit_price``."""
+    summary = await get_run_database(config).aget_invoice_summary(customer_id)
+    if summary is not None:
+        return format_result(summary.invoice_lines)
+    result = await get_run_database(config).aexecute(
+        "invoice_lines_by_unit_price", {"customer_id": customer_id}
+    )
+    return format_result(result)
 
 
 @tool
 def get_employee_by_invoice_and_customer(
     invoice_id: str, customer_id: str, config: RunnableConfig
-) -> dict:
+) -> str:
     """
     This tool will take in an invoice ID and a customer ID and return the employee information associated with the invoice.
 
@@ -63,21 +109,165 @@ def get_employee_by_invoice_and_customer(
         customer_id (str): customer_id, which serves as the identifier.
         config (RunnableConfig): The configuration for the runnable.
     Returns:
-        dict: Information about the employee associated with the invoice.
-    """
-    query = f"""
-        SELECT Employee.FirstName, Employee.Title, Employee.Email
-        FROM Employee
-        JOIN Customer ON Customer.SupportRepId = Employee.EmployeeId
-        JOIN Invoice ON Invoice.CustomerId = Customer.CustomerId
-        WHERE Invoice.InvoiceId = ({invoice_id}) AND Invoice.CustomerId = ({customer_id});
+        str: Information about the employee associated with the invoice.
     """
+    # The employee is the customer's support rep, for any invoice of theirs
+    summary = get_run_database(config).get_invoice_summary(customer_id)
+    if summary is not None:
+        employee_info = summary.support_rep if summary.has_invoice(invoice_id) else None
+    else:
+        employee_info = get_run_database(config).execute(
+            "employee_by_invoice_and_customer",
+            {"invoice_id": invoice_id, "customer_id": customer_id},
+        )
+
+    if not employee_info:
+        return f"No employee found for invoice ID {invoice_id} and customer identifier {customer_id}."
+    return format_result(employee_info)
 
-    employee_info = config["db"].run(query, include_columns=True)
+
+@async_variant(get_employee_by_invoice_and_customer)
+async def aget_employee_by_invoice_and_customer(
+    invoice_id: str, customer_id: str, config: RunnableConfig
+) -> str:
+    """Async implementation of ``get_employee_by_invoice_and_customer``."""
+    summary = await get_run_database(config).aget_invoice_summary(customer_id)
+    if summary is not None:
+        employee_info = summary.support_rep if summary.has_invoice(invoice_id) else None
+    else:
+        employee_info = await get_run_database(config).aexecute(
+            "employee_by_invoice_and_customer",
+            {"invoice_id": invoice_id, "customer_id": customer_id},
+        )
 
     if not employee_info:
         return f"No employee found for invoice ID {invoice_id} and customer identifier {customer_id}."
-    return employee_info
+    return format_result(employee_info)
+
+
+def _invoice_date_range(start_date: Optional[str], end_date: Optional[str]):
+    """
+    Turn inclusive YYYY-MM-DD dates into the [start, end) bounds of the statements.
+
+    Returns:
+        dict: ``start_date`` and ``end_date`` parameters
+    """
+    start = date.fromisoformat(start_date) if start_date else None
+    end = date.fromisoformat(end_date) if end_date else None
+    return {
+        "start_date": start.isoformat() if start else EARLIEST_INVOICE_DATE,
+        # The day after the end date, so invoices at any time that day are included
+        "end_date": (
+            (end + timedelta(days=1)).isoformat() if end else LATEST_INVOICE_DATE
+        ),
+    }
+
+
+@tool
+def get_invoice_analytics(
+    customer_id: str,
+    config: RunnableConfig,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    top_n: Optional[int] = DEFAULT_TOP_INVOICES,
+) -> str:
+    """
+    Summarize a customer's spending: number of invoices, total and average spend,
+    largest invoice, first and last invoice dates, and the top invoices by total.
+    Use this for questions about how much a customer spent, their biggest or most
+    expensive purchases, or purchases within a date range, instead of reading
+    through every invoice.
+
+    Args:
+        customer_id (str): customer_id, which serves as the identifier.
+        config (RunnableConfig): The configuration for the runnable.
+        start_date (str, optional): First day to include, as YYYY-MM-DD.
+        end_date (str, optional): Last day to include, as YYYY-MM-DD.
+        top_n (int, optional): Number of top invoices by total to list, 1 to 10.
+    Returns:
+        str: A spend summary and the top invoices with their date, total and track count.
+    """
+    try:
+        parameters = {
+            "customer_id": customer_id,
+            **_invoice_date_range(start_date, end_date),
+        }
+    except ValueError:
+        return "Invalid start_date or end_date. Use YYYY-MM-DD dates."
+
+    db = get_run_database(config)
+    limit = _top_invoice_limit(top_n)
+    # Without a date range, the summary cached at verification has the answer
+    if _covers_all_invoices(start_date, end_date):
+        cached = db.get_invoice_summary(customer_id)
+        if cached is not None:
+            return _format_invoice_analytics(
+                cached.spend, _first_rows(cached.top_invoices, limit), customer_id
+            )
+
+    summary = db.execute("invoice_spend_summary", parameters)
+    top = db.execute("invoice_top_by_total", {**parameters, "limit": limit})
+    return _format_invoice_analytics(summary, top, customer_id)
+
+
+@async_variant(get_invoice_analytics)
+async def aget_invoice_analytics(
+    customer_id: str,
+    config: RunnableConfig,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    top_n: Optional[int] = DEFAULT_TOP_INVOICES,
+) -> str:
+    """Async implementation of ``get_invoice_analytics``."""
+    try:
+        parameters = {
+            "customer_id": customer_id,
+            **_invoice_date_range(start_date, end_date),
+        }
+    except ValueError:
+        return "Invalid start_date or end_date. Use YYYY-MM-DD dates."
+
+    db = get_run_database(config)
+    limit = _top_invoice_limit(top_n)
+    if _covers_all_invoices(start_date, end_date):
+        cached = await db.aget_invoice_summary(customer_id)
+        if cached is not None:
+            return _format_invoice_analytics(
+                cached.spend, _first_rows(cached.top_invoices, limit), customer_id
+            )
+
+    summary, top = await asyncio.gather(
+        db.aexecute("invoice_spend_summary", parameters),
+        db.aexecute("invoice_top_by_total", {**parameters, "limit": limit}),
+    )
+    return _format_invoice_analytics(summary, top, customer_id)
+
+
+def _top_invoice_limit(top_n: Optional[int]) -> int:
+    """The number of top invoices to list, within what the invoice summary keeps."""
+    return max(1, min(top_n or DEFAULT_TOP_INVOICES, INVOICE_SUMMARY_TOP_INVOICES))
+
+
+def _covers_all_invoices(start_date: Optional[str], end_date: Optional[str]) -> bool:
+    """Whether an analytics request can be answered from a cached invoice summary."""
+    return not start_date and not end_date
+
+
+def _first_rows(result: QueryResult, limit: int) -> QueryResult:
+    """The first rows of a result, as a new result."""
+    return QueryResult(result.columns, result.rows[:limit])
+
+
+def _format_invoice_analytics(summary, top, customer_id: str) -> str:
+    """Render the spend summary and top invoices as two compact tables."""
+    if not summary.scalar():
+        return (
+            f"No invoices found for customer identifier {customer_id} in that period."
+        )
+    return (
+        f"Spend summary:\n{format_result(summary)}\n\n"
+        f"Top invoices by total:\n{format_result(top)}"
+    )
 
 
 def get_invoice_tools():
@@ -86,4 +276,5 @@ def get_invoice_tools():
         get_invoices_by_customer_sorted_by_date,
         get_invoices_sorted_by_unit_price,
         get_employee_by_invoice_and_customer,
+        get_invoice_analytics,
     ]
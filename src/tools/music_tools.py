@@ -1,7 +1,40 @@
-import ast
+from typing import List, Optional
 from langchain_core.tools import tool
 from langchain_core.runnables import RunnableConfig
 
+from src.config.runtime import get_run_database
+from src.databases.results import QueryResult
+from .async_support import async_variant
+from .formatting import format_groups, format_page, format_result
+
+# Track columns the agent uses when answering; media and size details are dropped
+SONG_COLUMNS = ("TrackId", "Name", "Composer", "UnitPrice")
+
+# Songs sampled per genre, one per artist, matching the songs_by_genre statement
+GENRE_SAMPLE_SIZE = 8
+
+# Songs or artists listed by the similarity and recommendation tools: the
+# default, and the cap on what the model may ask for
+DEFAULT_SUGGESTIONS = 5
+MAX_SUGGESTIONS = 20
+
+# How batched searches point at the paginated single-input tools
+TRACKS_CONTINUATION = (
+    'Call get_tracks_by_artist for this artist with cursor="{cursor}" to continue.'
+)
+GENRE_CONTINUATION = "Only a sample of the artists in this genre is shown."
+SONGS_CONTINUATION = (
+    'Call check_for_songs for this title with cursor="{cursor}" to continue.'
+)
+
+# Kinds the model may pass to find_closest_catalog_matches, mapped to index kinds
+CATALOG_KINDS = {
+    "artist": "artist",
+    "album": "album",
+    "track": "track",
+    "song": "track",
+}
+
 
 @tool
 def get_albums_by_artist(artist: str, config: RunnableConfig):
@@ -14,38 +47,55 @@ def get_albums_by_artist(artist: str, config: RunnableConfig):
     Returns:
         str: Database query results containing album titles and artist names.
     """
-    return config["db"].run(
-        f"""
-            SELECT Album.Title, Artist.Name 
-            FROM Album 
-            JOIN Artist ON Album.ArtistId = Artist.ArtistId 
-            WHERE Artist.Name LIKE '%{artist}%';
-            """,
-        include_columns=True,
+    result = get_run_database(config).search("albums_by_artist", "artist", artist)
+    return format_result(result)
+
+
+@async_variant(get_albums_by_artist)
+async def aget_albums_by_artist(artist: str, config: RunnableConfig):
+    """Async implementation of ``get_albums_by_artist``."""
+    result = await get_run_database(config).asearch(
+        "albums_by_artist", "artist", artist
     )
+    return format_result(result)
 
 
 @tool
-def get_tracks_by_artist(artist: str, config: RunnableConfig):
+def get_tracks_by_artist(
+    artist: str,
+    config: RunnableConfig,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+):
     """
     Get songs/tracks by an artist (or similar artists) from the music database.
+    Results are paginated; if more songs are available the result ends with a
+    cursor to pass back to get the next page.
 
     Args:
         artist (str): The name of the artist to search for tracks.
         config (RunnableConfig): The configuration for the runnable.
+        limit (int, optional): Maximum number of songs to return.
+        cursor (str, optional): Cursor returned by a previous call, to continue.
     Returns:
         str: Database query results containing song names and artist names.
     """
-    return config["db"].run(
-        f"""
-        SELECT Track.Name as SongName, Artist.Name as ArtistName 
-        FROM Album 
-        LEFT JOIN Artist ON Album.ArtistId = Artist.ArtistId 
-        LEFT JOIN Track ON Track.AlbumId = Album.AlbumId 
-        WHERE Artist.Name LIKE '%{artist}%';
-        """,
-        include_columns=True,
-    )
+    db = get_run_database(config)
+    page = db.search_page("tracks_by_artist", "artist", artist, cursor, limit)
+    return format_page(page, max_tokens=db.settings.tool_max_tokens)
+
+
+@async_variant(get_tracks_by_artist)
+async def aget_tracks_by_artist(
+    artist: str,
+    config: RunnableConfig,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+):
+    """Async implementation of ``get_tracks_by_artist``."""
+    db = get_run_database(config)
+    page = await db.asearch_page("tracks_by_artist", "artist", artist, cursor, limit)
+    return format_page(page, max_tokens=db.settings.tool_max_tokens)
 
 
 @tool
@@ -53,70 +103,367 @@ def get_songs_by_genre(genre: str, config: RunnableConfig):
     """
     Fetch songs from the database that match a specific genre.
 
-    This function first looks up the genre ID(s) for the given genre name,
-    then retrieves songs that belong to those genre(s), limiting results
+    This function looks up the genre ID(s) for the given genre name and
+    retrieves songs that belong to those genre(s), limiting results
     to 8 songs grouped by artist.
 
     Args:
         genre (str): The genre of the songs to fetch.
         config (RunnableConfig): The configuration for the runnable.
     Returns:
-        list[dict] or str: A list of songs with artist information that match
-                        the specified genre, or an error message if no songs found.
+        str: A table of songs with artist information that match the
+            specified genre, or an error message if no songs found.
     """
-    # First, get the genre ID(s) for the specified genre
-    genre_id_query = f"SELECT GenreId FROM Genre WHERE Name LIKE '%{genre}%'"
-    genre_ids = config["db"].run(genre_id_query)
+    # Look up the genre ID(s) and the matching songs in a single statement
+    songs = get_run_database(config).search("songs_by_genre", "genre", genre)
+    return _format_genre_songs(songs, genre)
 
-    # Check if any genres were found
-    if not genre_ids:
-        return f"No songs found for the genre: {genre}"
 
-    # Parse the genre IDs and format them for the SQL query
-    genre_ids = ast.literal_eval(genre_ids)
-    genre_id_list = ", ".join(str(gid[0]) for gid in genre_ids)
+@async_variant(get_songs_by_genre)
+async def aget_songs_by_genre(genre: str, config: RunnableConfig):
+    """Async implementation of ``get_songs_by_genre``."""
+    songs = await get_run_database(config).asearch("songs_by_genre", "genre", genre)
+    return _format_genre_songs(songs, genre)
 
-    # Query for songs in the specified genre(s)
-    songs_query = f"""
-        SELECT Track.Name as SongName, Artist.Name as ArtistName
-        FROM Track
-        LEFT JOIN Album ON Track.AlbumId = Album.AlbumId
-        LEFT JOIN Artist ON Album.ArtistId = Artist.ArtistId
-        WHERE Track.GenreId IN ({genre_id_list})
-        GROUP BY Artist.Name
-        LIMIT 8;
-    """
-    songs = config["db"].run(songs_query, include_columns=True)
 
+def _format_genre_songs(songs, genre: str):
+    """Shape genre search rows into the list returned by ``get_songs_by_genre``."""
     # Check if any songs were found
     if not songs:
         return f"No songs found for the genre: {genre}"
 
-    # Format the results into a structured list of dictionaries
-    formatted_songs = ast.literal_eval(songs)
-    return [
-        {"Song": song["SongName"], "Artist": song["ArtistName"]}
-        for song in formatted_songs
-    ]
+    # Format the results as a song/artist table
+    return format_result(QueryResult(("Song", "Artist"), songs.rows))
 
 
 @tool
-def check_for_songs(song_title, config: RunnableConfig):
+def check_for_songs(
+    song_title,
+    config: RunnableConfig,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+):
     """
     Check if a song exists in the database by its name.
+    Results are paginated; if more songs are available the result ends with a
+    cursor to pass back to get the next page.
 
     Args:
         song_title (str): The title of the song to search for.
         config (RunnableConfig): The configuration for the runnable.
+        limit (int, optional): Maximum number of songs to return.
+        cursor (str, optional): Cursor returned by a previous call, to continue.
     Returns:
         str: Database query results containing all track information
             for songs matching the given title.
     """
-    return config["db"].run(
-        f"""
-        SELECT * FROM Track WHERE Name LIKE '%{song_title}%';
-        """,
-        include_columns=True,
+    db = get_run_database(config)
+    page = db.search_page("songs_by_title", "song_title", song_title, cursor, limit)
+    return format_page(page, SONG_COLUMNS, db.settings.tool_max_tokens)
+
+
+@async_variant(check_for_songs)
+async def acheck_for_songs(
+    song_title,
+    config: RunnableConfig,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+):
+    """Async implementation of ``check_for_songs``."""
+    db = get_run_database(config)
+    page = await db.asearch_page(
+        "songs_by_title", "song_title", song_title, cursor, limit
+    )
+    return format_page(page, SONG_COLUMNS, db.settings.tool_max_tokens)
+
+
+def _catalog_kinds(kind: Optional[str]) -> Optional[List[str]]:
+    """
+    Map the kind passed by the model to the name index kinds.
+
+    Args:
+        kind: "artist", "album", "track" or "song", in any case; None for all
+
+    Returns:
+        Optional[List[str]]: The index kinds to match, or None for all kinds
+
+    Raises:
+        ValueError: If the kind is not one of the catalog kinds
+    """
+    if not kind or not kind.strip():
+        return None
+    normalized = CATALOG_KINDS.get(kind.strip().lower())
+    if normalized is None:
+        raise ValueError(
+            f'Unknown kind: {kind}. Use "artist", "album" or "track", or omit it.'
+        )
+    return [normalized]
+
+
+@tool
+def find_closest_catalog_matches(
+    name: str, config: RunnableConfig, kind: Optional[str] = None
+):
+    """
+    Find the artists, albums and songs whose names best match a possibly misspelled
+    or partial name, in a single call. Use this instead of retrying searches with
+    alternative spellings when a search returns no results.
+
+    Args:
+        name (str): The artist, album or song name as given by the customer.
+        config (RunnableConfig): The configuration for the runnable.
+        kind (str, optional): Restrict matches to "artist", "album" or "track".
+    Returns:
+        str: The best matches with their kind, artist and a score between 0 and 1.
+    """
+    try:
+        kinds = _catalog_kinds(kind)
+    except ValueError as error:
+        return str(error)
+    result = get_run_database(config).find_closest_names(name, kinds)
+    if not result:
+        return f"No catalog names resemble: {name}"
+    return format_result(result)
+
+
+@async_variant(find_closest_catalog_matches)
+async def afind_closest_catalog_matches(
+    name: str, config: RunnableConfig, kind: Optional[str] = None
+):
+    """Async implementation of ``find_closest_catalog_matches``."""
+    try:
+        kinds = _catalog_kinds(kind)
+    except ValueError as error:
+        return str(error)
+    result = await get_run_database(config).afind_closest_names(name, kinds)
+    if not result:
+        return f"No catalog names resemble: {name}"
+    return format_result(result)
+
+
+@tool
+def get_albums_by_artists(artists: List[str], config: RunnableConfig):
+    """
+    Get albums for several artists in a single call. Use this instead of calling
+    get_albums_by_artist once per artist when the customer mentions more than one.
+
+    Args:
+        artists (list[str]): The names of the artists to search for albums.
+        config (RunnableConfig): The configuration for the runnable.
+    Returns:
+        str: Album titles and artist names, in one section per requested artist.
+    """
+    db = get_run_database(config)
+    pages = db.search_many("albums_by_artist", "artist", artists)
+    return format_groups(
+        pages,
+        max_tokens=db.settings.tool_max_tokens,
+        continuation="Use get_albums_by_artist for this artist to see all albums.",
+    )
+
+
+@async_variant(get_albums_by_artists)
+async def aget_albums_by_artists(artists: List[str], config: RunnableConfig):
+    """Async implementation of ``get_albums_by_artists``."""
+    db = get_run_database(config)
+    pages = await db.asearch_many("albums_by_artist", "artist", artists)
+    return format_groups(
+        pages,
+        max_tokens=db.settings.tool_max_tokens,
+        continuation="Use get_albums_by_artist for this artist to see all albums.",
+    )
+
+
+@tool
+def get_tracks_by_artists(artists: List[str], config: RunnableConfig):
+    """
+    Get songs/tracks for several artists in a single call. Use this instead of
+    calling get_tracks_by_artist once per artist when the customer mentions more
+    than one.
+
+    Args:
+        artists (list[str]): The names of the artists to search for tracks.
+        config (RunnableConfig): The configuration for the runnable.
+    Returns:
+        str: Song names and artist names, in one section per requested artist.
+    """
+    db = get_run_database(config)
+    pages = db.search_many("tracks_by_artist", "artist", artists)
+    return format_groups(
+        pages,
+        max_tokens=db.settings.tool_max_tokens,
+        continuation=TRACKS_CONTINUATION,
+    )
+
+
+@async_variant(get_tracks_by_artists)
+async def aget_tracks_by_artists(artists: List[str], config: RunnableConfig):
+    """Async implementation of ``get_tracks_by_artists``."""
+    db = get_run_database(config)
+    pages = await db.asearch_many("tracks_by_artist", "artist", artists)
+    return format_groups(
+        pages,
+        max_tokens=db.settings.tool_max_tokens,
+        continuation=TRACKS_CONTINUATION,
+    )
+
+
+@tool
+def get_songs_by_genres(genres: List[str], config: RunnableConfig):
+    """
+    Fetch up to 8 songs, grouped by artist, for each of several genres in a single
+    call. Use this instead of calling get_songs_by_genre once per genre.
+
+    Args:
+        genres (list[str]): The genres of the songs to fetch.
+        config (RunnableConfig): The configuration for the runnable.
+    Returns:
+        str: Song names and artist names, in one section per requested genre.
+    """
+    db = get_run_database(config)
+    pages = db.search_many("songs_by_genre", "genre", genres, GENRE_SAMPLE_SIZE)
+    return format_groups(
+        pages,
+        max_tokens=db.settings.tool_max_tokens,
+        continuation=GENRE_CONTINUATION,
+    )
+
+
+@async_variant(get_songs_by_genres)
+async def aget_songs_by_genres(genres: List[str], config: RunnableConfig):
+    """Async implementation of ``get_songs_by_genres``."""
+    db = get_run_database(config)
+    pages = await db.asearch_many("songs_by_genre", "genre", genres, GENRE_SAMPLE_SIZE)
+    return format_groups(
+        pages,
+        max_tokens=db.settings.tool_max_tokens,
+        continuation=GENRE_CONTINUATION,
+    )
+
+
+@tool
+def check_for_songs_by_titles(song_titles: List[str], config: RunnableConfig):
+    """
+    Check whether several songs exist in the database in a single call. Use this
+    instead of calling check_for_songs once per title.
+
+    Args:
+        song_titles (list[str]): The titles of the songs to search for.
+        config (RunnableConfig): The configuration for the runnable.
+    Returns:
+        str: Matching track information, in one section per requested title.
+    """
+    db = get_run_database(config)
+    pages = db.search_many("songs_by_title", "song_title", song_titles)
+    return format_groups(
+        pages,
+        SONG_COLUMNS,
+        db.settings.tool_max_tokens,
+        continuation=SONGS_CONTINUATION,
+    )
+
+
+@async_variant(check_for_songs_by_titles)
+async def acheck_for_songs_by_titles(song_titles: List[str], config: RunnableConfig):
+    """Async implementation of ``check_for_songs_by_titles``."""
+    db = get_run_database(config)
+    pages = await db.asearch_many("songs_by_title", "song_title", song_titles)
+    return format_groups(
+        pages,
+        SONG_COLUMNS,
+        db.settings.tool_max_tokens,
+        continuation=SONGS_CONTINUATION,
+    )
+
+
+@tool
+def find_similar_songs(
+    description: str, config: RunnableConfig, limit: Optional[int] = DEFAULT_SUGGESTIONS
+):
+    """
+    Find songs whose title, artist, album or genre resemble a song title,
+    artist, album, genre or description, in a single call. Use this for
+    "songs like X" requests.
+
+    Args:
+        description (str): A song title, artist, album, genre or description.
+        config (RunnableConfig): The configuration for the runnable.
+        limit (int, optional): Maximum number of songs to return, at most 20.
+    Returns:
+        str: Similar songs with their artist and a similarity score.
+    """
+    result = get_run_database(config).find_similar(
+        description, ["track"], _suggestion_limit(limit)
+    )
+    return _format_similar_songs(result, description)
+
+
+@async_variant(find_similar_songs)
+async def afind_similar_songs(
+    description: str, config: RunnableConfig, limit: Optional[int] = DEFAULT_SUGGESTIONS
+):
+    """Async implementation of ``find_similar_songs``."""
+    result = await get_run_database(config).afind_similar(
+        description, ["track"], _suggestion_limit(limit)
+    )
+    return _format_similar_songs(result, description)
+
+
+def _suggestion_limit(limit: Optional[int]) -> int:
+    """The number of suggestions to return, capped like the paginated tools' pages."""
+    return max(1, min(limit or DEFAULT_SUGGESTIONS, MAX_SUGGESTIONS))
+
+
+def _format_similar_songs(result, description: str):
+    """Render similar songs as a song/artist table."""
+    if not result:
+        return f"No songs similar to: {description}"
+    return format_result(result, columns=("Name", "ArtistName", "Score"))
+
+
+@tool
+def recommend_for_customer(
+    customer_id: str, config: RunnableConfig, limit: Optional[int] = DEFAULT_SUGGESTIONS
+):
+    """
+    Recommend artists and songs for a verified customer based on what they and
+    customers with similar purchases bought, and on playlists. Use this when the
+    customer asks for recommendations or for something new to listen to.
+
+    Args:
+        customer_id (str): customer_id, which serves as the identifier.
+        config (RunnableConfig): The configuration for the runnable.
+        limit (int, optional): Maximum number of recommendations, at most 20.
+    Returns:
+        str: Recommended artists with their genre, a suggested song and a score.
+    """
+    if not str(customer_id).strip().isdigit():
+        return f"Invalid customer ID: {customer_id}"
+    recommendations = get_run_database(config).recommend_for_customer(
+        int(customer_id), _suggestion_limit(limit)
+    )
+    return _format_recommendations(recommendations, customer_id)
+
+
+@async_variant(recommend_for_customer)
+async def arecommend_for_customer(
+    customer_id: str, config: RunnableConfig, limit: Optional[int] = DEFAULT_SUGGESTIONS
+):
+    """Async implementation of ``recommend_for_customer``."""
+    if not str(customer_id).strip().isdigit():
+        return f"Invalid customer ID: {customer_id}"
+    recommendations = await get_run_database(config).arecommend_for_customer(
+        int(customer_id), _suggestion_limit(limit)
+    )
+    return _format_recommendations(recommendations, customer_id)
+
+
+def _format_recommendations(recommendations, customer_id: str):
+    """Render recommendations as a table, or a message when there are none."""
+    if not recommendations:
+        return f"No recommendations found for customer ID: {customer_id}"
+    return format_result(
+        QueryResult(("Artist", "Genre", "Song", "Score"), recommendations)
     )
 
 
@@ -127,4 +474,11 @@ def get_music_tools():
         get_tracks_by_artist,
         get_songs_by_genre,
         check_for_songs,
+        find_closest_catalog_matches,
+        get_albums_by_artists,
+        get_tracks_by_artists,
+        get_songs_by_genres,
+        check_for_songs_by_titles,
+        recommend_for_customer,
+        find_similar_songs,
     ]
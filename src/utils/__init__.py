@@ -1,10 +1,17 @@
 """Utility functions and helpers for the multi-agent system."""
 
 from .graph_utils import show_graph
-from .validation import validate_customer_identifier, should_interrupt
+from .validation import (
+    extract_customer_identifier,
+    find_customer_identifiers,
+    validate_customer_identifier,
+    should_interrupt,
+)
 
 __all__ = [
     "show_graph",
     "validate_customer_identifier",
+    "extract_customer_identifier",
+    "find_customer_identifiers",
     "should_interrupt",
 ]
@@ -1,10 +1,35 @@
 """Input validation utilities."""
 
 import re
+from typing import List, Optional
 from langchain_core.runnables import RunnableConfig
+from src.databases.customer_index import MAX_PHONE_DIGITS, MIN_PHONE_DIGITS
 from src.schemas.state import State
 
 
+# Identifier shapes shared by validation and extraction
+EMAIL_PATTERN = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
+PHONE_PATTERN = r"\+\d[\d\s\(\)\-]{5,22}\d"
+
+_EMAIL = re.compile(EMAIL_PATTERN)
+_PHONE = re.compile(PHONE_PATTERN)
+
+# "customer id is 1", "account number: 42", "customer #7"; a bare "id" is not
+# enough, since invoice, track and album IDs are mentioned the same way
+_CUSTOMER_ID = re.compile(
+    r"\b(?:customer|account)\s*(?:id|number|no\.?|#)\s*(?:is\s+|[:=#]\s*)?#?(\d+)\b",
+    re.IGNORECASE,
+)
+# A message that is nothing but a number
+_BARE_NUMBER = re.compile(r"^\s*#?\s*(\d+)\s*[.!]?\s*$")
+
+
+def _is_phone_number(value: str) -> bool:
+    """Whether a ``PHONE_PATTERN`` match has a plausible number of digits."""
+    digits = sum(character.isdigit() for character in value)
+    return MIN_PHONE_DIGITS <= digits <= MAX_PHONE_DIGITS
+
+
 def validate_customer_identifier(identifier: str) -> bool:
     """
     Validate customer identifier format.
@@ -24,22 +49,70 @@ def validate_customer_identifier(identifier: str) -> bool:
 
     # Check if it's a valid email format
     if "@" in identifier:
-        email_pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-        return bool(re.match(email_pattern, identifier))
+        return bool(_EMAIL.fullmatch(identifier))
 
     # Check if it's a phone number (starts with +)
     if identifier.startswith("+"):
-        # Basic phone number validation
-        phone_pattern = r"^\+\d[\d\s\(\)\-]{7,15}$"
-        return bool(re.match(phone_pattern, identifier))
+        return bool(_PHONE.fullmatch(identifier)) and _is_phone_number(identifier)
 
     return False
 
 
+def find_customer_identifiers(text: str) -> List[str]:
+    """
+    Find the customer IDs, emails and phone numbers stated in a message.
+
+    Customer IDs are only recognized when introduced as one ("customer id is
+    1", "account number: 42") or when the message is just a number, so other
+    numbers in a message are not mistaken for IDs.
+
+    Args:
+        text (str): Message text
+
+    Returns:
+        List[str]: Distinct identifiers in order of appearance
+    """
+    if not text or not isinstance(text, str):
+        return []
+
+    found = []
+    for match in _EMAIL.finditer(text):
+        found.append((match.start(), match.group()))
+    for match in _PHONE.finditer(text):
+        if _is_phone_number(match.group()):
+            found.append((match.start(), match.group()))
+    for pattern in (_CUSTOMER_ID, _BARE_NUMBER):
+        for match in pattern.finditer(text):
+            found.append((match.start(1), match.group(1)))
+
+    identifiers = []
+    for _, identifier in sorted(found):
+        if validate_customer_identifier(identifier) and identifier not in identifiers:
+            identifiers.append(identifier)
+    return identifiers
+
+
+def extract_customer_identifier(text: str) -> Optional[str]:
+    """
+    Extract the customer identifier from a message without calling a model.
+
+    Args:
+        text (str): Message text
+
+    Returns:
+        Optional[str]: The identifier if exactly one was found, otherwise None
+    """
+    identifiers = find_customer_identifiers(text)
+    return identifiers[0] if len(identifiers) == 1 else None
+
+
 def sanitize_sql_input(value: str) -> str:
     """
     Basic SQL input sanitization.
 
+    Database tools bind values through the named statements in
+    ``src.databases.queries`` instead; use this only where SQL is built as text.
+
     Args:
         value (str): Input value to sanitize
 
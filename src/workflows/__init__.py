@@ -1,7 +1,9 @@
 """Workflow orchestration components for the multi-agent system."""
 
 from .multi_agent_workflow import MultiAgentWorkflow
+from .streaming import StreamEvent
 
 __all__ = [
     "MultiAgentWorkflow",
+    "StreamEvent",
 ]
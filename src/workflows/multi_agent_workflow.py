@@ -1,12 +1,10 @@
 """Complete multi-agent workflow with verification, memory management, and human-in-the-loop."""
 
-from typing import Optional
+from typing import Any, AsyncIterator, Iterator, Optional
 from langchain_core.runnables import RunnableConfig
 
 from langgraph.graph import StateGraph, START, END
 
-from src.nodes.create_memory_node import create_memory_node
-
 # Import Agents
 from src.agents import MusicAgent, InvoiceAgent, SupervisorAgent
 
@@ -20,6 +18,7 @@ from src.memory.memory_manager import MemoryManager
 # Import Nodes
 from src.nodes.verify_info_node import VerifyInfoNode
 from src.nodes.human_input_node import HumanInputNode
+from src.nodes.create_memory_node import CreateMemoryNode
 from src.tools import get_music_tools, get_invoice_tools
 
 # Import LLM
@@ -28,6 +27,9 @@ from src.llm.azure_openai import AzureOpenAI
 # Import Validation
 from src.utils.validation import should_interrupt
 
+# Import Streaming
+from .streaming import STREAM_MODES, StreamEvent, to_stream_events
+
 
 class MultiAgentWorkflow:
     """
@@ -52,6 +54,7 @@ class MultiAgentWorkflow:
             memory_manager: Memory manager instance
         """
         self.settings = settings
+        self.graph = None
 
         if memory_manager:
             self.memory_manager = memory_manager
@@ -78,8 +81,12 @@ class MultiAgentWorkflow:
         self.invoice_tools = get_invoice_tools()
 
         # Create specialized agents
-        self.music_agent = MusicAgent(self.llm, self.music_tools).music_agent
-        self.invoice_agent = InvoiceAgent(self.llm, self.invoice_tools).invoice_agent
+        self.music_agent = MusicAgent(
+            self.llm, self.music_tools, self.settings
+        ).music_agent
+        self.invoice_agent = InvoiceAgent(
+            self.llm, self.invoice_tools, self.settings
+        ).invoice_agent
 
         # Create supervisor agent with references to specialized agents
         self.supervisor_agent = SupervisorAgent(
@@ -106,7 +113,8 @@ class MultiAgentWorkflow:
         workflow.add_node("human_input", human_input_node.execute)
         workflow.add_node("load_memory", self._load_memory_node)
         workflow.add_node("supervisor", supervisor_workflow)
-        workflow.add_node("create_memory", create_memory_node)
+        create_memory_node = CreateMemoryNode()
+        workflow.add_node("create_memory", create_memory_node.execute)
 
     def _configure_workflow_edges(self, workflow):
         """Configure the edges and flow of the workflow graph."""
@@ -149,8 +157,72 @@ class MultiAgentWorkflow:
         self._configure_workflow_edges(workflow)
 
         # Compile the final graph with all components
-        return workflow.compile(
+        self.graph = workflow.compile(
             name="multi_agent_workflow",
             checkpointer=self.memory_manager.get_checkpointer(),
             store=self.memory_manager.get_store(),
         )
+        return self.graph
+
+    def _get_graph(self):
+        """Get the compiled graph, building it on first use."""
+        if self.graph is None:
+            self.build_graph()
+        return self.graph
+
+    def _run_config(self, config: RunnableConfig) -> RunnableConfig:
+        """
+        Add the workflow's settings to ``configurable`` unless the caller set them.
+
+        Nodes and tools only receive ``configurable`` from the run configuration,
+        so per-run objects such as the settings and database are passed there.
+        """
+        configurable = config.get("configurable", {})
+        if self.settings is None or "settings" in configurable:
+            return config
+        return {**config, "configurable": {**configurable, "settings": self.settings}}
+
+    async def astream_response(
+        self, input: Any, config: RunnableConfig
+    ) -> AsyncIterator[StreamEvent]:
+        """
+        Run the workflow and yield agent tokens and tool events as they happen.
+
+        Tokens of the supervisor and of the sub-agents inside it are yielded
+        while the model generates them; structured-output calls (verification,
+        memory extraction) are not streamed. When the workflow pauses for human
+        input an ``interrupt`` event is yielded and the stream ends; resume it
+        with ``Command(resume=...)`` as ``input``. The final state is available
+        from ``graph.aget_state(config)``.
+
+        Args:
+            input: Initial state, or a ``Command`` resuming an interrupted run
+            config: Run configuration; ``configurable`` holds the thread ID and
+                optionally the ``db`` and ``settings`` used by nodes and tools
+
+        Yields:
+            StreamEvent: Tokens, tool calls, tool results, messages and interrupts
+        """
+        async for namespace, mode, chunk in self._get_graph().astream(
+            input, self._run_config(config), stream_mode=STREAM_MODES, subgraphs=True
+        ):
+            for event in to_stream_events(namespace, mode, chunk):
+                yield event
+
+    def stream_response(
+        self, input: Any, config: RunnableConfig
+    ) -> Iterator[StreamEvent]:
+        """
+        Synchronous version of ``astream_response`` for callers without an event loop.
+
+        Args:
+            input: Initial state, or a ``Command`` resuming an interrupted run
+            config: Run configuration including the thread ID
+
+        Yields:
+            StreamEvent: Tokens, tool calls, tool results, messages and interrupts
+        """
+        for namespace, mode, chunk in self._get_graph().stream(
+            input, self._run_config(config), stream_mode=STREAM_MODES, subgraphs=True
+        ):
+            yield from to_stream_events(namespace, mode, chunk)
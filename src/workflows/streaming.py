@@ -0,0 +1,110 @@
+"""Conversion of LangGraph stream chunks into front-end friendly events."""
+
+from typing import Any, List, Sequence, Tuple
+
+from langchain_core.messages import AIMessageChunk, BaseMessage, ToolMessage
+
+# Stream modes requested from the graph: LLM tokens plus node updates (for interrupts)
+STREAM_MODES = ["messages", "updates"]
+
+
+class StreamEvent:
+    """
+    One incremental piece of a streamed workflow run.
+
+    Kinds:
+        token: Text generated by an agent, to append to its current reply
+        tool_call: The agent started calling the tool named in ``content``
+        tool_result: Output of a tool call
+        message: A complete message produced without streaming, e.g. verification
+        interrupt: The workflow paused for human input; ``content`` is the prompt
+    """
+
+    __slots__ = ("kind", "node", "content")
+
+    def __init__(self, kind: str, node: str, content: Any):
+        """
+        Initialize the event.
+
+        Args:
+            kind: Event kind (see class docstring)
+            node: Agent or node that produced the event
+            content: Token text, tool name, tool output, message text or prompt
+        """
+        self.kind = kind
+        self.node = node
+        self.content = content
+
+    def __repr__(self) -> str:
+        """Short description of the event."""
+        return f"StreamEvent(kind={self.kind!r}, node={self.node!r})"
+
+
+def _node_name(namespace: Sequence[str], metadata: dict) -> str:
+    """
+    Name of the agent a message chunk came from, without its task ID.
+
+    The namespace of a message ends with the node that produced it; inside a
+    subgraph the agent is the parent graph node (e.g. the sub-agent rather
+    than its inner ``agent`` or ``tools`` node).
+    """
+    if len(namespace) > 1:
+        return namespace[-2].split(":")[0]
+    if namespace:
+        return namespace[0].split(":")[0]
+    return metadata.get("langgraph_node", "")
+
+
+def _message_events(
+    namespace: Sequence[str], chunk: Tuple[BaseMessage, dict]
+) -> List[StreamEvent]:
+    """Events of one ``messages`` mode chunk."""
+    message, metadata = chunk
+    node = _node_name(namespace, metadata)
+
+    if isinstance(message, AIMessageChunk):
+        events = [
+            StreamEvent("tool_call", node, tool_call["name"])
+            for tool_call in message.tool_call_chunks
+            if tool_call.get("name")
+        ]
+        if isinstance(message.content, str) and message.content:
+            events.append(StreamEvent("token", node, message.content))
+        return events
+
+    if isinstance(message, ToolMessage):
+        return [StreamEvent("tool_result", message.name or node, message.content)]
+
+    # Whole messages returned by nodes, e.g. the verification confirmation
+    if message.type in ("ai", "system") and message.content:
+        return [StreamEvent("message", node, message.content)]
+    return []
+
+
+def to_stream_events(
+    namespace: Sequence[str], mode: str, chunk: Any
+) -> List[StreamEvent]:
+    """
+    Convert one item of ``graph.stream``/``astream`` into stream events.
+
+    The graph must be streamed with ``stream_mode=STREAM_MODES`` and
+    ``subgraphs=True``, so items are ``(namespace, mode, chunk)`` triples.
+
+    Args:
+        namespace: Path of the subgraph that produced the chunk
+        mode: Stream mode of the chunk
+        chunk: Chunk payload
+
+    Returns:
+        List[StreamEvent]: Events in the chunk, possibly none
+    """
+    if mode == "messages":
+        return _message_events(namespace, chunk)
+
+    # Only interrupts of the top-level graph need the updates stream
+    if mode == "updates" and not namespace and "__interrupt__" in chunk:
+        return [
+            StreamEvent("interrupt", "human_input", interrupt.value)
+            for interrupt in chunk["__interrupt__"]
+        ]
+    return []
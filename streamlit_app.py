@@ -47,11 +47,57 @@ def initialize_system():
         return None, None, False
 
 
-def process_user_input(workflow, multi_agent_workflow, user_input, user_name="User"):
+def stream_workflow(multi_agent_workflow, input, config):
+    """
+    Run the workflow, rendering agent output as it streams in.
+
+    Each agent's reply gets its own chat message that grows token by token;
+    tool calls and results are listed in an expander as they happen.
+
+    Returns:
+        The workflow state after the run
+    """
+    tool_log = st.expander("🔧 Tool Execution Details")
+    current_node = None
+    placeholder = None
+    text = ""
+
+    for event in multi_agent_workflow.stream_response(input, config):
+        if event.kind == "token":
+            # Open a new chat message whenever a different agent starts talking
+            if event.node != current_node:
+                placeholder = st.chat_message("assistant").empty()
+                current_node = event.node
+                text = ""
+            text += event.content
+            placeholder.markdown(text + "▌")
+            continue
+
+        # Finish the reply in progress without the cursor
+        if placeholder is not None:
+            placeholder.markdown(text)
+        current_node = None
+        placeholder = None
+
+        if event.kind == "tool_call":
+            tool_log.markdown(f"**{event.node}** → `{event.content}`")
+        elif event.kind == "tool_result":
+            tool_log.code(str(event.content), language="json")
+        elif event.kind in ("message", "interrupt"):
+            st.chat_message("assistant").write(event.content)
+
+    if placeholder is not None:
+        placeholder.markdown(text)
+
+    return multi_agent_workflow.graph.get_state(config).values
+
+
+def process_user_input(multi_agent_workflow, user_input, user_name="User"):
     """Process user input through the multi-agent workflow."""
     try:
         # Create a human message
         initial_message = HumanMessage(content=user_input)
+        st.chat_message("user").write(user_input)
 
         # Generate a unique thread ID for this session (no persistence)
         thread_id = uuid.uuid4()
@@ -61,13 +107,13 @@ def process_user_input(workflow, multi_agent_workflow, user_input, user_name="Us
             "configurable": {
                 "thread_id": thread_id,
                 "user_id": user_name,
-                "llm": multi_agent_workflow.llm,
-                "structured_llm": multi_agent_workflow.structured_llm,
             }
         }
 
-        # Execute the workflow
-        result = workflow.invoke({"messages": [initial_message]}, config=config)
+        # Execute the workflow, streaming the response
+        result = stream_workflow(
+            multi_agent_workflow, {"messages": [initial_message]}, config
+        )
 
         return result, config
 
@@ -76,54 +122,23 @@ def process_user_input(workflow, multi_agent_workflow, user_input, user_name="Us
         return None, None
 
 
-def continue_workflow(workflow, verification_input, config):
+def continue_workflow(multi_agent_workflow, verification_input, config):
     """Continue the workflow with verification input."""
     try:
-        # Send verification input as a command
-        result = workflow.invoke(Command(resume=verification_input), config=config)
-        return result
+        # Send verification input as a command, streaming the response
+        return stream_workflow(
+            multi_agent_workflow, Command(resume=verification_input), config
+        )
     except Exception as e:
         st.error(f"Error in verification: {str(e)}")
         return None
 
 
 def display_response(result):
-    """Display the agent's response in a user-friendly format."""
+    """Display the verification and memory details of a finished run."""
     if not result:
         return
 
-    # Extract messages from the result
-    messages = result.get("messages", [])
-
-    if not messages:
-        st.warning("No response received from the agent.")
-        return
-
-    # Display the conversation
-    for i, message in enumerate(messages):
-        if hasattr(message, "content") and message.content:
-            # Skip the initial user message to avoid duplication
-            if i == 0 and hasattr(message, "type") and message.type == "human":
-                continue
-
-            # Determine message type and display accordingly
-            if hasattr(message, "type"):
-                if message.type == "human":
-                    st.chat_message("user").write(message.content)
-                elif message.type == "ai":
-                    st.chat_message("assistant").write(message.content)
-                elif message.type == "system":
-                    st.chat_message("assistant").write(message.content)
-                elif message.type == "tool":
-                    # Display tool results in an expandable section
-                    with st.expander("🔧 Tool Execution Details"):
-                        st.code(str(message.content), language="json")
-                else:
-                    st.chat_message("assistant").write(message.content)
-            else:
-                st.chat_message("assistant").write(str(message.content))
-
-    # Display additional information if available
     if result.get("customer_id"):
         st.success(f"🆔 Customer verified: {result['customer_id']}")
 
@@ -222,7 +237,6 @@ def main():
                 with st.spinner("🤔 Processing your request..."):
                     # Process the user input
                     result, config = process_user_input(
-                        st.session_state.workflow,
                         st.session_state.multi_agent_workflow,
                         user_input,
                         user_name,
@@ -265,7 +279,7 @@ def main():
             if verification_input.strip():
                 with st.spinner("Verifying phone number..."):
                     final_result = continue_workflow(
-                        st.session_state.workflow,
+                        st.session_state.multi_agent_workflow,
                         verification_input,
                         st.session_state.conversation_data["config"],
                     )
@@ -0,0 +1,30 @@
+"""Shared fixtures: a Chinook snapshot built once per test session."""
+
+import os
+
+import pytest
+
+from src.config.settings import Settings
+from src.databases.database import Database
+
+
+@pytest.fixture(scope="session")
+def database(tmp_path_factory):
+    """
+    A Database on a snapshot built in a temporary directory.
+
+    The Chinook script is read from ``DATABASE_SCRIPT_PATH`` when set and
+    downloaded otherwise; tests needing the catalog are skipped without it.
+    """
+    directory = tmp_path_factory.mktemp("chinook")
+    settings = Settings(
+        database_snapshot_path=str(directory / "chinook.sqlite"),
+        database_script_path=os.getenv("DATABASE_SCRIPT_PATH"),
+        database_slow_query_seconds=0,
+    )
+    try:
+        db = Database(settings)
+    except Exception as error:
+        pytest.skip(f"Chinook catalog unavailable: {error}")
+    yield db
+    db.executor.shutdown(wait=False)
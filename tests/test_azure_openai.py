@@ -0,0 +1,25 @@
+"""Tests of the Azure OpenAI client wrapper."""
+
+import dataclasses
+
+import pytest
+
+from src.config.settings import Settings
+from src.llm.azure_openai import AzureOpenAI
+
+
+def test_equal_settings_share_a_key():
+    assert AzureOpenAI._config_key(Settings()) == AzureOpenAI._config_key(Settings())
+
+
+@pytest.mark.parametrize(
+    "field", [field.name for field in dataclasses.fields(Settings)]
+)
+def test_every_setting_is_part_of_the_key(field):
+    settings = Settings()
+    value = getattr(settings, field)
+    changed = dataclasses.replace(
+        settings, **{field: not value if isinstance(value, bool) else f"{value}-x"}
+    )
+
+    assert AzureOpenAI._config_key(changed) != AzureOpenAI._config_key(settings)
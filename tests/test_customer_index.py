@@ -0,0 +1,52 @@
+"""Tests of customer identifier lookup and phone normalization."""
+
+import pytest
+
+from src.databases.customer_index import normalize_phone
+
+
+@pytest.mark.parametrize(
+    "phone, expected",
+    [
+        ("+55 (12) 3923-5555", "+551239235555"),
+        ("555.1234", "+5551234"),
+        ("123-456", None),
+        ("+1 234 567 890 123 45", "+123456789012345"),
+        ("+1 234 567 890 123 456", None),
+        ("", None),
+        (None, None),
+    ],
+)
+def test_phone_numbers_need_seven_to_fifteen_digits(phone, expected):
+    assert normalize_phone(phone) == expected
+
+
+@pytest.mark.parametrize(
+    "identifier",
+    [
+        "1",
+        " 1 ",
+        "luisg@embraer.com.br",
+        "LuisG@Embraer.com.BR",
+        "+55 (12) 3923-5555",
+        "+551239235555",
+        "55 12 3923 5555",
+    ],
+)
+def test_identifiers_resolve_to_the_customer(database, identifier):
+    assert database.get_customer_id_from_identifier(identifier) == 1
+
+
+@pytest.mark.parametrize(
+    "identifier", ["999999", "nobody@example.com", "+1 000 000 0000", "12-34"]
+)
+def test_unknown_identifiers_resolve_to_none(database, identifier):
+    assert database.get_customer_id_from_identifier(identifier) is None
+
+
+def test_index_is_rebuilt_after_invalidation(database):
+    database.invalidate_customer_index()
+    assert not database.customer_index.is_built
+
+    assert database.get_customer_id_from_identifier("1") == 1
+    assert database.customer_index.is_built
@@ -0,0 +1,16 @@
+"""Tests of the database package interface."""
+
+import src.databases
+
+
+def test_star_import_does_not_create_the_database(monkeypatch):
+    def created():
+        raise AssertionError("import * created the database")
+
+    monkeypatch.setattr(src.databases, "get_database", created)
+    namespace = {}
+
+    exec("from src.databases import *", namespace)
+
+    assert "db" not in namespace
+    assert "Database" in namespace
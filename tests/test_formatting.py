@@ -0,0 +1,22 @@
+"""Tests of the compact tool result formatting."""
+
+import pytest
+
+from src.databases.results import QueryResult
+from src.tools.formatting import _baseline_size
+
+RESULT = QueryResult(
+    ("TrackId", "Name", "Composer", "UnitPrice"),
+    [
+        (1, "For Those About To Rock", "Angus Young, Malcolm Young", 0.99),
+        (2, "Balls to the Wall", None, 0.99),
+        (3, "Fast As a Shark", "F. Baltes, R.A. Smith-Diesel", 1.99),
+    ],
+)
+
+
+@pytest.mark.parametrize("rows", [0, 1, 3])
+def test_baseline_size_matches_rendered_dicts(rows):
+    rendered = str(QueryResult(RESULT.columns, RESULT.rows[:rows]).as_dicts())
+
+    assert _baseline_size(RESULT, rows) == len(rendered)
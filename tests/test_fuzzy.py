@@ -0,0 +1,80 @@
+"""Tests of fuzzy matching over catalog names."""
+
+import pytest
+
+from src.databases import fuzzy
+from src.databases.fuzzy import FuzzyNameIndex, normalize_name
+
+NAMES = [
+    ("artist", 1, "AC/DC", None),
+    ("artist", 2, "Aerosmith", None),
+    ("artist", 3, "The Rolling Stones", None),
+    ("album", 4, "Rolling Stones Live", "The Rolling Stones"),
+    ("track", 5, "Walk This Way", "Aerosmith"),
+]
+
+
+def _search(text, **kwargs):
+    index = FuzzyNameIndex()
+    return index.search(text, lambda: NAMES, **kwargs)
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [("AC/DC", "ac dc"), ("Beyoncé", "beyonce"), ("  The  Who! ", "the who")],
+)
+def test_names_are_normalized(name, expected):
+    assert normalize_name(name) == expected
+
+
+def test_misspelled_name_matches_best():
+    (entry, score), *_ = _search("Aerosmyth")
+
+    assert entry[2] == "Aerosmith"
+    assert 0 < score <= 1
+
+
+def test_partial_name_matches_a_run_of_words():
+    (entry, score), *_ = _search("stones", kinds=["artist"])
+
+    assert entry[2] == "The Rolling Stones"
+    assert score > 0.5
+
+
+def test_kinds_filter_matches():
+    matches = _search("rolling stones", kinds=["album"])
+
+    assert [entry[2] for entry, _ in matches] == ["Rolling Stones Live"]
+
+
+def test_names_sharing_no_trigram_are_not_candidates():
+    assert _search("zzzz") == []
+
+
+def test_only_the_trigram_shortlist_is_rescored(monkeypatch):
+    scored = []
+    best_ratio = fuzzy._best_ratio
+
+    def counting(query, name):
+        scored.append(name)
+        return best_ratio(query, name)
+
+    monkeypatch.setattr(fuzzy, "_CANDIDATE_POOL", 2)
+    monkeypatch.setattr(fuzzy, "_best_ratio", counting)
+
+    matches = _search("the rolling stones")
+
+    assert len(scored) == 2
+    assert "the rolling stones" in scored
+    assert len(matches) == 2
+
+
+def test_catalog_names_match_misspellings(database):
+    kind, _, name, _ = next(
+        entry for entry in database.execute("catalog_names").rows if len(entry[2]) > 6
+    )
+
+    result = database.find_closest_names(name[1:], [kind])
+
+    assert result.rows[0][:2] == (kind, name)
+    assert {row[0] for row in result.rows} == {kind}
@@ -0,0 +1,77 @@
+"""Tests of the shared per-endpoint HTTP clients."""
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.config.settings import Settings
+from src.llm.http_clients import get_http_clients
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+    """Answers every POST with a small JSON body on a keep-alive connection."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("content-length", 0)))
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def endpoint():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _settings(endpoint: str, **overrides) -> Settings:
+    settings = Settings(azure_openai_base_url=endpoint)
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    return settings
+
+
+def test_async_client_survives_a_new_event_loop(endpoint):
+    clients = get_http_clients(_settings(endpoint))
+
+    async def call():
+        response = await clients.async_client.post(f"{endpoint}/chat", json={})
+        return response.json()
+
+    assert asyncio.run(call()) == {"ok": True}
+    assert asyncio.run(call()) == {"ok": True}
+    # Each loop opened its own connection
+    assert clients.snapshot()["connections_opened"] == 2
+
+
+def test_pool_limits_share_the_scheduler(endpoint):
+    clients = get_http_clients(_settings(endpoint))
+    pooled = get_http_clients(_settings(endpoint, llm_max_connections=2))
+
+    assert pooled is not clients
+    assert pooled.scheduler is clients.scheduler
+
+
+def test_conflicting_rate_limits_are_rejected(endpoint):
+    clients = get_http_clients(_settings(endpoint))
+    requests_per_minute = clients.scheduler.requests.capacity
+
+    with pytest.raises(ValueError, match="requests_per_minute=10"):
+        get_http_clients(_settings(endpoint, llm_requests_per_minute=10))
+
+    assert get_http_clients(_settings(endpoint)) is clients
+    assert clients.scheduler.requests.capacity == requests_per_minute
@@ -0,0 +1,84 @@
+"""Tests of statement statistics and the slow-query log."""
+
+import json
+
+import pytest
+
+from src.databases.instrumentation import SlowQueryLog
+from src.databases.queries import LATENCY_BUCKETS, StatementStats
+
+
+def test_latencies_are_counted_in_histogram_buckets():
+    stats = StatementStats()
+    for elapsed in [0.0005, 0.0005, 0.003, 0.04, 3.0]:
+        stats.record("search", elapsed, rows=2, size=100)
+    stats.record("search", 0.0005, error=True)
+
+    snapshot = stats.snapshot()["search"]
+
+    assert snapshot["histogram"] == {
+        "<=0.001s": 3,
+        "<=0.005s": 1,
+        "<=0.05s": 1,
+        f">{LATENCY_BUCKETS[-1]:g}s": 1,
+    }
+    assert snapshot["calls"] == 6
+    assert snapshot["errors"] == 1
+    assert snapshot["rows"] == 10 and snapshot["max_rows"] == 2
+    assert snapshot["bytes"] == 500 and snapshot["max_bytes"] == 100
+
+
+def test_percentiles_are_bucket_upper_bounds():
+    stats = StatementStats()
+    for _ in range(90):
+        stats.record("search", 0.002)
+    for _ in range(10):
+        stats.record("search", 0.3)
+
+    snapshot = stats.snapshot()["search"]
+
+    assert snapshot["p50_seconds"] == 0.0025
+    assert snapshot["p95_seconds"] == 0.3
+    assert snapshot["max_seconds"] == 0.3
+    assert snapshot["mean_seconds"] == pytest.approx(0.0318)
+
+
+def test_percentiles_are_capped_at_the_slowest_call():
+    stats = StatementStats()
+    stats.record("search", 0.0012)
+
+    assert stats.snapshot()["search"]["p99_seconds"] == 0.0012
+
+
+@pytest.mark.parametrize(
+    "threshold, elapsed, slow",
+    [(0, 10.0, False), (0.1, 0.05, False), (0.1, 0.1, True), (0.1, 2.0, True)],
+)
+def test_slow_query_threshold(threshold, elapsed, slow):
+    assert SlowQueryLog(threshold).is_slow(elapsed) is slow
+
+
+def test_slow_queries_are_bounded_and_written_to_the_log_file(tmp_path):
+    path = tmp_path / "slow.jsonl"
+    log = SlowQueryLog(0.1, max_entries=2, path=str(path))
+
+    for index in range(3):
+        log.record("search", {"name": "x" * 500, "index": index}, 0.2, 1, 10)
+
+    entries = log.entries()
+    assert [entry["parameters"]["index"] for entry in entries] == [1, 2]
+    assert len(entries[0]["parameters"]["name"]) == 203
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 3
+    assert json.loads(path.read_text(encoding="utf-8").splitlines()[0])["rows"] == 1
+
+
+def test_database_logs_statements_above_the_threshold(database, monkeypatch):
+    monkeypatch.setattr(database.slow_queries, "threshold", 1e-9)
+    database.reset_query_stats()
+
+    database.execute("customer_identifiers")
+
+    assert database.get_query_stats()["customer_identifiers"]["calls"] == 1
+    (entry,) = database.get_slow_queries()
+    assert entry["statement"] == "customer_identifiers"
+    assert entry["rows"] == len(database.execute("customer_identifiers"))
@@ -0,0 +1,69 @@
+"""Tests of the per-customer invoice summary cache."""
+
+from src.databases.invoice_summaries import InvoiceSummary, InvoiceSummaryCache
+from src.databases.results import QueryResult
+
+_EMPTY = QueryResult(("InvoiceId",), [])
+
+
+def _summary(customer_id: int, version) -> InvoiceSummary:
+    return InvoiceSummary(
+        customer_id, _EMPTY, _EMPTY, _EMPTY, _EMPTY, _EMPTY, version=version
+    )
+
+
+def _cache(max_entries: int = 10) -> InvoiceSummaryCache:
+    # A zero interval re-reads the version on every validate call
+    return InvoiceSummaryCache(max_entries=max_entries, check_interval=0)
+
+
+def test_version_change_drops_summaries():
+    cache = _cache()
+    cache.validate(lambda: "v1")
+    cache.put(_summary(1, "v1"))
+    assert cache.get(1) is not None
+
+    cache.validate(lambda: "v2")
+
+    assert cache.get(1) is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_stale_summary_is_not_cached():
+    cache = _cache()
+    cache.validate(lambda: "v2")
+
+    cache.put(_summary(1, "v1"))
+
+    assert cache.get(1) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_customer_is_evicted():
+    cache = _cache(max_entries=2)
+    cache.validate(lambda: "v1")
+    cache.put(_summary(1, "v1"))
+    cache.put(_summary(2, "v1"))
+    cache.get(1)
+
+    cache.put(_summary(3, "v1"))
+
+    assert cache.get(2) is None
+    assert cache.get(1) is not None and cache.get(3) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_support_rep_reassignment_changes_the_version(database, monkeypatch):
+    version = database._load_invoice_tables_version()
+    execute = database.execute
+
+    def reassigned(name, *args, **kwargs):
+        result = execute(name, *args, **kwargs)
+        if name == "invoice_version_customers":
+            (customer_id, rep_id), *rows = result.rows
+            result = QueryResult(result.columns, [(customer_id, rep_id + 1), *rows])
+        return result
+
+    monkeypatch.setattr(database, "execute", reassigned)
+
+    assert database._load_invoice_tables_version() != version
@@ -0,0 +1,20 @@
+"""Tests of the invoice tools."""
+
+import pytest
+
+from src.databases.database import INVOICE_SUMMARY_TOP_INVOICES
+from src.tools.invoice_tools import DEFAULT_TOP_INVOICES, _top_invoice_limit
+
+
+@pytest.mark.parametrize(
+    "top_n, limit",
+    [
+        (None, DEFAULT_TOP_INVOICES),
+        (0, DEFAULT_TOP_INVOICES),
+        (-5, 1),
+        (5, 5),
+        (1000, INVOICE_SUMMARY_TOP_INVOICES),
+    ],
+)
+def test_top_n_is_clamped(top_n, limit):
+    assert _top_invoice_limit(top_n) == limit
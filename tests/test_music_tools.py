@@ -0,0 +1,73 @@
+"""Tests of the music tools."""
+
+import pytest
+
+from src.tools.music_tools import (
+    DEFAULT_SUGGESTIONS,
+    MAX_SUGGESTIONS,
+    _catalog_kinds,
+    _suggestion_limit,
+    find_closest_catalog_matches,
+)
+
+
+@pytest.mark.parametrize(
+    "limit, expected",
+    [
+        (None, DEFAULT_SUGGESTIONS),
+        (0, DEFAULT_SUGGESTIONS),
+        (-3, 1),
+        (7, 7),
+        (10_000, MAX_SUGGESTIONS),
+    ],
+)
+def test_suggestion_limit_is_clamped(limit, expected):
+    assert _suggestion_limit(limit) == expected
+
+
+@pytest.mark.parametrize(
+    "kind, expected",
+    [
+        (None, None),
+        ("", None),
+        ("artist", ["artist"]),
+        ("Album", ["album"]),
+        (" TRACK ", ["track"]),
+        ("song", ["track"]),
+    ],
+)
+def test_catalog_kinds_are_normalized(kind, expected):
+    assert _catalog_kinds(kind) == expected
+
+
+def test_unknown_catalog_kinds_are_rejected():
+    with pytest.raises(ValueError):
+        _catalog_kinds("playlist")
+
+
+def _track_name(database) -> str:
+    return next(
+        name
+        for kind, _, name, _ in database.execute("catalog_names").rows
+        if kind == "track" and len(name) > 6
+    )
+
+
+def test_closest_matches_accept_songs(database):
+    name = _track_name(database)
+
+    result = find_closest_catalog_matches.invoke(
+        {"name": name[:-1], "kind": "Song"}, {"configurable": {"db": database}}
+    )
+
+    header, first, *rest = result.splitlines()
+    assert first.startswith(f"track | {name} |")
+    assert all(line.startswith("track |") for line in rest)
+
+
+def test_closest_matches_reject_unknown_kinds(database):
+    result = find_closest_catalog_matches.invoke(
+        {"name": "Aerosmith", "kind": "playlist"}, {"configurable": {"db": database}}
+    )
+
+    assert result.startswith("Unknown kind: playlist")
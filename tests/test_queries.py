@@ -0,0 +1,100 @@
+"""Tests of the registered catalog statements on the Chinook snapshot."""
+
+import re
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.databases.database import _TABLE_SCAN
+from src.databases.queries import QUERIES
+
+# (search statement, parameter, term matching rows of several artists or albums)
+SEARCHES = [
+    ("albums_by_artist", "artist", "the"),
+    ("tracks_by_artist", "artist", "the"),
+    ("songs_by_title", "song_title", "love"),
+]
+
+
+@pytest.fixture(params=[True, False], ids=["fts", "like"])
+def search_database(request, database, monkeypatch):
+    """The catalog database searching with and without the full-text index."""
+    if request.param and not database.has_search_index:
+        pytest.skip("Snapshot has no full-text index")
+    monkeypatch.setattr(database, "has_search_index", request.param)
+    return database
+
+
+@pytest.mark.parametrize("name, parameter, term", SEARCHES)
+def test_batch_page_continues_with_single_term_cursor(
+    search_database, name, parameter, term
+):
+    full = search_database.search(name, parameter, term)
+    assert len(full.rows) > 3, "term must match more rows than one page"
+
+    page = search_database.search_many(name, parameter, [term], limit=3)[term]
+    rows = list(page.rows)
+    cursor = page.next_cursor
+    while cursor is not None:
+        page = search_database.search_page(name, parameter, term, cursor, limit=3)
+        rows.extend(page.rows)
+        cursor = page.next_cursor
+
+    assert page.columns == full.columns
+    assert rows == list(full.rows)
+
+
+@pytest.mark.parametrize(
+    "step, scans",
+    [
+        ("SCAN Track", True),
+        ("SCAN TABLE Track", True),
+        ("SCAN Track USING COVERING INDEX ix_track_albumid_name", True),
+        ("SCAN TABLE Track AS t USING INDEX ix_track_albumid_name", True),
+        ("SEARCH Track USING INDEX ix_track_albumid_name (AlbumId=?)", False),
+        ("SEARCH Track USING COVERING INDEX ix_track_genreid (GenreId>?)", False),
+        ("SEARCH Track USING INTEGER PRIMARY KEY (rowid=?)", False),
+        ("SCAN track_fts VIRTUAL TABLE INDEX 0:M1", False),
+        ("SCAN (subquery-1)", False),
+        ("SCAN CONSTANT ROW", False),
+    ],
+)
+def test_table_scan_pattern(step, scans):
+    assert bool(_TABLE_SCAN.match(step)) is scans
+
+
+@pytest.mark.parametrize(
+    "name", [statement.name for statement in QUERIES if not statement.full_scan]
+)
+def test_statement_does_not_scan_tables(database, name):
+    if name.endswith("_fts") and not database.has_search_index:
+        pytest.skip("Snapshot has no full-text index")
+
+    plan = database.explain(name)
+
+    assert [step for step in plan if _TABLE_SCAN.match(step)] == [], plan
+
+
+# Functions SQLite provides that PostgreSQL and other catalog replicas do not
+_SQLITE_ONLY_FUNCTION = re.compile(
+    r"\b(TOTAL|IFNULL|GROUP_CONCAT|JSON_EACH|STRFTIME|JULIANDAY|DATETIME|PRINTF"
+    r"|INSTR|IIF|LIKELIHOOD|RANDOMBLOB)\s*\(",
+    re.IGNORECASE,
+)
+
+# Statements only ever executed on SQLite: the full-text variants need the FTS5
+# index and the batched variants are replaced by per-term searches elsewhere
+_PORTABLE_STATEMENTS = [
+    statement
+    for statement in QUERIES
+    if not statement.name.endswith(("_fts", "_batch"))
+]
+
+
+@pytest.mark.parametrize(
+    "statement", _PORTABLE_STATEMENTS, ids=lambda statement: statement.name
+)
+def test_statement_runs_on_other_dialects(statement):
+    compiled = str(statement.clause.compile(dialect=postgresql.dialect()))
+
+    assert _SQLITE_ONLY_FUNCTION.search(compiled) is None, compiled
@@ -0,0 +1,95 @@
+"""Tests of the client-side rate limiter transports."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.llm.rate_limiter import (
+    AsyncRateLimitedTransport,
+    RateLimitedTransport,
+    RequestScheduler,
+)
+
+
+def _scheduler(**kwargs) -> RequestScheduler:
+    """A scheduler with one concurrency slot and no per-minute budgets."""
+    options = {
+        "requests_per_minute": 0,
+        "tokens_per_minute": 0,
+        "max_concurrency": 1,
+        "max_retries": 0,
+    }
+    options.update(kwargs)
+    return RequestScheduler(**options)
+
+
+def test_cancelled_request_frees_its_slot():
+    scheduler = _scheduler()
+
+    async def run():
+        started = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/hang":
+                started.set()
+                await asyncio.Event().wait()
+            return httpx.Response(200, json={})
+
+        transport = AsyncRateLimitedTransport(httpx.MockTransport(handler), scheduler)
+        async with httpx.AsyncClient(transport=transport) as client:
+            pending = asyncio.create_task(client.post("http://stub/hang", json={}))
+            await started.wait()
+            assert scheduler.snapshot()["in_flight"] == 1
+
+            pending.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await pending
+            assert scheduler.snapshot()["in_flight"] == 0
+
+            # The only slot is free again, so the next request is admitted
+            response = await asyncio.wait_for(
+                client.post("http://stub/ok", json={}), timeout=5
+            )
+            assert response.status_code == 200
+
+    asyncio.run(run())
+    assert scheduler.snapshot()["in_flight"] == 0
+
+
+def test_unexpected_error_frees_its_slot():
+    scheduler = _scheduler()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/fail":
+            raise RuntimeError("transport bug")
+        return httpx.Response(200, json={})
+
+    transport = RateLimitedTransport(httpx.MockTransport(handler), scheduler)
+    with httpx.Client(transport=transport) as client:
+        with pytest.raises(RuntimeError):
+            client.post("http://stub/fail", json={})
+        assert scheduler.snapshot()["in_flight"] == 0
+        assert client.post("http://stub/ok", json={}).status_code == 200
+    assert scheduler.snapshot()["in_flight"] == 0
+
+
+def test_throttled_request_is_retried_after_retry_after():
+    scheduler = _scheduler(max_retries=2, retry_base_delay=0.01)
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        if len(attempts) == 1:
+            return httpx.Response(429, headers={"retry-after-ms": "10"}, json={})
+        return httpx.Response(200, json={})
+
+    transport = RateLimitedTransport(httpx.MockTransport(handler), scheduler)
+    with httpx.Client(transport=transport) as client:
+        assert client.post("http://stub/ok", json={}).status_code == 200
+
+    stats = scheduler.snapshot()
+    assert len(attempts) == 2
+    assert stats["retries"] == 1
+    assert stats["throttled"] == 1
+    assert stats["in_flight"] == 0
@@ -0,0 +1,81 @@
+"""Tests of the co-occurrence recommender."""
+
+import numpy as np
+import pytest
+
+from src.databases.recommendations import RecommendationIndex
+
+
+@pytest.fixture(scope="module")
+def catalog(database):
+    tracks, playlists, purchases = database._load_recommendation_data()
+    if not purchases:
+        pytest.skip("The catalog has no invoice lines")
+    return tracks, playlists, purchases
+
+
+def _customers(purchases):
+    return sorted({customer_id for _, customer_id, _ in purchases})
+
+
+def test_recommendations_exclude_bought_tracks_and_artists(database, catalog):
+    tracks, _, purchases = catalog
+    names = {track_id: (name, artist) for track_id, name, _, artist, *_ in tracks}
+
+    for customer_id in _customers(purchases)[:5]:
+        bought = {track for _, customer, track in purchases if customer == customer_id}
+        bought_artists = {names[track][1] for track in bought if track in names}
+
+        recommendations = database.recommend_for_customer(customer_id, limit=10)
+
+        for artist, _, track_name, score in recommendations:
+            assert artist not in bought_artists
+            assert (track_name, artist) not in {names[track] for track in bought}
+            assert score > 0
+
+
+def test_incremental_purchases_match_a_full_build(catalog):
+    tracks, playlists, purchases = catalog
+    half = len(purchases) // 2
+    full = RecommendationIndex()
+    full.build(tracks, playlists, purchases)
+    incremental = RecommendationIndex()
+    incremental.build(tracks, playlists, purchases[:half])
+
+    incremental.add_purchases(purchases[half:])
+    # Lines already applied are skipped
+    incremental.add_purchases(purchases)
+
+    assert incremental.last_invoice_line_id == full.last_invoice_line_id
+    np.testing.assert_array_equal(
+        incremental._artist_co_purchases, full._artist_co_purchases
+    )
+    np.testing.assert_array_equal(
+        incremental._genre_co_purchases, full._genre_co_purchases
+    )
+    np.testing.assert_array_equal(incremental._track_popularity, full._track_popularity)
+    for customer_id in _customers(purchases)[:5]:
+        assert incremental.recommend(customer_id, None) == full.recommend(
+            customer_id, None
+        )
+
+
+def test_co_purchases_count_customers_buying_both_artists(catalog):
+    index = RecommendationIndex()
+    index.build(*catalog)
+
+    purchases = index._artist_purchases
+    np.testing.assert_array_equal(index._artist_co_purchases, purchases.T @ purchases)
+    assert set(np.unique(purchases)) <= {0.0, 1.0}
+
+
+def test_new_customers_get_best_selling_artists(catalog):
+    index = RecommendationIndex()
+    index.build(*catalog)
+
+    recommendations = index.recommend(-1, None, limit=3)
+
+    assert recommendations
+    assert [score for *_, score in recommendations] == sorted(
+        (score for *_, score in recommendations), reverse=True
+    )
@@ -0,0 +1,38 @@
+"""Tests of the on-disk chat model response cache."""
+
+import os
+import time
+
+import pytest
+
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+
+from src.config.settings import Settings
+from src.llm.response_cache import SQLiteResponseCache, get_response_cache
+
+
+def _generations(text: str):
+    return [ChatGeneration(message=AIMessage(content=text))]
+
+
+@pytest.mark.skipif(
+    "LLM_CACHE_ENABLED" in os.environ, reason="LLM_CACHE_ENABLED is set"
+)
+def test_cache_is_off_by_default():
+    assert Settings().llm_cache_enabled is False
+    assert get_response_cache(Settings()) is None
+
+
+def test_expired_responses_are_not_returned(tmp_path, monkeypatch):
+    cache = SQLiteResponseCache(
+        tmp_path / "cache.sqlite", max_entries=10, max_bytes=1 << 20, ttl=60
+    )
+    cache.update("prompt", "model", _generations("cached"))
+    assert cache.lookup("prompt", "model")[0].message.content == "cached"
+
+    later = time.time() + 61
+    monkeypatch.setattr(time, "time", lambda: later)
+
+    assert cache.lookup("prompt", "model") is None
+    assert cache.stats()["entries"] == 0
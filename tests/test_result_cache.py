@@ -0,0 +1,20 @@
+"""Tests of the shared catalog query result cache."""
+
+from src.config.settings import Settings
+from src.databases.cache import get_result_cache, parameters_key
+
+
+def test_caches_are_shared_per_limits():
+    default = get_result_cache(Settings())
+    disabled = get_result_cache(Settings(result_cache_max_entries=0))
+
+    assert get_result_cache(Settings()) is default
+    assert disabled is not default
+    assert disabled.max_entries == 0
+
+
+def test_parameters_are_keyed_exactly():
+    assert parameters_key({"name": "The  Beatles"}) != parameters_key(
+        {"name": "the beatles"}
+    )
+    assert parameters_key({"b": 1, "a": 2}) == parameters_key({"a": 2, "b": 1})
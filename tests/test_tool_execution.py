@@ -0,0 +1,69 @@
+"""Tests of the bounded, timed execution of an agent's tool calls."""
+
+import threading
+import time
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.tools import tool
+from langgraph.prebuilt import create_react_agent
+
+from src.config.settings import Settings
+from src.tools import get_tool_call_stats, get_tool_execution_config
+
+
+class _FakeChatModel(GenericFakeChatModel):
+    """Fake chat model that accepts tools so agents can be built on it."""
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+_lock = threading.Lock()
+_running = 0
+_peak = 0
+
+
+@tool
+def slow_lookup(key: str) -> str:
+    """Look up a key slowly."""
+    global _running, _peak
+    with _lock:
+        _running += 1
+        _peak = max(_peak, _running)
+    time.sleep(0.05)
+    with _lock:
+        _running -= 1
+    if key == "missing":
+        raise ValueError("no such key")
+    return key
+
+
+def test_tool_calls_are_bounded_and_timed():
+    keys = ["a", "b", "c", "d", "e", "missing"]
+    model = _FakeChatModel(
+        messages=iter(
+            [
+                AIMessage(
+                    content="",
+                    tool_calls=[
+                        {"name": "slow_lookup", "args": {"key": key}, "id": str(i)}
+                        for i, key in enumerate(keys)
+                    ],
+                ),
+                AIMessage(content="done"),
+            ]
+        )
+    )
+    agent = create_react_agent(model, [slow_lookup]).with_config(
+        get_tool_execution_config(Settings(tool_max_concurrency=2))
+    )
+    before = get_tool_call_stats().get("slow_lookup", {"calls": 0, "errors": 0})
+
+    result = agent.invoke({"messages": [HumanMessage(content="look them up")]})
+
+    assert result["messages"][-1].content == "done"
+    assert _peak == 2
+    stats = get_tool_call_stats()["slow_lookup"]
+    assert stats["calls"] - before["calls"] == len(keys)
+    assert stats["errors"] - before["errors"] == 1
@@ -0,0 +1,48 @@
+"""Tests of the rule-based customer identifier extraction."""
+
+import pytest
+
+from src.utils.validation import extract_customer_identifier, find_customer_identifiers
+
+
+@pytest.mark.parametrize(
+    "text, identifier",
+    [
+        ("My customer id is 1", "1"),
+        ("Customer ID: 12. Show me my invoices", "12"),
+        ("account number 42", "42"),
+        ("customer #7", "7"),
+        ("5", "5"),
+        ("My phone number is +55 (12) 3923-5555.", "+55 (12) 3923-5555"),
+        ("Reach me at luisg@embraer.com.br", "luisg@embraer.com.br"),
+    ],
+)
+def test_extracts_stated_identifier(text, identifier):
+    assert extract_customer_identifier(text) == identifier
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Show me invoice id 3",
+        "my invoice id is 123",
+        "What is on invoice #98?",
+        "track id 5",
+        "Play track ID: 1024",
+        "I want ID 7 album",
+        "album id 12 please",
+        "I like the Rolling Stones",
+    ],
+)
+def test_ignores_other_ids(text):
+    assert find_customer_identifiers(text) == []
+
+
+def test_customer_id_next_to_invoice_id():
+    text = "My customer id is 1, what is on invoice id 3?"
+    assert find_customer_identifiers(text) == ["1"]
+
+
+def test_phone_number_needs_plausible_digit_count():
+    assert find_customer_identifiers("+1 23") == []
+    assert find_customer_identifiers("+1 234 567 890 123 456 789") == []
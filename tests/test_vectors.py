@@ -0,0 +1,84 @@
+"""Tests of the catalog vector index and the hashing embedder."""
+
+import numpy as np
+import pytest
+
+from src.databases.embeddings import HashingEmbedder
+from src.databases.vectors import VectorIndex
+
+KEY = "test-catalog"
+
+
+@pytest.fixture(scope="module")
+def documents(database):
+    return database.execute("vector_documents").rows
+
+
+def _index(directory, partitions=0, probes=4):
+    return VectorIndex(directory, HashingEmbedder(), partitions, probes, batch_size=16)
+
+
+def _search(index, documents, text, limit=10):
+    return index.search(text, lambda: documents, KEY, limit=limit)
+
+
+def test_hashing_embedder_is_deterministic():
+    texts = ["Back in Black", "back in black!", "Symphony No. 5"]
+
+    first = HashingEmbedder().embed(texts)
+    second = HashingEmbedder().embed(texts)
+
+    np.testing.assert_array_equal(first, second)
+    np.testing.assert_allclose(np.linalg.norm(first, axis=1), 1.0, rtol=1e-6)
+    assert first[0] @ first[1] > first[0] @ first[2]
+
+
+def test_built_index_is_reloaded_memory_mapped(tmp_path, documents):
+    built = _index(tmp_path)
+    expected = _search(built, documents, "rock guitar")
+
+    reloaded = _index(tmp_path)
+    assert reloaded.load(KEY)
+
+    assert isinstance(reloaded._index[0], np.memmap)
+    assert _search(reloaded, documents, "rock guitar") == expected
+    assert sorted(path.suffix for path in tmp_path.iterdir()) == [".json", ".npy"]
+
+
+def test_index_for_another_embedder_is_not_loaded(tmp_path, documents):
+    _search(_index(tmp_path), documents, "rock")
+
+    other = VectorIndex(tmp_path, HashingEmbedder(dimension=64))
+
+    assert not other.load(KEY)
+
+
+def test_probing_every_partition_matches_brute_force(tmp_path, documents):
+    brute_force = _index(tmp_path / "flat")
+    partitioned = _index(tmp_path / "ivf", partitions=4, probes=4)
+
+    for text in ["rock guitar", "jazz", documents[0][2]]:
+        expected = _search(brute_force, documents, text, len(documents))
+        matches = _search(partitioned, documents, text)
+        # Equal scores may be ordered differently, so compare scores per match
+        assert [score for _, score in matches] == [score for _, score in expected][:10]
+        assert all(dict(expected)[match] == score for match, score in matches)
+
+
+def test_probing_fewer_partitions_scores_a_subset(tmp_path, documents):
+    brute_force = _index(tmp_path / "flat")
+    partitioned = _index(tmp_path / "ivf", partitions=4, probes=1)
+
+    scores = dict(_search(brute_force, documents, "rock guitar", len(documents)))
+
+    for match, score in _search(partitioned, documents, "rock guitar"):
+        assert scores[match] == score
+
+
+def test_exact_name_excludes_itself(tmp_path, documents):
+    kind, _, name, *_ = documents[0]
+
+    matches = _search(_index(tmp_path), documents, name)
+
+    assert matches
+    assert all(match[2] != name for match, _ in matches)
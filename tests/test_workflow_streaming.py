@@ -0,0 +1,106 @@
+"""Tests of streaming the multi-agent workflow with a fake chat model."""
+
+import asyncio
+import uuid
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
+
+from src.config.settings import Settings
+from src.llm.azure_openai import AzureOpenAI
+from src.schemas.models import UserInput, UserProfile
+from src.workflows import MultiAgentWorkflow
+
+
+class _FakeChatModel(GenericFakeChatModel):
+    """Fake chat model that accepts tools so agents can be built on it."""
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+class _FakeAzureOpenAI:
+    """Stands in for AzureOpenAI, answering structured calls with fixed values."""
+
+    def __init__(self, replies):
+        self.llm = _FakeChatModel(messages=iter(replies))
+
+    def get_structured_llm(self, schema):
+        values = {
+            UserInput: UserInput(identifier=""),
+            UserProfile: UserProfile(customer_id="1", music_preferences=["rock"]),
+        }
+        return RunnableLambda(lambda messages: values[schema])
+
+
+class _FakeDatabase:
+    """Database stub recording the lookups made by verification."""
+
+    def __init__(self, customer_id):
+        self.customer_id = customer_id
+        self.lookups = []
+        self.prefetched = []
+
+    def get_customer_id_from_identifier(self, identifier):
+        self.lookups.append(identifier)
+        return self.customer_id
+
+    def prefetch_invoice_summary(self, customer_id):
+        self.prefetched.append(customer_id)
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Route every AzureOpenAI.get_instance call to one fake, recording the settings."""
+    requested = []
+    fake = _FakeAzureOpenAI([AIMessage(content="Happy to help with your music.")] * 3)
+
+    def get_instance(cls, settings):
+        requested.append(settings)
+        return fake
+
+    monkeypatch.setattr(AzureOpenAI, "get_instance", classmethod(get_instance))
+    return requested
+
+
+def _stream(workflow, message, config):
+    async def collect():
+        return [
+            event
+            async for event in workflow.astream_response(
+                {"messages": [HumanMessage(content=message)]}, config
+            )
+        ]
+
+    return asyncio.run(collect())
+
+
+def test_verified_run_reads_db_and_settings_from_configurable(fake_llm):
+    settings = Settings()
+    db = _FakeDatabase(customer_id=1)
+    workflow = MultiAgentWorkflow(settings)
+    config = {"configurable": {"thread_id": str(uuid.uuid4()), "db": db}}
+
+    events = _stream(workflow, "My customer id is 1.", config)
+
+    assert db.lookups == ["1"]
+    assert db.prefetched == [1]
+    # Nodes received the workflow's settings through configurable
+    assert all(requested is settings for requested in fake_llm)
+    messages = [event.content for event in events if event.kind == "message"]
+    assert any("customer id 1" in message for message in messages)
+    tokens = "".join(event.content for event in events if event.kind == "token")
+    assert "Happy to help" in tokens
+
+
+def test_unverified_run_stops_at_interrupt(fake_llm):
+    db = _FakeDatabase(customer_id=None)
+    workflow = MultiAgentWorkflow(Settings())
+    config = {"configurable": {"thread_id": str(uuid.uuid4()), "db": db}}
+
+    events = _stream(workflow, "Hi, I need help.", config)
+
+    assert db.lookups == []
+    assert events[-1].kind == "interrupt"